@@ -83,6 +83,37 @@ class Database {
     return result.rows;
   }
 
+  /**
+   * Run several queries in one transaction
+   * The callback receives query helpers bound to a single pooled client.
+   * The transaction is committed if the callback resolves and rolled back
+   * if it throws.
+   */
+  async transaction(callback) {
+    const client = await this.pool.connect();
+    const tx = {
+      query: (text, params = []) => client.query(text, params),
+      queryOne: async (text, params = []) => (await client.query(text, params)).rows[0] || null,
+      queryAll: async (text, params = []) => (await client.query(text, params)).rows,
+    };
+
+    try {
+      await client.query('BEGIN');
+      const result = await callback(tx);
+      await client.query('COMMIT');
+      return result;
+    } catch (error) {
+      try {
+        await client.query('ROLLBACK');
+      } catch (rollbackError) {
+        logger.error('Transaction rollback failed', { error: rollbackError.message });
+      }
+      throw error;
+    } finally {
+      client.release();
+    }
+  }
+
   /**
    * Close all connections
    */
@@ -197,6 +197,34 @@ router.post('/devices', async (req, res) => {
   }
 });
 
+/**
+ * PUT /api/devices/status
+ * Update the connection status of several devices in one request
+ */
+router.put('/devices/status', async (req, res) => {
+  try {
+    const items = Array.isArray(req.body) ? req.body : req.body.devices;
+    if (!Array.isArray(items)) {
+      return res.status(400).json({
+        success: false,
+        error: 'Request body must be an array of device statuses'
+      });
+    }
+
+    const devices = await deviceRepository.updateStatusBulk(items);
+    res.json({
+      success: true,
+      data: devices
+    });
+  } catch (error) {
+    logger.error('Failed to update device statuses in bulk', { error: error.message });
+    res.status(500).json({
+      success: false,
+      error: error.message
+    });
+  }
+});
+
 /**
  * PUT /api/devices/:id
  * Update a device
@@ -345,6 +373,35 @@ router.post('/alarms', async (req, res) => {
   }
 });
 
+/**
+ * POST /api/alarms/bulk
+ * Create several alarms in one request
+ */
+router.post('/alarms/bulk', async (req, res) => {
+  try {
+    const items = Array.isArray(req.body) ? req.body : req.body.alarms;
+    if (!Array.isArray(items)) {
+      return res.status(400).json({
+        success: false,
+        error: 'Request body must be an array of alarms'
+      });
+    }
+
+    // All or nothing, so a failed request can be resent as a whole
+    const alarms = await alarmRepository.createBulk(items);
+    res.status(201).json({
+      success: true,
+      data: alarms
+    });
+  } catch (error) {
+    logger.error('Failed to create alarms in bulk', { error: error.message });
+    res.status(500).json({
+      success: false,
+      error: error.message
+    });
+  }
+});
+
 /**
  * PUT /api/alarms/:id/acknowledge
  * Acknowledge an alarm
@@ -452,6 +509,35 @@ router.post('/metrics', async (req, res) => {
   }
 });
 
+/**
+ * POST /api/metrics/bulk
+ * Record several metrics samples in one request
+ */
+router.post('/metrics/bulk', async (req, res) => {
+  try {
+    const items = Array.isArray(req.body) ? req.body : req.body.metrics;
+    if (!Array.isArray(items)) {
+      return res.status(400).json({
+        success: false,
+        error: 'Request body must be an array of metrics'
+      });
+    }
+
+    // All or nothing, so a failed request can be resent as a whole
+    const metrics = await metricsRepository.createMetricsBulk(items);
+    res.status(201).json({
+      success: true,
+      data: metrics
+    });
+  } catch (error) {
+    logger.error('Failed to create metrics in bulk', { error: error.message });
+    res.status(500).json({
+      success: false,
+      error: error.message
+    });
+  }
+});
+
 // ============= VENDORS ENDPOINTS =============
 
 /**
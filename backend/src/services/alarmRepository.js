@@ -81,8 +81,10 @@ class AlarmRepository {
 
   /**
    * Create new alarm
+   * Inside a transaction, pass its query helpers as db and send the
+   * notifications once it has committed.
    */
-  static async create(alarmData) {
+  static async create(alarmData, { db = database, notify = true } = {}) {
     try {
       const {
         device_id,
@@ -109,15 +111,11 @@ class AlarmRepository {
         source,
       ];
 
-      const result = await database.queryOne(query, params);
+      const result = await db.queryOne(query, params);
       logger.info('Alarm created', { alarm_id: result.id, device_id, severity });
       
-      // Trigger notifications via AlarmService
-      try {
-        await alarmService.generateAlarm(result);
-      } catch (serviceError) {
-        logger.error('Failed to trigger alarm notifications', { error: serviceError.message });
-        // Don't fail the repository create operation if notifications fail
+      if (notify) {
+        await this.notifyCreated(result);
       }
       
       return result;
@@ -127,6 +125,38 @@ class AlarmRepository {
     }
   }
 
+  /**
+   * Create several alarms in one transaction
+   * Either every alarm is stored or none is; notifications are sent after
+   * the commit.
+   */
+  static async createBulk(alarmsData) {
+    const alarms = await database.transaction(async (db) => {
+      const created = [];
+      for (const alarmData of alarmsData) {
+        created.push(await this.create(alarmData, { db, notify: false }));
+      }
+      return created;
+    });
+
+    for (const alarm of alarms) {
+      await this.notifyCreated(alarm);
+    }
+    return alarms;
+  }
+
+  /**
+   * Trigger notifications for a stored alarm via AlarmService
+   */
+  static async notifyCreated(alarm) {
+    try {
+      await alarmService.generateAlarm(alarm);
+    } catch (serviceError) {
+      logger.error('Failed to trigger alarm notifications', { error: serviceError.message });
+      // Don't fail the repository create operation if notifications fail
+    }
+  }
+
   /**
    * Acknowledge alarm
    */
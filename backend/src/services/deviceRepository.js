@@ -239,6 +239,34 @@ class DeviceRepository {
     }
   }
 
+  /**
+   * Update the status of several devices in one statement
+   * @param {Array<{id: number, connection_status: string}>} statuses
+   */
+  static async updateStatusBulk(statuses) {
+    try {
+      if (statuses.length === 0) {
+        return [];
+      }
+      const query = `
+        UPDATE devices AS d
+        SET connection_status = v.status, last_polled = CURRENT_TIMESTAMP
+        FROM unnest($1::int[], $2::text[]) AS v(id, status)
+        WHERE d.id = v.id
+        RETURNING d.id, d.name, d.connection_status
+      `;
+      const result = await database.queryAll(query, [
+        statuses.map((s) => s.id),
+        statuses.map((s) => s.connection_status),
+      ]);
+      logger.debug('Device statuses updated', { count: result.length });
+      return result;
+    } catch (error) {
+      logger.error('Failed to update device statuses', { error: error.message });
+      throw error;
+    }
+  }
+
   /**
    * Test device connection
    * Simulates SNMP connection test
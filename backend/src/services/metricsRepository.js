@@ -77,7 +77,21 @@ class MetricsRepository {
     return this.create(metricData);
   }
 
-  static async create(metricData) {
+  /**
+   * Create several metrics in one transaction (same input as createMetric)
+   * Either every sample is stored or none is.
+   */
+  static async createMetricsBulk(metricsData) {
+    return database.transaction(async (db) => {
+      const created = [];
+      for (const metricData of metricsData) {
+        created.push(await this.create(metricData, db));
+      }
+      return created;
+    });
+  }
+
+  static async create(metricData, db = database) {
     try {
       const {
         device_id,
@@ -140,7 +154,7 @@ class MetricsRepository {
               metric_value: value,
               metric_unit: unit,
               status
-            }));
+            }, db));
           }
         }
         return results.length > 0 ? results[0] : null;
@@ -171,7 +185,7 @@ class MetricsRepository {
         status,
       ];
 
-      const result = await database.queryOne(query, params);
+      const result = await db.queryOne(query, params);
       logger.debug('Metric created', { 
         device_id,
         metric_type,
@@ -6,70 +6,177 @@ IP: 10.5.0.76
 Community: Fn4c2023
 """
 
-from pysnmp.hlapi import *
+import asyncio
 import json
-import sys
+import threading
 
-from pysnmp.smi import builder, view
-from pysnmp.entity import engine, config
-from pysnmp.entity.rfc3413 import cmdgen
-import json
-import socket
+import orjson
+
+from pysnmp.hlapi import (
+    getCmd, bulkCmd,
+    SnmpEngine, UdpTransportTarget,
+    CommunityData, ContextData,
+    ObjectIdentity, ObjectType,
+)
+
+# Sistem grubu skaler OID'leri tek bir GET PDU'sunda isteniyor
+SYSTEM_OIDS = {
+    "sysDescr": "1.3.6.1.2.1.1.1.0",
+    "sysUpTime": "1.3.6.1.2.1.1.3.0",
+    "sysName": "1.3.6.1.2.1.1.5.0",
+}
+
+# ifTable sayaç kolonları GETBULK ile birlikte yürütülüyor
+IF_COUNTER_OIDS = {
+    "network_in": "1.3.6.1.2.1.2.2.1.10",   # ifInOctets
+    "network_out": "1.3.6.1.2.1.2.2.1.16",  # ifOutOctets
+}
+
+BULK_MAX_REPETITIONS = 50
+
+# Aynı anda sorgulanan en fazla cihaz sayısı
+MAX_CONCURRENT_POLLS = 20
+
+DEVICES = [
+    {
+        'device_name': 'ISL_PREFABRIK_SW',
+        'device_ip': '10.5.0.76',
+        'community': 'Fn4c2023',
+    },
+]
+
+# SnmpEngine kurulumu pahalı (MIB yükleme), bu yüzden her worker thread
+# için bir kez oluşturulup tüm sorgularda yeniden kullanılıyor.
+_thread_local = threading.local()
+
+
+class SNMPQueryError(Exception):
+    """SNMP sorgusu başarısız oldu"""
+    pass
+
+
+def _get_engine():
+    """Bu thread'e ait SnmpEngine'i döndür (ilk kullanımda oluşturulur)"""
+    engine = getattr(_thread_local, "engine", None)
+    if engine is None:
+        engine = _thread_local.engine = SnmpEngine()
+    return engine
+
+
+def _snmp_get(ip, community, oids, port=161, timeout=5):
+    """Birden fazla skaler OID için tek PDU'luk SNMP v2c GET (bloklayan çağrı)
+
+    Args:
+        oids: isim -> OID eşlemesi
+
+    Returns:
+        isim -> değer (string) eşlemesi
+    """
+    error_indication, error_status, error_index, var_binds = next(
+        getCmd(
+            _get_engine(),
+            CommunityData(community),
+            UdpTransportTarget((ip, port), timeout=timeout, retries=1),
+            ContextData(),
+            *[ObjectType(ObjectIdentity(oid)) for oid in oids.values()]
+        )
+    )
+
+    if error_indication:
+        raise SNMPQueryError(str(error_indication))
+    if error_status:
+        raise SNMPQueryError(f"{error_status.prettyPrint()} at {error_index}")
+
+    names = {oid: name for name, oid in oids.items()}
+    return {
+        names.get(str(oid), str(oid)): value.prettyPrint()
+        for oid, value in var_binds
+    }
+
+
+def _snmp_bulk_walk(ip, community, oids, port=161, timeout=5):
+    """Tablo kolonlarını GETBULK ile birlikte yürüt (bloklayan çağrı)
+
+    Args:
+        oids: isim -> kolon OID eşlemesi
+
+    Returns:
+        isim -> {index: değer} eşlemesi
+    """
+    results = {name: {} for name in oids}
+    prefixes = [(name, oid + ".") for name, oid in oids.items()]
+
+    for error_indication, error_status, error_index, var_binds in bulkCmd(
+        _get_engine(),
+        CommunityData(community),
+        UdpTransportTarget((ip, port), timeout=timeout, retries=1),
+        ContextData(),
+        0, BULK_MAX_REPETITIONS,
+        *[ObjectType(ObjectIdentity(oid)) for oid in oids.values()],
+        lexicographicMode=False
+    ):
+        if error_indication:
+            raise SNMPQueryError(str(error_indication))
+        if error_status:
+            raise SNMPQueryError(f"{error_status.prettyPrint()} at {error_index}")
+
+        for oid, value in var_binds:
+            oid_str = str(oid)
+            for name, prefix in prefixes:
+                if oid_str.startswith(prefix):
+                    results[name][oid_str[len(prefix):]] = value.prettyPrint()
+                    break
+
+    return results
 
-def get_snmp_data():
+
+def _collect(ip, community, port=161):
+    """Sistem bilgisi ve arayüz sayaçlarını topla (bloklayan çağrı)"""
+    info = _snmp_get(ip, community, SYSTEM_OIDS, port)
+    counters = _snmp_bulk_walk(ip, community, IF_COUNTER_OIDS, port)
+    return info, counters
+
+
+async def get_snmp_data(
+    device_name="ISL_PREFABRIK_SW",
+    device_ip="10.5.0.76",
+    community="Fn4c2023",
+    port=161,
+):
     """SNMP ile cihaz bilgisini al"""
-    
-    device_ip = "10.5.0.76"
-    community = "Fn4c2023"
-    port = 161
-    
+
+    counters = {}
     data = {
-        'device_name': 'ISL_PREFABRIK_SW',
+        'device_name': device_name,
         'ip': device_ip,
         'community': community,
         'status': 'unknown',
         'info': {},
         'metrics': {}
     }
-    
+
     try:
-        # Simple SNMP test via socket
-        sock = socket.create_connection((device_ip, port), timeout=5)
-        data['status'] = 'online'
-        data['info']['port_open'] = True
-        print(f"✅ Port 161 (SNMP) açık")
-        
-        # Gerçek SNMP query'si - sysDescr
-        import subprocess
-        result = subprocess.run(
-            ["snmpget", "-v", "2c", "-c", community, device_ip, "sysDescr.0"],
-            capture_output=True,
-            text=True,
-            timeout=5
+        # Gerçek SNMP query'si - sistem grubu + ifTable sayaçları
+        # pysnmp çağrısı bloklayan olduğu için worker thread'de çalıştırılıyor
+        info, counters = await asyncio.to_thread(
+            _collect, device_ip, community, port
         )
-        
-        if result.returncode == 0:
-            data['info']['sysDescr'] = result.stdout.strip()
-            print(f"✅ sysDescr: {result.stdout.strip()}")
-        else:
-            print(f"⚠️ SNMP tools tidak ditemukan, menggunakan mock data")
-            data['info']['note'] = 'Mock data karena SNMP tools tidak terinstall'
-            
-        sock.close()
-        
-    except socket.timeout:
-        data['status'] = 'offline'
-        data['error'] = 'Connection timeout'
-        print(f"❌ Timeout: Cihaza bağlanamadı")
-    except ConnectionRefusedError:
+        data['status'] = 'online'
+        data['info'].update(info)
+        print(f"✅ sysDescr: {info.get('sysDescr')}")
+
+    except SNMPQueryError as e:
         data['status'] = 'offline'
-        data['error'] = 'Connection refused'
-        print(f"❌ Bağlantı reddedildi")
+        data['error'] = str(e)
+        if "timeout" in str(e).lower():
+            print(f"❌ Timeout: Cihaza bağlanamadı")
+        else:
+            print(f"❌ SNMP hatası: {e}")
     except Exception as e:
         data['status'] = 'offline'
         data['error'] = str(e)
         print(f"❌ Hata: {e}")
-    
+
     # Mock metrics ekle
     data['metrics'] = {
         'cpu_usage': 45.3,
@@ -80,21 +187,51 @@ def get_snmp_data():
         'uptime': 99.8,
         'last_polled': '2025-12-26T16:05:00Z'
     }
-    
+
+    # Gerçek arayüz sayaçları alındıysa mock değerlerin yerine kullan
+    if counters:
+        for name, values in counters.items():
+            if values:
+                data['metrics'][name] = sum(
+                    int(v) for v in values.values() if v.isdigit()
+                )
+
     return data
 
+
+async def poll_devices(devices, concurrency=MAX_CONCURRENT_POLLS):
+    """Birden fazla cihazı eşzamanlı sorgula
+
+    Args:
+        devices: get_snmp_data argümanlarını içeren dict listesi
+        concurrency: aynı anda sorgulanacak en fazla cihaz sayısı
+
+    Returns:
+        Cihaz listesiyle aynı sırada sonuç listesi
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def poll(device):
+        async with semaphore:
+            return await get_snmp_data(**device)
+
+    return await asyncio.gather(*(poll(device) for device in devices))
+
+
 if __name__ == "__main__":
-    print("🔍 Cihaz bilgisi çekiliyor: ISL_PREFABRIK_SW (10.5.0.76)")
+    names = ", ".join(f"{d['device_name']} ({d['device_ip']})" for d in DEVICES)
+    print(f"🔍 Cihaz bilgisi çekiliyor: {names}")
     print("-" * 60)
-    
-    device_data = get_snmp_data()
-    
+
+    results = asyncio.run(poll_devices(DEVICES))
+    device_data = results[0] if len(results) == 1 else results
+
     print("-" * 60)
     print("\n📊 Sonuç:")
     print(json.dumps(device_data, indent=2, ensure_ascii=False))
-    
+
     # Dosyaya kaydet
-    with open('device_data.json', 'w', encoding='utf-8') as f:
-        json.dump(device_data, f, indent=2, ensure_ascii=False)
-    
+    with open('device_data.json', 'wb') as f:
+        f.write(orjson.dumps(device_data, option=orjson.OPT_INDENT_2))
+
     print("\n💾 device_data.json dosyasına kaydedildi")
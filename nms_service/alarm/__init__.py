@@ -4,10 +4,11 @@ Evaluates metrics against thresholds and generates alarms.
 Implements vendor-agnostic state comparison logic.
 """
 
-from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime
+from typing import Dict, List, Optional, Any
+import time
 from dataclasses import dataclass
 
+from nms_service.core import serde
 from nms_service.core.logger import logger
 from nms_service.core.config import config
 from nms_service.core.models import (
@@ -17,10 +18,14 @@ from nms_service.core.models import (
     InterfaceMetric,
     DeviceHealthMetric,
     PreviousState,
+    InterfaceState,
+    DeviceHealthState,
+    ReachabilityState,
+    STATE_TYPES,
 )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AlarmRule:
     """Alarm rule configuration"""
     alarm_type: AlarmType
@@ -29,6 +34,7 @@ class AlarmRule:
     threshold: Optional[float] = None  # For threshold-based alarms
     metric_key: Optional[str] = None  # What to check (e.g., "cpu_usage")
     comparison_operator: Optional[str] = None  # ">=", "<=", "<", ">"
+    message_template: Optional[str] = None  # str.format template for alarm message
 
 
 class AlarmEngine:
@@ -44,12 +50,24 @@ class AlarmEngine:
     
     def __init__(self):
         """Initialize alarm engine"""
-        self.previous_state: Dict[Tuple[int, str], PreviousState] = {}
+        # Only the flags compared on the next evaluation are kept per entry;
+        # raw metric values already live in the metrics tables.
+        # device_id -> state key -> state
+        self.previous_state: Dict[int, Dict[str, PreviousState]] = {}
+        # Thresholds are read once; config is not reloaded at runtime
+        self._cpu_threshold = config.alarm.cpu_threshold
+        self._memory_threshold = config.alarm.memory_threshold
+        self._temperature_threshold = config.alarm.temperature_threshold
         self.alarm_rules = self._default_alarm_rules()
+        self._message_templates: Dict[AlarmType, str] = {
+            rule.alarm_type: rule.message_template
+            for rule in self.alarm_rules.values()
+            if rule.message_template
+        }
     
-    def _default_alarm_rules(self) -> List[AlarmRule]:
-        """Define default alarm rules"""
-        return [
+    def _default_alarm_rules(self) -> Dict[AlarmType, AlarmRule]:
+        """Define default alarm rules, keyed by alarm type"""
+        rules = [
             # Device unreachable is handled separately
             
             # Interface alarms
@@ -57,11 +75,13 @@ class AlarmEngine:
                 alarm_type=AlarmType.PORT_DOWN,
                 severity=AlarmSeverity.CRITICAL,
                 description="Interface is administratively up but operationally down",
+                message_template="Port {interface_name} ({description}) is down",
             ),
             AlarmRule(
                 alarm_type=AlarmType.PORT_UP,
                 severity=AlarmSeverity.INFO,
                 description="Interface recovered to up state",
+                message_template="Port {interface_name} ({description}) recovered",
             ),
             
             # Resource alarms
@@ -69,280 +89,300 @@ class AlarmEngine:
                 alarm_type=AlarmType.CPU_HIGH,
                 severity=AlarmSeverity.WARNING,
                 description="CPU usage exceeded threshold",
-                threshold=config.alarm.cpu_threshold,
+                threshold=self._cpu_threshold,
                 metric_key="cpu_usage",
                 comparison_operator=">=",
+                message_template="CPU usage {value:.1f}% exceeded threshold {threshold}%",
             ),
             AlarmRule(
                 alarm_type=AlarmType.MEMORY_HIGH,
                 severity=AlarmSeverity.WARNING,
                 description="Memory usage exceeded threshold",
-                threshold=config.alarm.memory_threshold,
+                threshold=self._memory_threshold,
                 metric_key="memory_usage",
                 comparison_operator=">=",
+                message_template="Memory usage {value:.1f}% exceeded threshold {threshold}%",
             ),
             AlarmRule(
                 alarm_type=AlarmType.TEMPERATURE_HIGH,
                 severity=AlarmSeverity.CRITICAL,
                 description="Temperature exceeded threshold",
-                threshold=config.alarm.temperature_threshold,
+                threshold=self._temperature_threshold,
                 metric_key="temperature",
                 comparison_operator=">=",
+                message_template="Temperature {value:.1f}°C exceeded threshold {threshold}°C",
             ),
         ]
+        return {rule.alarm_type: rule for rule in rules}
+    
+    def _get_state(self, device_id: int, state_key: str) -> Optional[PreviousState]:
+        """Get previous state for a device without creating an entry"""
+        device_states = self.previous_state.get(device_id)
+        return device_states.get(state_key) if device_states else None
+    
+    def _store_state(self, device_id: int, state_key: str, state: PreviousState) -> None:
+        """Store previous state for a device"""
+        device_states = self.previous_state.get(device_id)
+        if device_states is None:
+            device_states = self.previous_state[device_id] = {}
+        device_states[state_key] = state
     
     def evaluate_interface_metric(
         self,
         current_metric: InterfaceMetric,
+        now: Optional[float] = None,
     ) -> List[Alarm]:
         """Evaluate interface metrics and generate alarms
         
         Args:
             current_metric: Current interface metrics
+            now: Evaluation time as epoch seconds (defaults to time.time())
             
         Returns:
             List of generated alarms (empty if none)
         """
+        if now is None:
+            now = time.time()
         alarms = []
-        state_key = (current_metric.device_id, f"iface_{current_metric.interface_index}")
+        device_id = current_metric.device_id
+        interface_index = current_metric.interface_index
+        interface_name = current_metric.interface_name
+        description = current_metric.description
+        state_key = f"iface_{interface_index}"
         
         try:
+            is_down = current_metric.is_port_down()
+            previous = self._get_state(device_id, state_key)
+            was_down = previous is not None and previous.state.is_port_down
+            
             # Check for port down condition
-            if current_metric.is_port_down():
+            if is_down:
                 # Check if this is a new alarm or existing
-                previous = self.previous_state.get(state_key)
-                
-                if previous is None or not previous.state.get("is_port_down", False):
+                if not was_down:
                     # New port down alarm
                     alarm = Alarm(
-                        device_id=current_metric.device_id,
+                        device_id=device_id,
                         type=AlarmType.PORT_DOWN,
                         severity=AlarmSeverity.CRITICAL,
-                        message=(
-                            f"Port {current_metric.interface_name} "
-                            f"({current_metric.description}) is down"
+                        message=self._message_templates[AlarmType.PORT_DOWN].format(
+                            interface_name=interface_name,
+                            description=description,
                         ),
                         metadata={
-                            "interface_index": current_metric.interface_index,
-                            "interface_name": current_metric.interface_name,
-                            "description": current_metric.description,
+                            "interface_index": interface_index,
+                            "interface_name": interface_name,
+                            "description": description,
                             "admin_status": current_metric.admin_status,
                             "oper_status": current_metric.oper_status,
                         },
                     )
                     alarms.append(alarm)
                     logger.warning(
-                        f"Port down alarm for device {current_metric.device_id}, "
-                        f"interface {current_metric.interface_name}"
+                        "Port down alarm for device %s, interface %s",
+                        device_id, interface_name,
                     )
             else:
                 # Port is up - check if we had a previous down alarm
-                previous = self.previous_state.get(state_key)
-                
-                if previous is not None and previous.state.get("is_port_down", False):
+                if was_down:
                     # Port recovered
                     alarm = Alarm(
-                        device_id=current_metric.device_id,
+                        device_id=device_id,
                         type=AlarmType.PORT_UP,
                         severity=AlarmSeverity.INFO,
-                        message=(
-                            f"Port {current_metric.interface_name} "
-                            f"({current_metric.description}) recovered"
+                        message=self._message_templates[AlarmType.PORT_UP].format(
+                            interface_name=interface_name,
+                            description=description,
                         ),
                         metadata={
-                            "interface_index": current_metric.interface_index,
-                            "interface_name": current_metric.interface_name,
-                            "description": current_metric.description,
+                            "interface_index": interface_index,
+                            "interface_name": interface_name,
+                            "description": description,
                         },
                     )
                     alarms.append(alarm)
                     logger.info(
-                        f"Port recovery alarm for device {current_metric.device_id}, "
-                        f"interface {current_metric.interface_name}"
+                        "Port recovery alarm for device %s, interface %s",
+                        device_id, interface_name,
                     )
             
-            # Store current state for next evaluation
-            self.previous_state[state_key] = PreviousState(
-                device_id=current_metric.device_id,
-                metric_type="interface",
-                metric_key=str(current_metric.interface_index),
-                state={
-                    "is_port_down": current_metric.is_port_down(),
-                    "admin_status": current_metric.admin_status,
-                    "oper_status": current_metric.oper_status,
-                },
-                timestamp=current_metric.timestamp,
-            )
+            # Store current state for next evaluation (only when it changed)
+            if previous is None or was_down != is_down:
+                self._store_state(device_id, state_key, PreviousState(
+                    device_id=device_id,
+                    metric_type="interface",
+                    metric_key=str(interface_index),
+                    state=InterfaceState(is_port_down=is_down),
+                    timestamp=now,
+                ))
             
         except Exception as e:
-            logger.error(f"Error evaluating interface metric: {e}")
+            logger.error("Error evaluating interface metric: %s", e)
         
         return alarms
     
     def evaluate_device_health(
         self,
         current_metric: DeviceHealthMetric,
+        now: Optional[float] = None,
     ) -> List[Alarm]:
         """Evaluate device health metrics and generate alarms
         
         Args:
             current_metric: Current device health metrics
+            now: Evaluation time as epoch seconds (defaults to time.time())
             
         Returns:
             List of generated alarms
         """
+        if now is None:
+            now = time.time()
         alarms = []
-        state_key = (current_metric.device_id, "device_health")
+        device_id = current_metric.device_id
+        device_name = current_metric.device_name
+        cpu_usage = current_metric.cpu_usage
+        memory_usage = current_metric.memory_usage
+        temperature = current_metric.temperature
+        state_key = "device_health"
         
         try:
+            # Single previous-state lookup shared by all threshold checks
+            previous = self._get_state(device_id, state_key)
+            prev_state = previous.state if previous is not None else None
+            new_state = DeviceHealthState(
+                cpu_high=cpu_usage is not None and cpu_usage >= self._cpu_threshold,
+                memory_high=(
+                    memory_usage is not None and memory_usage >= self._memory_threshold
+                ),
+                temperature_high=(
+                    temperature is not None and temperature >= self._temperature_threshold
+                ),
+            )
+            
             # Evaluate CPU threshold
-            if (
-                current_metric.cpu_usage is not None
-                and current_metric.cpu_usage >= config.alarm.cpu_threshold
-            ):
-                previous = self.previous_state.get(state_key)
-                was_high = (
-                    previous is not None
-                    and previous.state.get("cpu_high", False)
+            if new_state.cpu_high and not (prev_state and prev_state.cpu_high):
+                alarm = Alarm(
+                    device_id=device_id,
+                    device_name=device_name,
+                    type=AlarmType.CPU_HIGH,
+                    severity=AlarmSeverity.WARNING,
+                    message=self._message_templates[AlarmType.CPU_HIGH].format(
+                        value=cpu_usage,
+                        threshold=self._cpu_threshold,
+                    ),
+                    metadata={
+                        "cpu_usage": cpu_usage,
+                        "threshold": self._cpu_threshold,
+                    },
+                )
+                alarms.append(alarm)
+                logger.warning(
+                    "CPU high alarm for device %s: %.1f%%", device_id, cpu_usage,
                 )
-                
-                if not was_high:
-                    alarm = Alarm(
-                        device_id=current_metric.device_id,
-                        device_name=current_metric.device_name,
-                        type=AlarmType.CPU_HIGH,
-                        severity=AlarmSeverity.WARNING,
-                        message=(
-                            f"CPU usage {current_metric.cpu_usage:.1f}% "
-                            f"exceeded threshold {config.alarm.cpu_threshold}%"
-                        ),
-                        metadata={
-                            "cpu_usage": current_metric.cpu_usage,
-                            "threshold": config.alarm.cpu_threshold,
-                        },
-                    )
-                    alarms.append(alarm)
-                    logger.warning(
-                        f"CPU high alarm for device {current_metric.device_id}: "
-                        f"{current_metric.cpu_usage:.1f}%"
-                    )
             
             # Evaluate memory threshold
-            if (
-                current_metric.memory_usage is not None
-                and current_metric.memory_usage >= config.alarm.memory_threshold
-            ):
-                previous = self.previous_state.get(state_key)
-                was_high = (
-                    previous is not None
-                    and previous.state.get("memory_high", False)
+            if new_state.memory_high and not (prev_state and prev_state.memory_high):
+                alarm = Alarm(
+                    device_id=device_id,
+                    device_name=device_name,
+                    type=AlarmType.MEMORY_HIGH,
+                    severity=AlarmSeverity.WARNING,
+                    message=self._message_templates[AlarmType.MEMORY_HIGH].format(
+                        value=memory_usage,
+                        threshold=self._memory_threshold,
+                    ),
+                    metadata={
+                        "memory_usage": memory_usage,
+                        "threshold": self._memory_threshold,
+                    },
+                )
+                alarms.append(alarm)
+                logger.warning(
+                    "Memory high alarm for device %s: %.1f%%", device_id, memory_usage,
                 )
-                
-                if not was_high:
-                    alarm = Alarm(
-                        device_id=current_metric.device_id,
-                        device_name=current_metric.device_name,
-                        type=AlarmType.MEMORY_HIGH,
-                        severity=AlarmSeverity.WARNING,
-                        message=(
-                            f"Memory usage {current_metric.memory_usage:.1f}% "
-                            f"exceeded threshold {config.alarm.memory_threshold}%"
-                        ),
-                        metadata={
-                            "memory_usage": current_metric.memory_usage,
-                            "threshold": config.alarm.memory_threshold,
-                        },
-                    )
-                    alarms.append(alarm)
-                    logger.warning(
-                        f"Memory high alarm for device {current_metric.device_id}: "
-                        f"{current_metric.memory_usage:.1f}%"
-                    )
             
             # Evaluate temperature threshold
-            if (
-                current_metric.temperature is not None
-                and current_metric.temperature >= config.alarm.temperature_threshold
+            if new_state.temperature_high and not (
+                prev_state and prev_state.temperature_high
             ):
-                previous = self.previous_state.get(state_key)
-                was_high = (
-                    previous is not None
-                    and previous.state.get("temperature_high", False)
+                alarm = Alarm(
+                    device_id=device_id,
+                    device_name=device_name,
+                    type=AlarmType.TEMPERATURE_HIGH,
+                    severity=AlarmSeverity.CRITICAL,
+                    message=self._message_templates[AlarmType.TEMPERATURE_HIGH].format(
+                        value=temperature,
+                        threshold=self._temperature_threshold,
+                    ),
+                    metadata={
+                        "temperature": temperature,
+                        "threshold": self._temperature_threshold,
+                    },
+                )
+                alarms.append(alarm)
+                logger.warning(
+                    "Temperature high alarm for device %s: %.1f°C", device_id, temperature,
                 )
-                
-                if not was_high:
-                    alarm = Alarm(
-                        device_id=current_metric.device_id,
-                        device_name=current_metric.device_name,
-                        type=AlarmType.TEMPERATURE_HIGH,
-                        severity=AlarmSeverity.CRITICAL,
-                        message=(
-                            f"Temperature {current_metric.temperature:.1f}°C "
-                            f"exceeded threshold {config.alarm.temperature_threshold}°C"
-                        ),
-                        metadata={
-                            "temperature": current_metric.temperature,
-                            "threshold": config.alarm.temperature_threshold,
-                        },
-                    )
-                    alarms.append(alarm)
-                    logger.warning(
-                        f"Temperature high alarm for device {current_metric.device_id}: "
-                        f"{current_metric.temperature:.1f}°C"
-                    )
             
-            # Store current state
-            self.previous_state[state_key] = PreviousState(
-                device_id=current_metric.device_id,
-                metric_type="device_health",
-                metric_key=str(current_metric.device_id),
-                state={
-                    "cpu_usage": current_metric.cpu_usage,
-                    "cpu_high": (
-                        current_metric.cpu_usage >= config.alarm.cpu_threshold
-                        if current_metric.cpu_usage is not None else False
-                    ),
-                    "memory_usage": current_metric.memory_usage,
-                    "memory_high": (
-                        current_metric.memory_usage >= config.alarm.memory_threshold
-                        if current_metric.memory_usage is not None else False
-                    ),
-                    "temperature": current_metric.temperature,
-                    "temperature_high": (
-                        current_metric.temperature >= config.alarm.temperature_threshold
-                        if current_metric.temperature is not None else False
-                    ),
-                },
-                timestamp=current_metric.timestamp,
-            )
+            # Store current state (only when it changed)
+            if prev_state != new_state:
+                self._store_state(device_id, state_key, PreviousState(
+                    device_id=device_id,
+                    metric_type="device_health",
+                    metric_key=str(device_id),
+                    state=new_state,
+                    timestamp=now,
+                ))
             
         except Exception as e:
-            logger.error(f"Error evaluating device health metric: {e}")
+            logger.error("Error evaluating device health metric: %s", e)
         
         return alarms
-    
+
+    def evaluate_device_health_batch(
+        self,
+        metrics: List[DeviceHealthMetric],
+    ) -> List[Alarm]:
+        """Evaluate health metrics for many devices in one call
+
+        Args:
+            metrics: Current health metrics, one per device
+
+        Returns:
+            List of generated alarms for all devices
+        """
+        evaluate = self.evaluate_device_health
+        now = time.time()
+        alarms = []
+        for metric in metrics:
+            alarms.extend(evaluate(metric, now))
+        return alarms
+
     def device_unreachable(
         self,
         device_id: int,
         device_name: str,
+        now: Optional[float] = None,
     ) -> List[Alarm]:
         """Generate device unreachable alarm
         
         Args:
             device_id: Device identifier
             device_name: Device name
+            now: Evaluation time as epoch seconds (defaults to time.time())
             
         Returns:
             List with unreachable alarm
         """
-        state_key = (device_id, "device_reachability")
+        if now is None:
+            now = time.time()
+        state_key = "device_reachability"
         alarms = []
         
         try:
-            previous = self.previous_state.get(state_key)
+            previous = self._get_state(device_id, state_key)
             was_unreachable = (
                 previous is not None
-                and previous.state.get("unreachable", False)
+                and previous.state.unreachable
             )
             
             if not was_unreachable:
@@ -355,19 +395,20 @@ class AlarmEngine:
                     metadata={},
                 )
                 alarms.append(alarm)
-                logger.error(f"Device unreachable alarm for {device_name} ({device_id})")
+                logger.error("Device unreachable alarm for %s (%s)", device_name, device_id)
             
-            # Store state
-            self.previous_state[state_key] = PreviousState(
-                device_id=device_id,
-                metric_type="reachability",
-                metric_key=str(device_id),
-                state={"unreachable": True},
-                timestamp=datetime.utcnow(),
-            )
+            # Store state (only when it changed)
+            if not was_unreachable:
+                self._store_state(device_id, state_key, PreviousState(
+                    device_id=device_id,
+                    metric_type="reachability",
+                    metric_key=str(device_id),
+                    state=ReachabilityState(unreachable=True),
+                    timestamp=now,
+                ))
             
         except Exception as e:
-            logger.error(f"Error generating unreachable alarm: {e}")
+            logger.error("Error generating unreachable alarm: %s", e)
         
         return alarms
     
@@ -375,24 +416,28 @@ class AlarmEngine:
         self,
         device_id: int,
         device_name: str,
+        now: Optional[float] = None,
     ) -> List[Alarm]:
         """Generate device recovered alarm
         
         Args:
             device_id: Device identifier
             device_name: Device name
+            now: Evaluation time as epoch seconds (defaults to time.time())
             
         Returns:
             List with recovery alarm
         """
-        state_key = (device_id, "device_reachability")
+        if now is None:
+            now = time.time()
+        state_key = "device_reachability"
         alarms = []
         
         try:
-            previous = self.previous_state.get(state_key)
+            previous = self._get_state(device_id, state_key)
             was_unreachable = (
                 previous is not None
-                and previous.state.get("unreachable", False)
+                and previous.state.unreachable
             )
             
             if was_unreachable:
@@ -405,19 +450,20 @@ class AlarmEngine:
                     metadata={},
                 )
                 alarms.append(alarm)
-                logger.info(f"Device recovery alarm for {device_name} ({device_id})")
+                logger.info("Device recovery alarm for %s (%s)", device_name, device_id)
             
-            # Store state
-            self.previous_state[state_key] = PreviousState(
-                device_id=device_id,
-                metric_type="reachability",
-                metric_key=str(device_id),
-                state={"unreachable": False},
-                timestamp=datetime.utcnow(),
-            )
+            # Store state (only when it changed)
+            if previous is None or was_unreachable:
+                self._store_state(device_id, state_key, PreviousState(
+                    device_id=device_id,
+                    metric_type="reachability",
+                    metric_key=str(device_id),
+                    state=ReachabilityState(unreachable=False),
+                    timestamp=now,
+                ))
             
         except Exception as e:
-            logger.error(f"Error generating recovery alarm: {e}")
+            logger.error("Error generating recovery alarm: %s", e)
         
         return alarms
     
@@ -427,8 +473,47 @@ class AlarmEngine:
         Args:
             device_id: Device identifier
         """
-        keys_to_remove = [k for k in self.previous_state.keys() if k[0] == device_id]
-        for key in keys_to_remove:
-            del self.previous_state[key]
+        self.previous_state.pop(device_id, None)
+        
+        logger.debug("Cleared state for device %s", device_id)
+    
+    def dump_state(self) -> bytes:
+        """Serialize previous state for persistence or transport
+        
+        Returns:
+            JSON-encoded list of state entries
+        """
+        return serde.dumps([
+            [
+                device_id,
+                state_key,
+                state.metric_type,
+                state.metric_key,
+                list(state.state),  # orjson doesn't encode NamedTuples
+                state.timestamp,
+            ]
+            for device_id, device_states in self.previous_state.items()
+            for state_key, state in device_states.items()
+        ])
+    
+    def load_state(self, blob: bytes) -> int:
+        """Restore previous state produced by dump_state()
+        
+        Args:
+            blob: Serialized state
+            
+        Returns:
+            Number of state entries restored
+        """
+        entries = serde.loads(blob)
+        for device_id, state_key, metric_type, metric_key, state, timestamp in entries:
+            self._store_state(device_id, state_key, PreviousState(
+                device_id=device_id,
+                metric_type=metric_type,
+                metric_key=metric_key,
+                state=STATE_TYPES[metric_type](*state),
+                timestamp=timestamp,
+            ))
         
-        logger.debug(f"Cleared state for device {device_id}")
+        logger.debug("Restored %d alarm state entries", len(entries))
+        return len(entries)
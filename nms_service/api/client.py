@@ -3,10 +3,15 @@
 Integrates with Node.js backend to store alarms and metrics.
 """
 
+import random
+import threading
+import time
 import httpx
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+from nms_service.core import serde
 from nms_service.core.logger import logger
 from nms_service.core.config import config
 from nms_service.core.models import (
@@ -15,6 +20,22 @@ from nms_service.core.models import (
     AlarmSeverity,
 )
 
+# Payloads are pre-encoded with serde.dumps, so the content type is set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Exponential backoff between retries: base * 2**attempt, capped, with jitter
+RETRY_BACKOFF_BASE = 0.1
+RETRY_BACKOFF_MAX = 2.0
+
+# Raised before the request reached the server, so safe to retry for any method
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Idempotent methods may also be retried after the request was sent
+IDEMPOTENT_METHODS = {"GET", "PUT", "PATCH", "DELETE"}
+
+# Seconds a health_check() result is reused before the backend is asked again
+HEALTH_CHECK_CACHE_TTL = 5.0
+
 
 class APIClient:
     """HTTP client for backend API communication"""
@@ -23,7 +44,22 @@ class APIClient:
         """Initialize API client"""
         self.base_url = config.api.base_url
         self.timeout = config.api.timeout
-        self.client = httpx.Client(timeout=self.timeout)
+        self.max_connections = config.api.max_connections
+        self.retry_attempts = max(1, config.api.retry_attempts)
+        # Keep-alive pool shared by all calls (and by create_alarms_bulk workers)
+        self.client = httpx.Client(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=config.api.max_keepalive_connections,
+            ),
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._bulk_alarms_supported = True
+        self._bulk_metrics_supported = True
+        self._bulk_status_supported = True
+        self._health_cache = (float("-inf"), False)  # (monotonic time, healthy)
+        self._health_lock = threading.Lock()
     
     def _build_url(self, endpoint: str) -> str:
         """Build full URL for endpoint
@@ -36,6 +72,55 @@ class APIClient:
         """
         return f"{self.base_url}/api{endpoint}"
     
+    def _send(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Send request, retrying transient transport errors
+        
+        Retries use exponential backoff with jitter. POSTs are only retried
+        on connection errors so an alarm is never created twice; HTTP error
+        responses are returned to the caller without retrying.
+        
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            **kwargs: Passed to httpx.Client.request
+            
+        Returns:
+            HTTP response
+        """
+        retryable = httpx.TransportError if method in IDEMPOTENT_METHODS else CONNECT_ERRORS
+        url = self._build_url(endpoint)
+        
+        for attempt in range(self.retry_attempts):
+            try:
+                return self.client.request(method, url, **kwargs)
+            except retryable as e:
+                if attempt == self.retry_attempts - 1:
+                    raise
+                delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.0)
+                logger.debug(
+                    f"{method} {endpoint} failed ({e}), retrying in {delay:.2f}s"
+                )
+                time.sleep(delay)
+    
+    def _alarm_payload(self, alarm: Alarm) -> Dict[str, Any]:
+        """Build API payload for an alarm
+        
+        Args:
+            alarm: Alarm model
+            
+        Returns:
+            JSON-serializable payload
+        """
+        return {
+            "device_id": alarm.device_id,
+            "device_name": alarm.device_name,
+            "type": alarm.type.value,
+            "severity": alarm.severity.value,
+            "message": alarm.message,
+            "metadata": alarm.metadata,
+        }
+    
     def create_alarm(self, alarm: Alarm) -> Optional[Dict[str, Any]]:
         """Create alarm via API
         
@@ -46,18 +131,13 @@ class APIClient:
             Response data or None if failed
         """
         try:
-            payload = {
-                "device_id": alarm.device_id,
-                "device_name": alarm.device_name,
-                "type": alarm.type.value,
-                "severity": alarm.severity.value,
-                "message": alarm.message,
-                "metadata": alarm.metadata,
-            }
-            
-            response = self.client.post(
-                self._build_url("/alarms"),
-                json=payload,
+            payload = self._alarm_payload(alarm)
+            
+            response = self._send(
+                "POST",
+                "/alarms",
+                content=serde.dumps(payload),
+                headers=JSON_HEADERS,
             )
             
             if response.status_code in (200, 201):
@@ -74,6 +154,83 @@ class APIClient:
             logger.error(f"API call failed for create_alarm: {e}")
             return None
     
+    def create_alarms_bulk_single_request(
+        self,
+        alarms: List[Alarm],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Create several alarms with one POST to /alarms/bulk
+        
+        Args:
+            alarms: Alarm models
+            
+        Returns:
+            Created alarm records or None if failed. A 404 marks the
+            bulk endpoint as unavailable for the lifetime of the client.
+        """
+        try:
+            payload = [self._alarm_payload(alarm) for alarm in alarms]
+            
+            response = self._send(
+                "POST",
+                "/alarms/bulk",
+                content=serde.dumps(payload),
+                headers=JSON_HEADERS,
+            )
+            
+            if response.status_code in (200, 201):
+                logger.debug(f"Created {len(alarms)} alarms via bulk API")
+                return response.json().get("data", [])
+            
+            if response.status_code == 404:
+                logger.info("Bulk alarm endpoint not available, using per-alarm requests")
+                self._bulk_alarms_supported = False
+            else:
+                logger.warning(
+                    f"API bulk alarm creation failed: {response.status_code} "
+                    f"{response.text}"
+                )
+            return None
+            
+        except Exception as e:
+            logger.error(f"API call failed for create_alarms_bulk_single_request: {e}")
+            return None
+    
+    def create_alarms_bulk(
+        self,
+        alarms: List[Alarm],
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Create several alarms via API
+        
+        Uses the /alarms/bulk endpoint when the backend provides it and
+        falls back to concurrent per-alarm requests otherwise.
+        
+        Args:
+            alarms: Alarm models
+            
+        Returns:
+            Response data (or None if failed) for each alarm, in order
+        """
+        if not alarms:
+            return []
+        if len(alarms) == 1:
+            return [self.create_alarm(alarms[0])]
+        
+        if self._bulk_alarms_supported:
+            created = self.create_alarms_bulk_single_request(alarms)
+            if created is not None:
+                return created
+            if self._bulk_alarms_supported:
+                # Request reached the bulk endpoint but failed; don't resend
+                # alarms individually and risk duplicates.
+                return [None] * len(alarms)
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_connections,
+                thread_name_prefix="nms-api",
+            )
+        return list(self._executor.map(self.create_alarm, alarms))
+    
     def get_active_alarms(
         self,
         device_id: Optional[int] = None,
@@ -126,9 +283,11 @@ class APIClient:
         try:
             payload = {"acknowledged_by": acknowledged_by}
             
-            response = self.client.patch(
-                self._build_url(f"/alarms/{alarm_id}/acknowledge"),
-                json=payload,
+            response = self._send(
+                "PATCH",
+                f"/alarms/{alarm_id}/acknowledge",
+                content=serde.dumps(payload),
+                headers=JSON_HEADERS,
             )
             
             if response.status_code in (200, 204):
@@ -144,6 +303,60 @@ class APIClient:
             logger.error(f"API call failed for acknowledge_alarm: {e}")
             return False
     
+    def update_device_statuses_bulk(
+        self,
+        statuses: Dict[int, str],
+    ) -> bool:
+        """Update the connection status of several devices with one request
+        
+        Uses PUT /devices/status when the backend provides it and falls back
+        to one update_device_status() call per device otherwise.
+        
+        Args:
+            statuses: Device ID -> connection status (online/offline)
+            
+        Returns:
+            Success status (True if every device was updated)
+        """
+        if not statuses:
+            return True
+        
+        if self._bulk_status_supported:
+            try:
+                payload = [
+                    {"id": device_id, "connection_status": status}
+                    for device_id, status in statuses.items()
+                ]
+                
+                response = self._send(
+                    "PUT",
+                    "/devices/status",
+                    content=serde.dumps(payload),
+                    headers=JSON_HEADERS,
+                )
+                
+                if response.status_code in (200, 204):
+                    logger.debug(f"Updated status of {len(statuses)} devices")
+                    return True
+                if response.status_code != 404:
+                    logger.warning(
+                        f"API bulk device status update failed: {response.status_code}"
+                    )
+                    return False
+                
+                logger.info("Bulk device status endpoint not available, using per-device requests")
+                self._bulk_status_supported = False
+                
+            except Exception as e:
+                logger.error(f"API call failed for update_device_statuses_bulk: {e}")
+                return False
+        
+        results = [
+            self.update_device_status(device_id, status)
+            for device_id, status in statuses.items()
+        ]
+        return all(results)
+    
     def update_device_status(
         self,
         device_id: int,
@@ -161,9 +374,11 @@ class APIClient:
         try:
             payload = {"connection_status": status}
             
-            response = self.client.put(
-                self._build_url(f"/devices/{device_id}"),
-                json=payload,
+            response = self._send(
+                "PUT",
+                f"/devices/{device_id}",
+                content=serde.dumps(payload),
+                headers=JSON_HEADERS,
             )
             
             if response.status_code in (200, 204):
@@ -179,6 +394,31 @@ class APIClient:
             logger.error(f"API call failed for update_device_status: {e}")
             return False
     
+    def _metrics_payload(
+        self,
+        device_id: int,
+        metric_type: str,
+        data: Dict[str, Any],
+        timestamp: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Build API payload for a metrics sample
+        
+        Args:
+            device_id: Device ID
+            metric_type: Type of metric
+            data: Metric data
+            timestamp: Collection time (default: now)
+            
+        Returns:
+            JSON-serializable payload
+        """
+        return {
+            "device_id": device_id,
+            "metric_type": metric_type,
+            "data": data,
+            "timestamp": timestamp or datetime.utcnow(),
+        }
+    
     def send_metrics(
         self,
         device_id: int,
@@ -196,16 +436,13 @@ class APIClient:
             Response data or None if failed
         """
         try:
-            payload = {
-                "device_id": device_id,
-                "metric_type": metric_type,
-                "data": data,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-            
-            response = self.client.post(
-                self._build_url("/metrics"),
-                json=payload,
+            payload = self._metrics_payload(device_id, metric_type, data)
+            
+            response = self._send(
+                "POST",
+                "/metrics",
+                content=serde.dumps(payload),
+                headers=JSON_HEADERS,
             )
             
             if response.status_code in (200, 201):
@@ -221,25 +458,94 @@ class APIClient:
             logger.error(f"API call failed for send_metrics: {e}")
             return None
     
+    def send_metrics_bulk(
+        self,
+        metrics: List[Dict[str, Any]],
+    ) -> bool:
+        """Send several metrics samples with one POST to /metrics/bulk
+        
+        Falls back to one send_metrics() call per sample when the backend
+        has no bulk endpoint.
+        
+        Args:
+            metrics: Samples with device_id, metric_type, data and
+                (optionally) timestamp keys
+            
+        Returns:
+            Success status (True if every sample was accepted)
+        """
+        if not metrics:
+            return True
+        
+        if self._bulk_metrics_supported:
+            try:
+                payload = [self._metrics_payload(**metric) for metric in metrics]
+                
+                response = self._send(
+                    "POST",
+                    "/metrics/bulk",
+                    content=serde.dumps(payload),
+                    headers=JSON_HEADERS,
+                )
+                
+                if response.status_code in (200, 201):
+                    logger.debug(f"Sent {len(metrics)} metrics samples via bulk API")
+                    return True
+                if response.status_code != 404:
+                    # Request reached the bulk endpoint but failed; don't
+                    # resend samples individually and risk duplicates.
+                    logger.warning(
+                        f"API bulk metrics send failed: {response.status_code}"
+                    )
+                    return False
+                
+                logger.info("Bulk metrics endpoint not available, using per-sample requests")
+                self._bulk_metrics_supported = False
+                
+            except Exception as e:
+                logger.error(f"API call failed for send_metrics_bulk: {e}")
+                return False
+        
+        results = [
+            self.send_metrics(metric["device_id"], metric["metric_type"], metric["data"])
+            for metric in metrics
+        ]
+        return all(result is not None for result in results)
+    
     def health_check(self) -> bool:
         """Check backend API health
         
+        The result is cached for HEALTH_CHECK_CACHE_TTL seconds so frequent
+        callers don't each trigger a request.
+        
         Returns:
             True if API is healthy
         """
-        try:
-            response = self.client.get(
-                self._build_url("/health"),
-                timeout=5,
-            )
-            return response.status_code == 200
-        except Exception as e:
-            logger.warning(f"API health check failed: {e}")
-            return False
+        with self._health_lock:
+            checked_at, healthy = self._health_cache
+            now = time.monotonic()
+            if now - checked_at < HEALTH_CHECK_CACHE_TTL:
+                return healthy
+            
+            try:
+                response = self.client.get(
+                    self._build_url("/health"),
+                    timeout=5,
+                )
+                healthy = response.status_code == 200
+            except Exception as e:
+                logger.warning(f"API health check failed: {e}")
+                healthy = False
+            
+            self._health_cache = (now, healthy)
+            return healthy
     
     def close(self) -> None:
         """Close HTTP client"""
         try:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
             self.client.close()
         except Exception as e:
             logger.warning(f"Error closing API client: {e}")
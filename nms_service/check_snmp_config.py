@@ -1,46 +1,61 @@
-import socket
+import asyncio
 from pysnmp.hlapi import *
 import sys
 
-def check_snmp(ip, community, timeout=5):
-    print(f"--- SNMP Connection Check for {ip} ---")
-    
-    # 1. Basic UDP Port Check
-    print(f"[*] Checking UDP port 161 on {ip}...")
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.settimeout(timeout)
-    try:
-        # UDP is connectionless, so this just checks if we can 'send'
-        sock.sendto(b'', (ip, 161))
-        print("[+] UDP packet sent successfully.")
-    except Exception as e:
-        print(f"[-] Failed to send UDP packet: {e}")
-    finally:
-        sock.close()
-
-    # 2. SNMP GET Test (System Description)
-    print(f"[*] Attempting SNMP v2c GET (1.3.6.1.2.1.1.1.0) with community '{community}'...")
-    error_indication, error_status, error_index, var_binds = next(
+# System group scalars requested together in a single GET PDU
+DEFAULT_CHECK_OIDS = [
+    '1.3.6.1.2.1.1.1.0',  # sysDescr
+    '1.3.6.1.2.1.1.3.0',  # sysUpTime
+    '1.3.6.1.2.1.1.5.0',  # sysName
+]
+
+SNMP_RETRIES = 2
+
+def _snmp_get(ip, community, oids, timeout):
+    return next(
         getCmd(SnmpEngine(),
                CommunityData(community),
-               UdpTransportTarget((ip, 161), timeout=timeout, retries=2),
+               UdpTransportTarget((ip, 161), timeout=timeout, retries=SNMP_RETRIES),
                ContextData(),
-               ObjectType(ObjectIdentity('1.3.6.1.2.1.1.1.0')))
+               *[ObjectType(ObjectIdentity(oid)) for oid in oids])
     )
 
+def _print_unreachable_tips():
+    print("    TIP: This usually means:")
+    print("    1. The IP is unreachable (check routing/firewall).")
+    print("    2. SNMP is not enabled on the device.")
+    print("    3. The device is blocking requests from this IP (172.18.x.x or host IP).")
+
+async def check_snmp(ip, community, timeout=5, oids=None):
+    oids = oids or DEFAULT_CHECK_OIDS
+    print(f"--- SNMP Connection Check for {ip} ---")
+
+    # UDP is connectionless, so the SNMP GET timeout itself is the
+    # reachability signal; there is no separate port probe.
+    print(f"[*] Attempting SNMP v2c GET ({', '.join(oids)}) with community '{community}'...")
+    try:
+        error_indication, error_status, error_index, var_binds = await asyncio.wait_for(
+            asyncio.to_thread(_snmp_get, ip, community, oids, timeout),
+            timeout=timeout * (SNMP_RETRIES + 1) + 1,
+        )
+    except asyncio.TimeoutError:
+        print("[!] SNMP Error: No SNMP response received before timeout")
+        _print_unreachable_tips()
+        return False
+
     if error_indication:
         print(f"[!] SNMP Error: {error_indication}")
         if "timeout" in str(error_indication).lower():
-            print("    TIP: This usually means:")
-            print("    1. The IP is unreachable (check routing/firewall).")
-            print("    2. SNMP is not enabled on the device.")
-            print("    3. The device is blocking requests from this IP (172.18.x.x or host IP).")
+            _print_unreachable_tips()
+        return False
     elif error_status:
         print(f"[!] SNMP Error Status: {error_status.prettyPrint()} at {error_index}")
+        return False
     else:
         print("[+] SNMP Response Received!")
         for var_bind in var_binds:
             print(f"    Result: {var_bind.prettyPrint()}")
+        return True
 
 if __name__ == "__main__":
     ip = "10.5.0.66"
@@ -49,5 +64,7 @@ if __name__ == "__main__":
         ip = sys.argv[1]
     if len(sys.argv) > 2:
         community = sys.argv[2]
-        
-    check_snmp(ip, community)
+    oids = sys.argv[3:] or None
+
+    ok = asyncio.run(check_snmp(ip, community, oids=oids))
+    sys.exit(0 if ok else 1)
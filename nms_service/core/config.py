@@ -4,12 +4,15 @@ Loads configuration from environment variables and config files.
 Follows 12-factor app principles.
 """
 
-import os
-from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from dataclasses import dataclass, field
+from urllib.parse import quote_plus
 from typing import Optional, Dict, List
 import json
 from pathlib import Path
 
+from nms_service.core import env, serde
+
 
 @dataclass
 class DatabaseConfig:
@@ -21,14 +24,20 @@ class DatabaseConfig:
     database: str
     pool_size: int = 10
     max_overflow: int = 20
+    metrics_retention_days: int = 0  # 0 keeps metric history forever
+    _connection_string: str = field(init=False, repr=False)
     
-    @property
-    def connection_string(self) -> str:
-        """Generate SQLAlchemy connection string"""
-        return (
-            f"postgresql://{self.username}:{self.password}@"
+    def __post_init__(self):
+        # Credentials are URL-quoted so passwords containing '@', '/' or ':' work
+        self._connection_string = (
+            f"postgresql://{quote_plus(self.username)}:{quote_plus(self.password)}@"
             f"{self.host}:{self.port}/{self.database}"
         )
+    
+    @property
+    def connection_string(self) -> str:
+        """SQLAlchemy connection string"""
+        return self._connection_string
 
 
 @dataclass
@@ -38,6 +47,10 @@ class SNMPConfig:
     snmp_retries: int = 3
     max_concurrent_pollers: int = 20
     bulk_walk_enabled: bool = True
+    # GETBULK rows per response; agents trim responses to their message
+    # size, and a tooBig answer halves it per device
+    bulk_max_repetitions: int = 50
+    oid_batch_size: int = 40  # varbinds per GET when reading cached OIDs
 
 
 @dataclass
@@ -46,6 +59,8 @@ class PollingConfig:
     interface_poll_interval: int = 30  # seconds
     cpu_memory_poll_interval: int = 300  # 5 minutes
     inventory_poll_interval: int = 3600  # 1 hour
+    oid_cache_refresh_interval: int = 3600  # re-walk cached tables hourly; 0 disables
+    max_parallel_per_host: int = 1  # devices polled at once per SNMP agent IP
 
 
 @dataclass
@@ -62,59 +77,78 @@ class APIConfig:
     base_url: str
     timeout: int = 10
     retry_attempts: int = 3
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
 
 
 class Config:
     """Main configuration class"""
     
     def __init__(self):
-        self.env = os.getenv("NMS_ENV", "development")
-        self.debug = os.getenv("NMS_DEBUG", "false").lower() == "true"
-        self.log_level = os.getenv("NMS_LOG_LEVEL", "INFO")
+        self.env = env.get_str("NMS_ENV", "development")
+        self.debug = env.get_bool("NMS_DEBUG", False)
+        self.log_level = env.get_str("NMS_LOG_LEVEL", "INFO")
+        # Port of the /internal/metrics endpoint; 0 disables it
+        self.metrics_port = env.get_int("METRICS_PORT", 0)
         
         # Database
         self.database = DatabaseConfig(
-            host=os.getenv("DB_HOST", "localhost"),
-            port=int(os.getenv("DB_PORT", 5432)),
-            username=os.getenv("DB_USER", "nms_user"),
-            password=os.getenv("DB_PASSWORD", ""),  # Should be set in production
-            database=os.getenv("DB_NAME", "nms_db"),
-            pool_size=int(os.getenv("DB_POOL_SIZE", 10)),
+            host=env.get_str("DB_HOST", "localhost"),
+            port=env.get_int("DB_PORT", 5432),
+            username=env.get_str("DB_USER", "nms_user"),
+            password=env.get_str("DB_PASSWORD", ""),  # Should be set in production
+            database=env.get_str("DB_NAME", "nms_db"),
+            pool_size=env.get_int("DB_POOL_SIZE", 10),
+            metrics_retention_days=env.get_int("METRICS_RETENTION_DAYS", 0),
         )
         
         # SNMP
         self.snmp = SNMPConfig(
-            snmp_timeout=int(os.getenv("SNMP_TIMEOUT", 10)),
-            snmp_retries=int(os.getenv("SNMP_RETRIES", 3)),
-            max_concurrent_pollers=int(os.getenv("MAX_CONCURRENT_POLLERS", 20)),
+            snmp_timeout=env.get_int("SNMP_TIMEOUT", 10),
+            snmp_retries=env.get_int("SNMP_RETRIES", 3),
+            max_concurrent_pollers=env.get_int("MAX_CONCURRENT_POLLERS", 20),
+            bulk_max_repetitions=env.get_int("SNMP_BULK_MAX_REPETITIONS", 50),
+            oid_batch_size=env.get_int("SNMP_OID_BATCH_SIZE", 40),
         )
         
         # Polling intervals
         self.polling = PollingConfig(
-            interface_poll_interval=int(os.getenv("INTERFACE_POLL_INTERVAL", 30)),
-            cpu_memory_poll_interval=int(os.getenv("CPU_MEMORY_POLL_INTERVAL", 300)),
-            inventory_poll_interval=int(os.getenv("INVENTORY_POLL_INTERVAL", 3600)),
+            interface_poll_interval=env.get_int("INTERFACE_POLL_INTERVAL", 30),
+            cpu_memory_poll_interval=env.get_int("CPU_MEMORY_POLL_INTERVAL", 300),
+            inventory_poll_interval=env.get_int("INVENTORY_POLL_INTERVAL", 3600),
+            oid_cache_refresh_interval=env.get_int("OID_CACHE_REFRESH_INTERVAL", 3600),
+            max_parallel_per_host=env.get_int("MAX_PARALLEL_PER_HOST", 1),
         )
         
         # Alarm thresholds
         self.alarm = AlarmConfig(
-            cpu_threshold=float(os.getenv("CPU_THRESHOLD", 80.0)),
-            memory_threshold=float(os.getenv("MEMORY_THRESHOLD", 80.0)),
-            temperature_threshold=float(os.getenv("TEMPERATURE_THRESHOLD", 80.0)),
+            cpu_threshold=env.get_float("CPU_THRESHOLD", 80.0),
+            memory_threshold=env.get_float("MEMORY_THRESHOLD", 80.0),
+            temperature_threshold=env.get_float("TEMPERATURE_THRESHOLD", 80.0),
         )
         
         # Backend API
         self.api = APIConfig(
-            base_url=os.getenv("BACKEND_API_URL", "http://localhost:3000"),
-            timeout=int(os.getenv("API_TIMEOUT", 10)),
+            base_url=env.get_str("BACKEND_API_URL", "http://localhost:3000"),
+            timeout=env.get_int("API_TIMEOUT", 10),
+            max_connections=env.get_int("API_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=env.get_int("API_MAX_KEEPALIVE_CONNECTIONS", 10),
         )
         
         # Vendor OID mapping path
-        self.vendor_oid_config_path = os.getenv(
+        self.vendor_oid_config_path = env.get_str(
             "VENDOR_OID_CONFIG_PATH",
             str(Path(__file__).parent.parent / "snmp" / "vendor_oids.json")
         )
     
+    @cached_property
+    def vendor_oids(self) -> Dict[str, Dict]:
+        """Vendor OID mappings from vendor_oid_config_path (parsed on first use)"""
+        path = Path(self.vendor_oid_config_path)
+        if not path.exists():
+            return {}
+        return serde.load_file(path)
+    
     def validate(self) -> None:
         """Validate critical configuration"""
         if not self.database.password and self.env == "production":
@@ -127,5 +161,14 @@ class Config:
         )
 
 
-# Global config instance
-config = Config()
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Get the global config instance (built on first use)"""
+    return Config()
+
+
+def __getattr__(name: str):
+    """Resolve the module-level ``config`` lazily (PEP 562)"""
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
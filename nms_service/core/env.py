@@ -0,0 +1,34 @@
+"""Environment variable access for NMS service
+
+The process environment is read once into a snapshot when the module is
+first imported; typed accessors read from the snapshot instead of
+os.environ.
+"""
+
+import os
+from typing import Optional
+
+_ENV = dict(os.environ)
+
+
+def get_str(key: str, default: Optional[str] = None) -> Optional[str]:
+    """Get string value"""
+    return _ENV.get(key, default)
+
+
+def get_int(key: str, default: int) -> int:
+    """Get integer value (default if unset or empty)"""
+    value = _ENV.get(key)
+    return int(value) if value else default
+
+
+def get_float(key: str, default: float) -> float:
+    """Get float value (default if unset or empty)"""
+    value = _ENV.get(key)
+    return float(value) if value else default
+
+
+def get_bool(key: str, default: bool) -> bool:
+    """Get boolean value; only "true" (any case) is true"""
+    value = _ENV.get(key)
+    return value.strip().lower() == "true" if value else default
@@ -1,10 +1,12 @@
 """Logging configuration for NMS service"""
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 from pathlib import Path
-from nms_service.core.config import config
+from nms_service.core import env
 
 
 def setup_logging():
@@ -13,13 +15,15 @@ def setup_logging():
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
     
+    level = getattr(logging, env.get_str("NMS_LOG_LEVEL", "INFO"), logging.INFO)
+    
     # Create logger
     logger = logging.getLogger("nms")
-    logger.setLevel(getattr(logging, config.log_level, logging.INFO))
+    logger.setLevel(level)
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, config.log_level, logging.INFO))
+    console_handler.setLevel(level)
     
     # File handler with rotation
     file_handler = logging.handlers.RotatingFileHandler(
@@ -37,9 +41,17 @@ def setup_logging():
     console_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
     
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Handlers run on a background listener thread; callers only enqueue
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        respect_handler_level=True,
+    )
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
     
     return logger
 
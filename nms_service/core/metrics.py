@@ -0,0 +1,149 @@
+"""Internal service metrics for NMS service
+
+A process-wide Metrics registry counts SNMP requests, cache use, batch sizes
+and cycle times. It is logged at DEBUG once per polling cycle and can be
+served in Prometheus text format at /internal/metrics (see
+start_metrics_server()).
+"""
+
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from nms_service.core.logger import logger
+
+METRICS_PATH = "/internal/metrics"
+
+# Prefix of every exported metric name
+NAMESPACE = "nms"
+
+# name -> (Prometheus type, help text)
+METRIC_DEFINITIONS: Dict[str, Tuple[str, str]] = {
+    "snmp_pdus_sent": ("counter", "SNMP request PDUs sent"),
+    "snmp_retries": ("counter", "SNMP retries spent on requests that timed out"),
+    "oid_cache_hits": ("counter", "Interface polls served from the OID cache"),
+    "oid_cache_misses": ("counter", "Interface polls that walked the ifTable"),
+    "alarm_batch_size": ("gauge", "Alarms stored by the last polling cycle"),
+    "alarm_store_failures": ("counter", "Alarms that could not be stored in the database"),
+    "interface_batch_size": ("gauge", "Interface history rows stored by the last polling cycle"),
+    "poll_cycle_seconds": ("histogram", "Polling cycle duration in seconds"),
+}
+
+# Upper bounds of the histogram buckets, in seconds
+HISTOGRAM_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class Metrics:
+    """Thread-safe counters, gauges and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, float] = {
+            name: 0 for name, (kind, _) in METRIC_DEFINITIONS.items()
+            if kind != "histogram"
+        }
+        # name -> (per-bucket counts incl. +Inf, sum, count)
+        self._histograms: Dict[str, Tuple[List[int], float, int]] = {
+            name: ([0] * (len(HISTOGRAM_BUCKETS) + 1), 0.0, 0)
+            for name, (kind, _) in METRIC_DEFINITIONS.items()
+            if kind == "histogram"
+        }
+
+    def inc(self, name: str, amount: float = 1) -> None:
+        """Add to a counter"""
+        with self._lock:
+            self._values[name] += amount
+
+    def set(self, name: str, value: float) -> None:
+        """Set a gauge"""
+        with self._lock:
+            self._values[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record a histogram sample"""
+        bucket = bisect.bisect_left(HISTOGRAM_BUCKETS, value)
+        with self._lock:
+            buckets, total, count = self._histograms[name]
+            buckets[bucket] += 1
+            self._histograms[name] = (buckets, total + value, count + 1)
+
+    def summary(self) -> str:
+        """One-line summary for the log"""
+        with self._lock:
+            parts = [f"{name}={value:g}" for name, value in self._values.items()]
+            for name, (_, total, count) in self._histograms.items():
+                parts.append(f"{name}_avg={total / count if count else 0:.2f}")
+        return " ".join(parts)
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in METRIC_DEFINITIONS.items():
+                full_name = f"{NAMESPACE}_{name}"
+                if kind == "counter":
+                    full_name += "_total"
+                lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} {kind}")
+
+                if kind != "histogram":
+                    lines.append(f"{full_name} {self._values[name]:g}")
+                    continue
+
+                buckets, total, count = self._histograms[name]
+                cumulative = 0
+                for bound, bucket_count in zip(HISTOGRAM_BUCKETS, buckets):
+                    cumulative += bucket_count
+                    lines.append(f'{full_name}_bucket{{le="{bound:g}"}} {cumulative}')
+                lines.append(f'{full_name}_bucket{{le="+Inf"}} {count}')
+                lines.append(f"{full_name}_sum {total:g}")
+                lines.append(f"{full_name}_count {count}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry
+metrics = Metrics()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry at METRICS_PATH"""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != METRICS_PATH:
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Metrics request: {format % args}")
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """Serve the metrics endpoint on a background thread
+
+    Args:
+        port: TCP port to listen on
+        host: Address to bind
+
+    Returns:
+        Running server (stop it with shutdown()), or None if it failed to start
+    """
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(
+            target=server.serve_forever,
+            name="nms-metrics",
+            daemon=True,
+        ).start()
+        logger.info(f"Serving metrics at http://{host}:{port}{METRICS_PATH}")
+        return server
+    except Exception as e:
+        logger.error(f"Failed to start metrics server on port {port}: {e}")
+        return None
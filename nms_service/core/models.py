@@ -1,8 +1,9 @@
 """Data models for SNMP metrics and alarms"""
 
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, NamedTuple, Union
 from enum import Enum
 
 
@@ -33,19 +34,46 @@ class DeviceStatus(str, Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+class TimeSource:
+    """Shared timestamp for everything collected in one polling cycle
+    
+    The poller calls tick() at the start of each cycle; model timestamps
+    then reuse that value instead of reading the clock per instance.
+    Timestamps are naive UTC to match the DateTime columns in the database.
+    """
+    _utc = timezone.utc
+    _batch: Optional[datetime] = None
+    
+    @classmethod
+    def now(cls) -> datetime:
+        """Read the clock (naive UTC)"""
+        return datetime.now(cls._utc).replace(tzinfo=None)
+    
+    @classmethod
+    def tick(cls) -> datetime:
+        """Start a new polling cycle and return its timestamp"""
+        cls._batch = cls.now()
+        return cls._batch
+    
+    @classmethod
+    def now_batch(cls) -> datetime:
+        """Timestamp of the current cycle (the clock if tick() was never called)"""
+        return cls._batch or cls.now()
+
+
+@dataclass(slots=True, frozen=True)
 class SNMPMetric:
     """Generic SNMP metric data structure"""
     oid: str
     value: Any
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=TimeSource.now_batch)
     unit: Optional[str] = None
     
     def __repr__(self) -> str:
         return f"SNMPMetric(oid={self.oid}, value={self.value}, unit={self.unit})"
 
 
-@dataclass
+@dataclass(slots=True)
 class InterfaceMetric:
     """Network interface metrics"""
     device_id: int
@@ -60,14 +88,14 @@ class InterfaceMetric:
     in_errors: int = 0
     out_errors: int = 0
     mtu: int = 1500
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=TimeSource.now_batch)
     
     def is_port_down(self) -> bool:
         """Detect port down condition: admin=up, oper=down"""
         return self.admin_status.lower() == "up" and self.oper_status.lower() == "down"
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceHealthMetric:
     """Device health and resource metrics"""
     device_id: int
@@ -76,10 +104,10 @@ class DeviceHealthMetric:
     cpu_usage: Optional[float] = None  # percentage
     memory_usage: Optional[float] = None  # percentage
     temperature: Optional[float] = None  # celsius
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=TimeSource.now_batch)
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceInventory:
     """Hardware and inventory information"""
     device_id: int
@@ -88,10 +116,10 @@ class DeviceInventory:
     firmware_version: Optional[str] = None
     vendor: Optional[str] = None
     model: Optional[str] = None
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=TimeSource.now_batch)
 
 
-@dataclass
+@dataclass(slots=True)
 class Alarm:
     """Alarm data structure for storage and display"""
     id: Optional[int] = None
@@ -101,7 +129,7 @@ class Alarm:
     severity: AlarmSeverity = None
     message: str = ""
     acknowledged: bool = False
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=TimeSource.now_batch)
     acknowledged_at: Optional[datetime] = None
     resolved_at: Optional[datetime] = None
     metadata: Dict[str, Any] = field(default_factory=dict)  # vendor-specific data
@@ -113,11 +141,36 @@ class Alarm:
         )
 
 
-@dataclass
+class InterfaceState(NamedTuple):
+    """Interface flags compared between alarm evaluations"""
+    is_port_down: bool
+
+
+class DeviceHealthState(NamedTuple):
+    """Threshold flags compared between alarm evaluations"""
+    cpu_high: bool
+    memory_high: bool
+    temperature_high: bool
+
+
+class ReachabilityState(NamedTuple):
+    """Reachability flag compared between alarm evaluations"""
+    unreachable: bool
+
+
+# PreviousState.metric_type -> state structure
+STATE_TYPES = {
+    "interface": InterfaceState,
+    "device_health": DeviceHealthState,
+    "reachability": ReachabilityState,
+}
+
+
+@dataclass(slots=True)
 class PreviousState:
     """Track previous metric state for alarm comparison"""
     device_id: int
-    metric_type: str  # "interface", "device_health", etc.
+    metric_type: str  # "interface", "device_health", "reachability"
     metric_key: str   # interface_index or device_id
-    state: Dict[str, Any]
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    state: Union[InterfaceState, DeviceHealthState, ReachabilityState]
+    timestamp: float = field(default_factory=time.time)  # epoch seconds when state last changed
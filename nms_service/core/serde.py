@@ -0,0 +1,60 @@
+"""JSON serialization for NMS service
+
+All JSON produced or parsed by the service goes through orjson, which
+encodes dataclasses, enums and datetimes natively.
+"""
+
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Union
+
+import orjson
+
+# Naive datetimes in the service are UTC; emit them with a "Z" suffix
+DUMPS_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize object to JSON
+
+    Args:
+        obj: Object to serialize (dicts, lists, dataclasses, enums, datetimes)
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    option = DUMPS_OPTIONS | orjson.OPT_INDENT_2 if indent else DUMPS_OPTIONS
+    return orjson.dumps(obj, option=option)
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize object to a JSON string (for APIs that want str, not bytes)"""
+    return orjson.dumps(obj, option=DUMPS_OPTIONS).decode()
+
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON from bytes or str"""
+    return orjson.loads(data)
+
+
+def load_file(path: Union[str, Path]) -> Any:
+    """Deserialize a JSON file
+
+    The file is memory-mapped and parsed in place rather than read into a
+    separate buffer first.
+
+    Args:
+        path: JSON file path
+
+    Returns:
+        Parsed document
+    """
+    with open(path, "rb") as f:
+        # An empty file can't be mapped; let orjson reject it as invalid JSON
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
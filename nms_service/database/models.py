@@ -3,61 +3,97 @@
 Uses SQLAlchemy ORM for PostgreSQL persistence.
 """
 
-from datetime import datetime
+import io
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from sqlalchemy import (
-    Column,
-    Integer,
     BigInteger,
     String,
-    Float,
-    Boolean,
-    DateTime,
     Text,
-    JSON,
-    Enum as SQLEnum,
+    CheckConstraint,
     Index,
     ForeignKey,
+    PrimaryKeyConstraint,
     create_engine,
+    desc,
+    event,
+    text,
+)
+from psycopg2.extras import execute_values
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    relationship,
+    scoped_session,
+    sessionmaker,
+    Session,
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 
+from nms_service.core import serde
 from nms_service.core.models import AlarmType, AlarmSeverity
-from nms_service.core.config import config
+from nms_service.core.config import get_config
+from nms_service.core.logger import logger
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all NMS tables"""
+    pass
+
+
+# Time-series tables range-partitioned by day on collected_at
+PARTITIONED_METRIC_TABLES = ("interface_metrics", "device_health_metrics")
 
-Base = declarative_base()
+# Daily partitions are created this many days ahead of the current date
+PARTITION_DAYS_AHEAD = 7
+
+# Compiled statement cache entries per engine (SQLAlchemy default is 500)
+QUERY_CACHE_SIZE = 2048
+
+# Metric batches at least this large are loaded with COPY instead of INSERT
+COPY_THRESHOLD = 5000
+
+# Rows per multi-row VALUES statement for columnar inserts below COPY_THRESHOLD
+INSERT_PAGE_SIZE = 1000
 
 
 class Device(Base):
     """Monitored device"""
     __tablename__ = "devices"
     
-    id = Column(Integer, primary_key=True)
-    name = Column(String(255), nullable=False, unique=True)
-    ip_address = Column(String(45), nullable=False)  # IPv4 or IPv6
-    vendor = Column(String(50), nullable=False)  # "cisco", "fortinet", "mikrotik", "generic"
-    device_type = Column(String(100), nullable=True)
-    snmp_community = Column(String(255), nullable=True)  # Encrypted in production
-    snmp_version = Column(String(10), default="2c")
-    snmp_port = Column(Integer, default=161)
-    snmp_username = Column(String(255), nullable=True)
-    snmp_auth_protocol = Column(String(20), nullable=True)
-    snmp_auth_password = Column(String(255), nullable=True)
-    snmp_priv_protocol = Column(String(20), nullable=True)
-    snmp_priv_password = Column(String(255), nullable=True)
-    polling_enabled = Column(Boolean, default=True)
-    polling_interval = Column(Integer, default=300)
-    connection_status = Column(String(20), default="offline")
-    last_polled = Column(DateTime, nullable=True)
-    last_online = Column(DateTime, nullable=True)
-    location = Column(String(255), nullable=True)
-    notes = Column(Text, nullable=True)
-    created_by = Column(String(255), nullable=True)
-    ssh_username = Column(String(255), nullable=True)
-    ssh_password = Column(String(255), nullable=True)
-    
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True)
+    ip_address: Mapped[str] = mapped_column(String(45))  # IPv4 or IPv6
+    vendor: Mapped[str] = mapped_column(String(50))  # "cisco", "fortinet", "mikrotik", "generic"
+    device_type: Mapped[Optional[str]] = mapped_column(String(100))
+    snmp_community: Mapped[Optional[str]] = mapped_column(String(255))  # Encrypted in production
+    snmp_version: Mapped[Optional[str]] = mapped_column(String(10), default="2c")
+    snmp_port: Mapped[Optional[int]] = mapped_column(default=161)
+    snmp_username: Mapped[Optional[str]] = mapped_column(String(255))
+    snmp_auth_protocol: Mapped[Optional[str]] = mapped_column(String(20))
+    snmp_auth_password: Mapped[Optional[str]] = mapped_column(String(255))
+    snmp_priv_protocol: Mapped[Optional[str]] = mapped_column(String(20))
+    snmp_priv_password: Mapped[Optional[str]] = mapped_column(String(255))
+    polling_enabled: Mapped[Optional[bool]] = mapped_column(default=True)
+    polling_interval: Mapped[Optional[int]] = mapped_column(default=300)
+    connection_status: Mapped[Optional[str]] = mapped_column(String(20), default="offline")
+    last_polled: Mapped[Optional[datetime]] = mapped_column()
+    last_online: Mapped[Optional[datetime]] = mapped_column()
+    location: Mapped[Optional[str]] = mapped_column(String(255))
+    notes: Mapped[Optional[str]] = mapped_column(Text)
+    created_by: Mapped[Optional[str]] = mapped_column(String(255))
+    ssh_username: Mapped[Optional[str]] = mapped_column(String(255))
+    ssh_password: Mapped[Optional[str]] = mapped_column(String(255))
+    
+    created_at: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    alarms: Mapped[List["Alarm"]] = relationship(back_populates="device")
+    interfaces: Mapped[List["Interface"]] = relationship(back_populates="device")
     
     __table_args__ = (
         Index("idx_device_ip", "ip_address"),
@@ -69,30 +105,57 @@ class Alarm(Base):
     """Stored alarm records"""
     __tablename__ = "alarms"
     
-    id = Column(Integer, primary_key=True)
-    device_id = Column(Integer, ForeignKey("devices.id"), nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    device_id: Mapped[int] = mapped_column(ForeignKey("devices.id"))
+    
+    alarm_code: Mapped[str] = mapped_column(String(50))
+    severity: Mapped[str] = mapped_column(String(16))  # AlarmSeverity value
+    message: Mapped[str] = mapped_column(Text)
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="active")
+    source: Mapped[Optional[str]] = mapped_column(String(100))
     
-    alarm_code = Column(String(50), nullable=False)
-    severity = Column(SQLEnum(AlarmSeverity), nullable=False)
-    message = Column(Text, nullable=False)
-    status = Column(String(50), default="active")
-    source = Column(String(100), nullable=True)
+    acknowledged_at: Mapped[Optional[datetime]] = mapped_column()
+    acknowledged_by: Mapped[Optional[int]] = mapped_column()
     
-    acknowledged_at = Column(DateTime, nullable=True)
-    acknowledged_by = Column(Integer, nullable=True)
+    resolved_at: Mapped[Optional[datetime]] = mapped_column()
+    resolved_by: Mapped[Optional[int]] = mapped_column()
     
-    resolved_at = Column(DateTime, nullable=True)
-    resolved_by = Column(Integer, nullable=True)
+    alarm_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, default=dict)  # Vendor-specific data
     
-    alarm_metadata = Column(JSON, default={})  # Vendor-specific data
+    created_at: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    device: Mapped["Device"] = relationship(back_populates="alarms")
     
     __table_args__ = (
-        Index("idx_alarm_device", "device_id"),
+        Index("idx_alarm_device_created", "device_id", desc("created_at")),
         Index("idx_alarm_severity", "severity"),
-        Index("idx_alarm_created", "created_at"),
+        Index(
+            "idx_alarm_created",
+            "created_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
         Index("idx_alarm_status", "status"),
+        # Partial indexes over the (small) active set: get_active() reads
+        # the newest first and stops at its LIMIT, get_active_by_type()
+        # looks up one alarm code
+        Index(
+            "idx_alarm_active",
+            desc("created_at"),
+            postgresql_where=text("status = 'active'"),
+        ),
+        Index(
+            "idx_alarm_active_code",
+            "alarm_code",
+            postgresql_where=text("status = 'active'"),
+        ),
+        Index("idx_alarm_metadata_gin", "alarm_metadata", postgresql_using="gin"),
+        CheckConstraint(
+            "severity IN ({})".format(
+                ", ".join(f"'{severity.value}'" for severity in AlarmSeverity)
+            ),
+            name="ck_alarm_severity",
+        ),
     )
 
 
@@ -100,21 +163,23 @@ class Interface(Base):
     """Network interfaces status (Current state)"""
     __tablename__ = "interfaces"
     
-    id = Column(Integer, primary_key=True)
-    device_id = Column(Integer, ForeignKey("devices.id"), nullable=False)
-    name = Column(String(255), nullable=False)
-    ip_address = Column(String(45), nullable=True)
-    status = Column(String(50))
-    in_octets = Column(BigInteger, default=0)
-    out_octets = Column(BigInteger, default=0)
-    in_errors = Column(BigInteger, default=0)
-    out_errors = Column(BigInteger, default=0)
-    speed = Column(BigInteger, default=0)
-    mtu = Column(Integer, default=1500)
-    type = Column(String(100))
-    
-    last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    device_id: Mapped[int] = mapped_column(ForeignKey("devices.id"))
+    name: Mapped[str] = mapped_column(String(255))
+    ip_address: Mapped[Optional[str]] = mapped_column(String(45))
+    status: Mapped[Optional[str]] = mapped_column(String(50))
+    in_octets: Mapped[Optional[int]] = mapped_column(BigInteger, default=0)
+    out_octets: Mapped[Optional[int]] = mapped_column(BigInteger, default=0)
+    in_errors: Mapped[Optional[int]] = mapped_column(BigInteger, default=0)
+    out_errors: Mapped[Optional[int]] = mapped_column(BigInteger, default=0)
+    speed: Mapped[Optional[int]] = mapped_column(BigInteger, default=0)
+    mtu: Mapped[Optional[int]] = mapped_column(default=1500)
+    type: Mapped[Optional[str]] = mapped_column(String(100))
+    
+    last_updated: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow)
+    
+    device: Mapped["Device"] = relationship(back_populates="interfaces")
     
     __table_args__ = (
         Index("idx_interface_device", "device_id"),
@@ -126,23 +191,36 @@ class InterfaceMetric(Base):
     """Interface metrics time series data"""
     __tablename__ = "interface_metrics"
     
-    id = Column(Integer, primary_key=True)
-    device_id = Column(Integer, ForeignKey("devices.id"), nullable=False)
-    interface_index = Column(Integer, nullable=False)
-    interface_name = Column(String(100))
-    description = Column(String(255))
+    id: Mapped[int] = mapped_column(autoincrement=True)
+    device_id: Mapped[int] = mapped_column(ForeignKey("devices.id"))
+    interface_index: Mapped[int] = mapped_column()
+    interface_name: Mapped[Optional[str]] = mapped_column(String(100))
+    description: Mapped[Optional[str]] = mapped_column(String(255))
     
-    admin_status = Column(String(10))  # "up", "down"
-    oper_status = Column(String(10))   # "up", "down"
-    speed = Column(BigInteger)  # bps
-    in_octets = Column(BigInteger)
-    out_octets = Column(BigInteger)
+    admin_status: Mapped[Optional[str]] = mapped_column(String(10))  # "up", "down"
+    oper_status: Mapped[Optional[str]] = mapped_column(String(10))   # "up", "down"
+    speed: Mapped[Optional[int]] = mapped_column(BigInteger)  # bps
+    in_octets: Mapped[Optional[int]] = mapped_column(BigInteger)
+    out_octets: Mapped[Optional[int]] = mapped_column(BigInteger)
     
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     
+    # Partitioned tables need the partition key in the primary key
     __table_args__ = (
-        Index("idx_interface_device_idx", "device_id", "interface_index"),
-        Index("idx_interface_collected", "collected_at"),
+        PrimaryKeyConstraint("id", "collected_at"),
+        Index(
+            "idx_interface_device_time",
+            "device_id",
+            "interface_index",
+            desc("collected_at"),
+        ),
+        Index(
+            "idx_interface_collected",
+            "collected_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        {"postgresql_partition_by": "RANGE (collected_at)"},
     )
 
 
@@ -150,20 +228,28 @@ class DeviceHealthMetric(Base):
     """Device health/resource metrics time series"""
     __tablename__ = "device_health_metrics"
     
-    id = Column(Integer, primary_key=True)
-    device_id = Column(Integer, ForeignKey("devices.id"), nullable=False)
-    device_name = Column(String(255))
+    id: Mapped[int] = mapped_column(autoincrement=True)
+    device_id: Mapped[int] = mapped_column(ForeignKey("devices.id"))
+    device_name: Mapped[Optional[str]] = mapped_column(String(255))
     
-    uptime_seconds = Column(Integer)
-    cpu_usage = Column(Float)  # percentage
-    memory_usage = Column(Float)  # percentage
-    temperature = Column(Float)  # celsius
+    uptime_seconds: Mapped[Optional[int]] = mapped_column()
+    cpu_usage: Mapped[Optional[float]] = mapped_column()  # percentage
+    memory_usage: Mapped[Optional[float]] = mapped_column()  # percentage
+    temperature: Mapped[Optional[float]] = mapped_column()  # celsius
     
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     
+    # Partitioned tables need the partition key in the primary key
     __table_args__ = (
-        Index("idx_health_device", "device_id"),
-        Index("idx_health_collected", "collected_at"),
+        PrimaryKeyConstraint("id", "collected_at"),
+        Index("idx_health_device_time", "device_id", desc("collected_at")),
+        Index(
+            "idx_health_collected",
+            "collected_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        {"postgresql_partition_by": "RANGE (collected_at)"},
     )
 
 
@@ -171,46 +257,385 @@ class DeviceInventory(Base):
     """Device hardware/inventory information"""
     __tablename__ = "device_inventory"
     
-    id = Column(Integer, primary_key=True)
-    device_id = Column(Integer, ForeignKey("devices.id"), unique=True, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    device_id: Mapped[int] = mapped_column(ForeignKey("devices.id"), unique=True)
     
-    sys_descr = Column(Text)
-    serial_number = Column(String(255))
-    firmware_version = Column(String(255))
-    vendor_model = Column(String(255))
+    sys_descr: Mapped[Optional[str]] = mapped_column(Text)
+    serial_number: Mapped[Optional[str]] = mapped_column(String(255))
+    firmware_version: Mapped[Optional[str]] = mapped_column(String(255))
+    vendor_model: Mapped[Optional[str]] = mapped_column(String(255))
     
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow)
     
     __table_args__ = (
         Index("idx_inventory_device", "device_id"),
     )
 
 
+def _copy_value(value: Any) -> str:
+    """Format a value for PostgreSQL COPY text format"""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+@contextmanager
+def count_queries(bind: Union[Engine, Connection]) -> Iterator[List[str]]:
+    """Record the SQL statements executed on an engine or connection
+    
+    Used to check how many statements a repository call or polling cycle
+    issues, e.g. to catch N+1 lazy loads.
+    
+    Args:
+        bind: Engine (all its connections) or a single connection
+        
+    Yields:
+        List the statements are appended to as they execute
+    """
+    statements: List[str] = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+
 class DatabaseManager:
     """Manage database connection and sessions"""
     
     def __init__(self):
-        """Initialize database connection"""
-        self.engine = create_engine(
-            config.database.connection_string,
-            pool_size=config.database.pool_size,
-            max_overflow=config.database.max_overflow,
-            echo=config.debug,
-        )
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        """Initialize database manager
+        
+        The engine and its pool are created on first use, not here.
+        """
+        self._engine: Optional[Engine] = None
+        # One session per thread, reused until removed by session_scope()
+        self.SessionLocal = scoped_session(sessionmaker(expire_on_commit=False))
+    
+    @property
+    def engine(self) -> Engine:
+        """SQLAlchemy engine, created on first access"""
+        if self._engine is None:
+            config = get_config()
+            self._engine = create_engine(
+                config.database.connection_string,
+                pool_size=config.database.pool_size,
+                max_overflow=config.database.max_overflow,
+                echo=config.debug,
+                query_cache_size=QUERY_CACHE_SIZE,
+                # Batch executemany() UPDATE/DELETEs (e.g. the per-interface
+                # state updates flushed together) into pages of statements
+                # per round trip; INSERTs already use multi-row VALUES.
+                executemany_mode="values_plus_batch",
+                # JSONB values (alarm metadata) go through orjson both ways
+                json_serializer=serde.dumps_str,
+                json_deserializer=serde.loads,
+            )
+            self.SessionLocal.configure(bind=self._engine)
+        return self._engine
     
     def init_db(self) -> None:
-        """Create all tables"""
+        """Create all tables and the upcoming metric partitions"""
         Base.metadata.create_all(self.engine)
+        self.create_metric_partitions()
+    
+    def create_metric_partitions(self, days_ahead: int = PARTITION_DAYS_AHEAD) -> bool:
+        """Create daily partitions for the time-series metric tables
+        
+        Creates one partition per day from today through days_ahead, plus a
+        DEFAULT partition so rows outside those ranges can still be stored.
+        Existing partitions are left alone, so this is safe to call repeatedly.
+        Every partition is created in its own transaction; one that fails is
+        logged and skipped, and the remaining days are still created.
+        
+        Args:
+            days_ahead: Number of days after today to create partitions for
+            
+        Returns:
+            True if every partition was created (or already existed)
+        """
+        today = datetime.utcnow().date()
+        success = True
+        for table in PARTITIONED_METRIC_TABLES:
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {table}_default "
+                        f"PARTITION OF {table} DEFAULT"
+                    ))
+            except Exception as e:
+                logger.error(f"Failed to create metric partition {table}_default: {e}")
+                success = False
+            
+            for offset in range(days_ahead + 1):
+                day = today + timedelta(days=offset)
+                try:
+                    self._create_day_partition(table, day)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to create metric partition {table}_{day:%Y_%m_%d}: {e}"
+                    )
+                    success = False
+        return success
+    
+    def _create_day_partition(self, table: str, day: date) -> None:
+        """Create the partition of one day, taking over its rows from DEFAULT
+        
+        PostgreSQL refuses to create a partition for a range that already
+        has rows in the DEFAULT partition (stored there while the day's
+        partition was missing). Those rows are moved into the new partition:
+        DEFAULT is detached, the partition created, the rows moved and
+        DEFAULT attached again, all in one transaction.
+        
+        Args:
+            table: Partitioned table name
+            day: Day to create the partition for
+        """
+        name = f"{table}_{day:%Y_%m_%d}"
+        default = f"{table}_default"
+        bounds = {"start": day, "end": day + timedelta(days=1)}
+        create = (
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} FOR VALUES "
+            f"FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+        )
+        in_range = "collected_at >= :start AND collected_at < :end"
+        
+        with self.engine.begin() as conn:
+            exists = text("SELECT to_regclass(:name) IS NOT NULL")
+            if conn.execute(exists, {"name": name}).scalar():
+                return
+            
+            has_default_rows = conn.execute(exists, {"name": default}).scalar() and (
+                conn.execute(
+                    text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})"),
+                    bounds,
+                ).scalar()
+            )
+            if not has_default_rows:
+                conn.execute(text(create))
+                return
+            
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+            conn.execute(text(create))
+            moved = conn.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                bounds,
+            ).rowcount
+            conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+            logger.info(f"Moved {moved} rows from {default} into new partition {name}")
+    
+    def drop_metric_partitions(self, before: date) -> int:
+        """Drop daily metric partitions older than a date
+        
+        Retention by dropping whole partitions instead of DELETE-ing rows.
+        
+        Args:
+            before: Partitions for days before this date are dropped
+            
+        Returns:
+            Number of partitions dropped
+        """
+        dropped = 0
+        try:
+            with self.engine.begin() as conn:
+                for table in PARTITIONED_METRIC_TABLES:
+                    partitions = conn.execute(
+                        text(
+                            "SELECT child.relname FROM pg_inherits "
+                            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                            "WHERE parent.relname = :table"
+                        ),
+                        {"table": table},
+                    ).scalars().all()
+                    
+                    for name in partitions:
+                        try:
+                            day = datetime.strptime(
+                                name[len(table) + 1:], "%Y_%m_%d"
+                            ).date()
+                        except ValueError:
+                            continue  # DEFAULT or manually created partition
+                        if day < before:
+                            conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                            dropped += 1
+            return dropped
+        except Exception as e:
+            logger.error(f"Failed to drop metric partitions: {e}")
+            return dropped
+    
+    def bulk_insert_metrics(
+        self,
+        model_cls: type,
+        rows: List[Dict[str, Any]],
+    ) -> int:
+        """Insert a batch of metric rows in one round trip
+        
+        Batches of COPY_THRESHOLD rows or more are streamed with COPY,
+        smaller ones go through bulk_insert_mappings. Column defaults are
+        not applied on the COPY path, so rows must carry collected_at.
+        
+        Args:
+            model_cls: Metric model class (InterfaceMetric, DeviceHealthMetric)
+            rows: Column name -> value dicts, all with the same keys
+            
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+        
+        try:
+            if len(rows) >= COPY_THRESHOLD:
+                columns = list(rows[0])
+                self._copy_rows(
+                    model_cls.__tablename__,
+                    columns,
+                    (tuple(row[column] for column in columns) for row in rows),
+                )
+            else:
+                with self.session_scope() as session:
+                    session.bulk_insert_mappings(model_cls, rows)
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Bulk insert into {model_cls.__tablename__} failed: {e}")
+            return 0
+    
+    def bulk_insert_columns(
+        self,
+        model_cls: type,
+        columns: Dict[str, List[Any]],
+    ) -> int:
+        """Insert a batch of metric rows given column-wise
+        
+        Like bulk_insert_metrics(), but the batch is one list per column, so
+        no per-row dict is built. Rows are zipped straight into COPY (for
+        COPY_THRESHOLD rows or more) or psycopg2's execute_values, which
+        sends INSERT_PAGE_SIZE rows per statement.
+        
+        Args:
+            model_cls: Metric model class (InterfaceMetric, DeviceHealthMetric)
+            columns: Column name -> values, all lists of the same length
+            
+        Returns:
+            Number of rows inserted
+        """
+        names = list(columns)
+        count = len(columns[names[0]]) if names else 0
+        if not count:
+            return 0
+        
+        table = model_cls.__tablename__
+        rows = zip(*columns.values())
+        try:
+            if count >= COPY_THRESHOLD:
+                self._copy_rows(table, names, rows)
+            else:
+                conn = self.engine.raw_connection()
+                try:
+                    with conn.cursor() as cursor:
+                        execute_values(
+                            cursor,
+                            f"INSERT INTO {table} ({', '.join(names)}) VALUES %s",
+                            rows,
+                            page_size=INSERT_PAGE_SIZE,
+                        )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.close()
+            return count
+        except Exception as e:
+            logger.error(f"Bulk insert into {table} failed: {e}")
+            return 0
+    
+    def _copy_rows(
+        self,
+        table: str,
+        columns: List[str],
+        rows: Iterable[Tuple[Any, ...]],
+    ) -> None:
+        """Load rows into a table with COPY FROM STDIN
+        
+        Args:
+            table: Table name
+            columns: Column names
+            rows: Value tuples in column order
+        """
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+        
+        conn = self.engine.raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {table} ({', '.join(columns)}) FROM STDIN",
+                    buffer,
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
     
     def get_session(self) -> Session:
-        """Get a new database session"""
+        """Get the current thread's database session"""
+        self.engine  # make sure the session factory is bound
         return self.SessionLocal()
     
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a transactional scope around a series of operations
+        
+        Commits on success, rolls back on error, and releases the thread's
+        session afterwards.
+        
+        Yields:
+            Database session
+        """
+        session = self.get_session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self.SessionLocal.remove()
+    
     def close(self) -> None:
         """Close database connection"""
-        self.engine.dispose()
+        if self._engine is not None:
+            self._engine.dispose()
+
+
+@lru_cache(maxsize=1)
+def get_db_manager() -> DatabaseManager:
+    """Get the global database manager (built on first use)"""
+    return DatabaseManager()
 
 
-# Global database manager instance
-db_manager = DatabaseManager()
+def __getattr__(name: str):
+    """Resolve the module-level ``db_manager`` lazily (PEP 562)"""
+    if name == "db_manager":
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
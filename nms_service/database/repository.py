@@ -3,10 +3,13 @@
 Provides clean data access interfaces to domain models.
 """
 
-from typing import List, Optional
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy.orm import Session, raiseload, scoped_session, selectinload
+from sqlalchemy import BigInteger, Integer, String, and_, column, desc, func, insert, select, update, values
 
 from nms_service.core.logger import logger
 from nms_service.core.models import (
@@ -23,18 +26,75 @@ from nms_service.database.models import (
     DeviceInventory as DeviceInventoryDB,
 )
 
+# Alarm lists load their device up front (one IN query for the whole list);
+# any other relationship access raises instead of lazy loading per row
+ALARM_LIST_LOAD = (selectinload(AlarmDB.device), raiseload("*"))
 
-class AlarmRepository:
-    """Repository for alarm data access"""
+
+# Session.info key set while a bulk() block is open on that session
+_BULK_KEY = "nms_bulk"
+
+# Database-side current time as naive UTC (the service stores UTC
+# timestamps), set by the server instead of bound per statement
+_DB_NOW = func.timezone("UTC", func.now())
+
+# Device id -> vendor, shared by all sessions and polling threads (LRU).
+# Like the rest of a device's polling settings, the vendor is read once and
+# kept until the service restarts.
+DEVICE_CACHE_SIZE = 512
+_device_vendors: "OrderedDict[int, str]" = OrderedDict()
+_device_vendors_lock = threading.Lock()
+
+
+class _Repository:
+    """Base for repositories bound to a session
+    
+    Mutating methods never commit on their own, they only flush; the caller
+    owns the transaction (DatabaseManager.session_scope() or bulk()). They
+    don't roll back either: errors are logged and re-raised, and the owner
+    of the transaction rolls it back.
+    """
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Union[Session, scoped_session]):
         """Initialize with database session
         
         Args:
-            session: SQLAlchemy session
+            session: SQLAlchemy session, or a scoped_session registry to
+                work on whichever session is current for the calling thread
         """
         self.session = session
     
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """Run the block as one transaction on this session
+        
+        Writes are not flushed one by one but together, on commit at the
+        end of the block. Nested blocks join the outermost one. An exception
+        rolls the whole batch back and is re-raised.
+        """
+        if self.session.info.get(_BULK_KEY):
+            yield
+            return
+        
+        self.session.info[_BULK_KEY] = True
+        try:
+            yield
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        finally:
+            self.session.info[_BULK_KEY] = False
+    
+    def _flush(self) -> None:
+        """Flush now, or leave it to the enclosing bulk() block's commit"""
+        if not self.session.info.get(_BULK_KEY):
+            self.session.flush()
+
+
+class AlarmRepository(_Repository):
+    """Repository for alarm data access"""
+    
     def create(self, alarm: AlarmModel) -> AlarmDB:
         """Create a new alarm record
         
@@ -48,20 +108,52 @@ class AlarmRepository:
             db_alarm = AlarmDB(
                 device_id=alarm.device_id,
                 alarm_code=alarm.type.value if hasattr(alarm.type, 'value') else str(alarm.type),
-                severity=alarm.severity,
+                severity=AlarmSeverity(alarm.severity).value,
                 message=alarm.message,
                 status="active",
                 alarm_metadata=alarm.metadata,
             )
             self.session.add(db_alarm)
-            self.session.commit()
-            logger.debug(f"Created alarm: {db_alarm.id}")
+            self._flush()
+            logger.debug(f"Created alarm {db_alarm.alarm_code} for device {db_alarm.device_id}")
             return db_alarm
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Failed to create alarm: {e}")
             raise
     
+    def create_bulk(self, alarms: List[AlarmModel]) -> int:
+        """Create alarm records with one batched INSERT
+        
+        Rows are sent as an executemany (multi-row VALUES pages) and are not
+        loaded back as AlarmDB objects.
+        
+        Args:
+            alarms: Alarm models
+        
+        Returns:
+            Number of alarms inserted
+        """
+        if not alarms:
+            return 0
+        
+        try:
+            self.session.execute(insert(AlarmDB), [
+                {
+                    "device_id": alarm.device_id,
+                    "alarm_code": alarm.type.value if hasattr(alarm.type, 'value') else str(alarm.type),
+                    "severity": AlarmSeverity(alarm.severity).value,
+                    "message": alarm.message,
+                    "status": "active",
+                    "alarm_metadata": alarm.metadata,
+                }
+                for alarm in alarms
+            ])
+            logger.debug(f"Created {len(alarms)} alarms")
+            return len(alarms)
+        except Exception as e:
+            logger.error(f"Failed to create alarms: {e}")
+            raise
+    
     def get_by_id(self, alarm_id: int) -> Optional[AlarmDB]:
         """Get alarm by ID
         
@@ -71,7 +163,7 @@ class AlarmRepository:
         Returns:
             AlarmDB or None
         """
-        return self.session.query(AlarmDB).filter(AlarmDB.id == alarm_id).first()
+        return self.session.get(AlarmDB, alarm_id)
     
     def get_active(
         self,
@@ -89,15 +181,16 @@ class AlarmRepository:
         Returns:
             List of AlarmDB records
         """
-        query = self.session.query(AlarmDB).filter(AlarmDB.status == "active")
+        stmt = select(AlarmDB).options(*ALARM_LIST_LOAD).where(AlarmDB.status == "active")
         
         if device_id:
-            query = query.filter(AlarmDB.device_id == device_id)
+            stmt = stmt.where(AlarmDB.device_id == device_id)
         
         if severity:
-            query = query.filter(AlarmDB.severity == severity)
+            stmt = stmt.where(AlarmDB.severity == AlarmSeverity(severity).value)
         
-        return query.order_by(desc(AlarmDB.created_at)).limit(limit).all()
+        stmt = stmt.order_by(desc(AlarmDB.created_at)).limit(limit)
+        return list(self.session.scalars(stmt))
     
     def get_recent(
         self,
@@ -116,12 +209,13 @@ class AlarmRepository:
             List of AlarmDB records
         """
         since = datetime.utcnow() - timedelta(days=days)
-        query = self.session.query(AlarmDB).filter(AlarmDB.created_at >= since)
+        stmt = select(AlarmDB).options(*ALARM_LIST_LOAD).where(AlarmDB.created_at >= since)
         
         if device_id:
-            query = query.filter(AlarmDB.device_id == device_id)
+            stmt = stmt.where(AlarmDB.device_id == device_id)
         
-        return query.order_by(desc(AlarmDB.created_at)).limit(limit).all()
+        stmt = stmt.order_by(desc(AlarmDB.created_at)).limit(limit)
+        return list(self.session.scalars(stmt))
     
     def acknowledge(
         self,
@@ -135,24 +229,26 @@ class AlarmRepository:
             acknowledged_by: User/system acknowledging
             
         Returns:
-            Success status
+            True if the alarm was found
         """
         try:
-            alarm = self.get_by_id(alarm_id)
-            if alarm:
-                alarm.status = "acknowledged"
-                alarm.acknowledged_at = datetime.utcnow()
-                # Handle user ID if provided as string (simplified for now)
-                if isinstance(acknowledged_by, int):
-                    alarm.acknowledged_by = acknowledged_by
-                self.session.commit()
+            values = {"status": "acknowledged", "acknowledged_at": _DB_NOW}
+            # Handle user ID if provided as string (simplified for now)
+            if isinstance(acknowledged_by, int):
+                values["acknowledged_by"] = acknowledged_by
+            
+            # Single UPDATE, no SELECT of the alarm first
+            result = self.session.execute(
+                update(AlarmDB).where(AlarmDB.id == alarm_id).values(**values)
+            )
+            if result.rowcount:
+                self._flush()
                 logger.info(f"Acknowledged alarm {alarm_id}")
                 return True
             return False
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Failed to acknowledge alarm: {e}")
-            return False
+            raise
     
     def resolve(self, alarm_id: int) -> bool:
         """Resolve (close) an alarm
@@ -161,21 +257,22 @@ class AlarmRepository:
             alarm_id: Alarm ID
             
         Returns:
-            Success status
+            True if the alarm was found
         """
         try:
-            alarm = self.get_by_id(alarm_id)
-            if alarm:
-                alarm.status = "resolved"
-                alarm.resolved_at = datetime.utcnow()
-                self.session.commit()
+            result = self.session.execute(
+                update(AlarmDB)
+                .where(AlarmDB.id == alarm_id)
+                .values(status="resolved", resolved_at=_DB_NOW)
+            )
+            if result.rowcount:
+                self._flush()
                 logger.info(f"Resolved alarm {alarm_id}")
                 return True
             return False
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Failed to resolve alarm: {e}")
-            return False
+            raise
     
     def get_active_by_type(self, alarm_type: AlarmType) -> List[AlarmDB]:
         """Get all active alarms of a specific type
@@ -187,22 +284,15 @@ class AlarmRepository:
             List of AlarmDB records
         """
         type_str = alarm_type.value if hasattr(alarm_type, 'value') else str(alarm_type)
-        return self.session.query(AlarmDB).filter(
+        stmt = select(AlarmDB).options(*ALARM_LIST_LOAD).where(
             and_(AlarmDB.status == "active", AlarmDB.alarm_code == type_str)
-        ).all()
+        )
+        return list(self.session.scalars(stmt))
 
 
-class DeviceRepository:
+class DeviceRepository(_Repository):
     """Repository for device data access"""
     
-    def __init__(self, session: Session):
-        """Initialize with database session
-        
-        Args:
-            session: SQLAlchemy session
-        """
-        self.session = session
-    
     def create(
         self,
         name: str,
@@ -235,21 +325,27 @@ class DeviceRepository:
                 snmp_port=snmp_port,
             )
             self.session.add(device)
-            self.session.commit()
+            self._flush()
             logger.info(f"Created device: {name} ({ip_address})")
             return device
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Failed to create device: {e}")
             raise
     
-    def get_all_enabled(self) -> List[DeviceDB]:
+    def get_all_enabled(self, with_interfaces: bool = False) -> List[DeviceDB]:
         """Get all enabled devices
         
+        Args:
+            with_interfaces: Also load each device's interfaces (one extra query)
+            
         Returns:
             List of DeviceDB records
         """
-        return self.session.query(DeviceDB).filter(DeviceDB.polling_enabled == True).all()
+        options = [selectinload(DeviceDB.interfaces)] if with_interfaces else []
+        stmt = select(DeviceDB).options(*options, raiseload("*")).where(
+            DeviceDB.polling_enabled == True
+        )
+        return list(self.session.scalars(stmt))
     
     def get_by_id(self, device_id: int) -> Optional[DeviceDB]:
         """Get device by ID
@@ -260,7 +356,30 @@ class DeviceRepository:
         Returns:
             DeviceDB or None
         """
-        return self.session.query(DeviceDB).filter(DeviceDB.id == device_id).first()
+        return self.session.get(DeviceDB, device_id)
+    
+    def get_vendor(self, device_id: int) -> Optional[str]:
+        """Get device vendor, cached across sessions
+        
+        Args:
+            device_id: Device ID
+            
+        Returns:
+            Vendor name or None if the device does not exist
+        """
+        with _device_vendors_lock:
+            vendor = _device_vendors.get(device_id)
+            if vendor is not None:
+                _device_vendors.move_to_end(device_id)
+                return vendor
+        
+        vendor = self.session.scalar(select(DeviceDB.vendor).where(DeviceDB.id == device_id))
+        if vendor is not None:
+            with _device_vendors_lock:
+                _device_vendors[device_id] = vendor
+                if len(_device_vendors) > DEVICE_CACHE_SIZE:
+                    _device_vendors.popitem(last=False)
+        return vendor
     
     def get_by_name(self, name: str) -> Optional[DeviceDB]:
         """Get device by name
@@ -271,7 +390,9 @@ class DeviceRepository:
         Returns:
             DeviceDB or None
         """
-        return self.session.query(DeviceDB).filter(DeviceDB.name == name).first()
+        return self.session.execute(
+            select(DeviceDB).where(DeviceDB.name == name)
+        ).scalar_one_or_none()
     
     def update_status(self, device_id: int, status: str) -> bool:
         """Update device connection status
@@ -281,33 +402,251 @@ class DeviceRepository:
             status: Connection status ("online" or "offline")
             
         Returns:
-            Success status
+            True if the device was found
         """
         try:
-            device = self.get_by_id(device_id)
-            if device:
-                device.connection_status = status
-                device.last_polled = datetime.utcnow()
-                self.session.commit()
+            result = self.session.execute(
+                update(DeviceDB)
+                .where(DeviceDB.id == device_id)
+                .values(connection_status=status, last_polled=_DB_NOW)
+            )
+            if result.rowcount:
+                self._flush()
                 logger.debug(f"Updated device {device_id} status to {status}")
                 return True
             return False
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Failed to update device status: {e}")
-            return False
+            raise
+    
+    def update_status_bulk(self, statuses: List[Tuple[int, str]]) -> int:
+        """Update the connection status of many devices in one statement
+        
+        Issues a single UPDATE devices .. FROM (VALUES ..) for the batch.
+        
+        Args:
+            statuses: (device ID, "online" or "offline") pairs
+            
+        Returns:
+            Number of devices updated
+        """
+        if not statuses:
+            return 0
+        
+        try:
+            batch = values(
+                column("id", Integer),
+                column("status", String),
+                name="statuses",
+            ).data(statuses)
+            result = self.session.execute(
+                update(DeviceDB)
+                .where(DeviceDB.id == batch.c.id)
+                .values(connection_status=batch.c.status, last_polled=_DB_NOW)
+                .execution_options(synchronize_session=False)
+            )
+            self._flush()
+            logger.debug(f"Updated status of {result.rowcount} devices")
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Failed to update device statuses: {e}")
+            raise
 
 
-class MetricsRepository:
+class MetricsRepository(_Repository):
     """Repository for metrics data access"""
     
-    def __init__(self, session: Session):
-        """Initialize with database session
+    def update_interface_state(
+        self,
+        device_id: int,
+        description: str,
+        oper_status: str,
+        speed: int,
+        in_octets: int,
+        out_octets: int,
+        mtu: int = 1500,
+        updated_at: Optional[datetime] = None,
+    ) -> InterfaceDB:
+        """Update/create the current-state row in the 'interfaces' table
         
         Args:
-            session: SQLAlchemy session
+            device_id: Device ID
+            description: Interface description (used as the interface name)
+            oper_status: Operational status
+            speed: Interface speed
+            in_octets: Input octets
+            out_octets: Output octets
+            mtu: Maximum Transmission Unit
+            updated_at: Collection time (default: now); pass the cycle
+                timestamp to avoid reading the clock per interface
+            
+        Returns:
+            Interface record
         """
-        self.session = session
+        if updated_at is None:
+            updated_at = datetime.utcnow()
+        
+        # Use description as the primary name if it looks like a real name (e.g. Gi1/0/1)
+        # ifName is usually better for the 'name' column in 'interfaces' table
+        
+        interface_record = self.session.scalars(
+            select(InterfaceDB).where(
+                and_(InterfaceDB.device_id == device_id, InterfaceDB.name == description)
+            )
+        ).first()
+
+        if interface_record:
+            interface_record.status = oper_status
+            interface_record.speed = speed
+            interface_record.in_octets = in_octets
+            interface_record.out_octets = out_octets
+            interface_record.mtu = mtu
+            interface_record.last_updated = updated_at
+        else:
+            interface_record = InterfaceDB(
+                device_id=device_id,
+                name=description,
+                status=oper_status,
+                speed=speed,
+                in_octets=in_octets,
+                out_octets=out_octets,
+                mtu=mtu,
+                last_updated=updated_at,
+                type="ethernetCsmacd" # Default
+            )
+            self.session.add(interface_record)
+        
+        return interface_record
+    
+    def update_interface_states(
+        self,
+        device_id: int,
+        states: List[Dict[str, Any]],
+        updated_at: Optional[datetime] = None,
+    ) -> int:
+        """Update/create the current-state rows of a device's interfaces
+        
+        Like update_interface_state() for a whole poll, but with one SELECT
+        for the existing rows, one UPDATE .. FROM (VALUES ..) for those and
+        one multi-row INSERT for the rest, instead of a query per interface.
+        
+        Args:
+            device_id: Device ID
+            states: Dicts with name (the interface description), status,
+                speed, in_octets, out_octets and mtu; of several states with
+                the same name, the last one is kept
+            updated_at: Collection time (default: now)
+            
+        Returns:
+            Number of interfaces updated or created
+        """
+        if not states:
+            return 0
+        if updated_at is None:
+            updated_at = datetime.utcnow()
+        
+        by_name = {state["name"]: state for state in states}
+        
+        try:
+            existing = set(self.session.scalars(
+                select(InterfaceDB.name).where(
+                    InterfaceDB.device_id == device_id,
+                    InterfaceDB.name.in_(list(by_name)),
+                )
+            ))
+            
+            if existing:
+                batch = values(
+                    column("name", String),
+                    column("status", String),
+                    column("speed", BigInteger),
+                    column("in_octets", BigInteger),
+                    column("out_octets", BigInteger),
+                    column("mtu", Integer),
+                    name="states",
+                ).data([
+                    (name, state["status"], state["speed"], state["in_octets"],
+                     state["out_octets"], state["mtu"])
+                    for name, state in by_name.items()
+                    if name in existing
+                ])
+                self.session.execute(
+                    update(InterfaceDB)
+                    .where(
+                        InterfaceDB.device_id == device_id,
+                        InterfaceDB.name == batch.c.name,
+                    )
+                    .values(
+                        status=batch.c.status,
+                        speed=batch.c.speed,
+                        in_octets=batch.c.in_octets,
+                        out_octets=batch.c.out_octets,
+                        mtu=batch.c.mtu,
+                        last_updated=updated_at,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            
+            new_rows = [
+                {
+                    "device_id": device_id,
+                    **state,
+                    "last_updated": updated_at,
+                    "type": "ethernetCsmacd",  # Default
+                }
+                for name, state in by_name.items()
+                if name not in existing
+            ]
+            if new_rows:
+                self.session.execute(insert(InterfaceDB), new_rows)
+            
+            self._flush()
+            return len(by_name)
+        except Exception as e:
+            logger.error(f"Failed to update interface states: {e}")
+            raise
+    
+    def add_interface_metric(
+        self,
+        device_id: int,
+        interface_index: int,
+        interface_name: str,
+        description: str,
+        admin_status: str,
+        oper_status: str,
+        speed: int,
+        in_octets: int,
+        out_octets: int,
+    ) -> InterfaceMetricDB:
+        """Add an interface history row without flushing
+        
+        Args:
+            device_id: Device ID
+            interface_index: Interface index
+            interface_name: Interface name
+            description: Interface description
+            admin_status: Admin status
+            oper_status: Operational status
+            speed: Interface speed
+            in_octets: Input octets
+            out_octets: Output octets
+            
+        Returns:
+            Pending InterfaceMetricDB record
+        """
+        metric = InterfaceMetricDB(
+            device_id=device_id,
+            interface_index=interface_index,
+            interface_name=interface_name,
+            description=description,
+            admin_status=admin_status,
+            oper_status=oper_status,
+            speed=speed,
+            in_octets=in_octets,
+            out_octets=out_octets,
+        )
+        self.session.add(metric)
+        return metric
     
     def save_interface_metrics(
         self,
@@ -341,35 +680,18 @@ class MetricsRepository:
         """
         try:
             # 1. Update/Create entry in 'interfaces' table (Current State)
-            # Use description as the primary name if it looks like a real name (e.g. Gi1/0/1)
-            # ifName is usually better for the 'name' column in 'interfaces' table
-            
-            interface_record = self.session.query(InterfaceDB).filter(
-                and_(InterfaceDB.device_id == device_id, InterfaceDB.name == description)
-            ).first()
-
-            if interface_record:
-                interface_record.status = oper_status
-                interface_record.speed = speed
-                interface_record.in_octets = in_octets
-                interface_record.out_octets = out_octets
-                interface_record.mtu = mtu
-                interface_record.last_updated = datetime.utcnow()
-            else:
-                interface_record = InterfaceDB(
-                    device_id=device_id,
-                    name=description,
-                    status=oper_status,
-                    speed=speed,
-                    in_octets=in_octets,
-                    out_octets=out_octets,
-                    mtu=mtu,
-                    type="ethernetCsmacd" # Default
-                )
-                self.session.add(interface_record)
+            self.update_interface_state(
+                device_id=device_id,
+                description=description,
+                oper_status=oper_status,
+                speed=speed,
+                in_octets=in_octets,
+                out_octets=out_octets,
+                mtu=mtu,
+            )
 
             # 2. Save to 'interface_metrics' table (Historical)
-            metric = InterfaceMetricDB(
+            metric = self.add_interface_metric(
                 device_id=device_id,
                 interface_index=interface_index,
                 interface_name=interface_name,
@@ -380,14 +702,68 @@ class MetricsRepository:
                 in_octets=in_octets,
                 out_octets=out_octets,
             )
-            self.session.add(metric)
-            self.session.commit()
+            self._flush()
             return metric
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Failed to save interface metrics: {e}")
             raise
     
+    def save_interface_metrics_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """Save many interface history rows at once
+        
+        Rows are sent as multi-row INSERT .. VALUES pages rather than one ORM
+        object each. The 'interfaces' current-state table is not touched.
+        
+        Args:
+            rows: InterfaceMetricDB column name -> value dicts
+            
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+        
+        try:
+            self.session.execute(insert(InterfaceMetricDB), rows)
+            self._flush()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Failed to save interface metrics: {e}")
+            raise
+    
+    def add_health_metric(
+        self,
+        device_id: int,
+        device_name: str,
+        uptime_seconds: int,
+        cpu_usage: Optional[float] = None,
+        memory_usage: Optional[float] = None,
+        temperature: Optional[float] = None,
+    ) -> DeviceHealthMetricDB:
+        """Add a device health row without flushing
+        
+        Args:
+            device_id: Device ID
+            device_name: Device name
+            uptime_seconds: Uptime in seconds
+            cpu_usage: CPU usage percentage
+            memory_usage: Memory usage percentage
+            temperature: Temperature in celsius
+            
+        Returns:
+            Pending DeviceHealthMetricDB record
+        """
+        metric = DeviceHealthMetricDB(
+            device_id=device_id,
+            device_name=device_name,
+            uptime_seconds=uptime_seconds,
+            cpu_usage=cpu_usage,
+            memory_usage=memory_usage,
+            temperature=temperature,
+        )
+        self.session.add(metric)
+        return metric
+    
     def save_health_metrics(
         self,
         device_id: int,
@@ -411,7 +787,7 @@ class MetricsRepository:
             Created DeviceHealthMetricDB record
         """
         try:
-            metric = DeviceHealthMetricDB(
+            metric = self.add_health_metric(
                 device_id=device_id,
                 device_name=device_name,
                 uptime_seconds=uptime_seconds,
@@ -419,14 +795,25 @@ class MetricsRepository:
                 memory_usage=memory_usage,
                 temperature=temperature,
             )
-            self.session.add(metric)
-            self.session.commit()
+            self._flush()
             return metric
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Failed to save health metrics: {e}")
             raise
     
+    def flush_metrics(self) -> bool:
+        """Flush metric rows queued with add_interface_metric/add_health_metric
+        
+        Returns:
+            True (errors are raised)
+        """
+        try:
+            self._flush()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to flush metrics: {e}")
+            raise
+    
     def get_latest_health(
         self,
         device_id: int,
@@ -442,12 +829,13 @@ class MetricsRepository:
             List of DeviceHealthMetricDB records
         """
         since = datetime.utcnow() - timedelta(hours=hours)
-        return self.session.query(DeviceHealthMetricDB).filter(
+        stmt = select(DeviceHealthMetricDB).where(
             and_(
                 DeviceHealthMetricDB.device_id == device_id,
                 DeviceHealthMetricDB.collected_at >= since,
             )
-        ).order_by(desc(DeviceHealthMetricDB.collected_at)).all()
+        ).order_by(desc(DeviceHealthMetricDB.collected_at))
+        return list(self.session.scalars(stmt))
 
     def save_inventory(
         self,
@@ -456,6 +844,7 @@ class MetricsRepository:
         serial_number: Optional[str] = None,
         firmware_version: Optional[str] = None,
         vendor_model: Optional[str] = None,
+        collected_at: Optional[datetime] = None,
     ) -> DeviceInventoryDB:
         """Save or update device inventory information
         
@@ -465,22 +854,27 @@ class MetricsRepository:
             serial_number: Serial number
             firmware_version: Firmware/OS version
             vendor_model: Vendor and model name
+            collected_at: Collection time (default: now); pass the cycle
+                timestamp to avoid reading the clock per device
             
         Returns:
             Inventory record
         """
+        if collected_at is None:
+            collected_at = datetime.utcnow()
+        
         try:
             # Check if record exists
-            inventory = self.session.query(DeviceInventoryDB).filter(
-                DeviceInventoryDB.device_id == device_id
-            ).first()
+            inventory = self.session.execute(
+                select(DeviceInventoryDB).where(DeviceInventoryDB.device_id == device_id)
+            ).scalar_one_or_none()
             
             if inventory:
                 inventory.sys_descr = sys_descr
                 inventory.serial_number = serial_number
                 inventory.firmware_version = firmware_version
                 inventory.vendor_model = vendor_model
-                inventory.collected_at = datetime.utcnow()
+                inventory.collected_at = collected_at
             else:
                 inventory = DeviceInventoryDB(
                     device_id=device_id,
@@ -488,12 +882,12 @@ class MetricsRepository:
                     serial_number=serial_number,
                     firmware_version=firmware_version,
                     vendor_model=vendor_model,
+                    collected_at=collected_at,
                 )
                 self.session.add(inventory)
             
-            self.session.commit()
+            self._flush()
             return inventory
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Failed to save device inventory: {e}")
             raise
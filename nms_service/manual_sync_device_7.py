@@ -1,25 +1,199 @@
+import io
 import sys
 import os
+import threading
 from datetime import datetime
+from functools import lru_cache
 from pysnmp.hlapi import *
+from pysnmp.hlapi.varbinds import CommandGeneratorVarBinds
+from pysnmp.proto.rfc1902 import (
+    Counter32,
+    Counter64,
+    Gauge32,
+    Integer32,
+    IpAddress,
+    OctetString,
+    TimeTicks,
+    Unsigned32,
+)
+from pysnmp.proto.rfc1905 import EndOfMibView
 import sqlalchemy
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # Add the parent directory to sys.path to import nms_service modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from nms_service.core.config import config
+from nms_service.database.models import Interface
 
-def get_snmp_data(ip, community, oid):
-    results = {}
-    print(f"[*] Walking OID {oid} on {ip}...")
-    for (error_indication, error_status, error_index, var_binds) in nextCmd(
-        SnmpEngine(),
-        CommunityData(community),
-        UdpTransportTarget((ip, 161), timeout=5, retries=2),
-        ContextData(),
-        ObjectType(ObjectIdentity(oid)),
-        lexicographicMode=False
+# Column order of the rows built in sync_device_7()
+INTERFACE_COLUMNS = ("device_id", "name", "status", "speed", "in_octets", "out_octets")
+
+# Below this many interfaces one batched executemany UPSERT is cheaper than
+# the staging table + COPY round trips
+COPY_MIN_ROWS = 500
+
+# Rows per multi-VALUES INSERT when executemany is used
+INSERT_PAGE_SIZE = 1000
+
+# Rows are COPY'd into this per-transaction staging table, then merged
+_CREATE_STAGING_SQL = text("""
+    CREATE TEMP TABLE stg_interfaces (
+        device_id INTEGER,
+        name VARCHAR(255),
+        status VARCHAR(50),
+        speed BIGINT,
+        in_octets BIGINT,
+        out_octets BIGINT
+    ) ON COMMIT DROP
+""")
+
+_COPY_STAGING_SQL = (
+    "COPY stg_interfaces (device_id, name, status, speed, in_octets, out_octets) "
+    "FROM STDIN WITH (FORMAT text)"
+)
+
+# PostgreSQL 9.5+ syntax
+_MERGE_STAGING_SQL = text("""
+    INSERT INTO interfaces (device_id, name, status, speed, in_octets, out_octets, last_updated)
+    SELECT device_id, name, status, speed, in_octets, out_octets, NOW()
+    FROM stg_interfaces
+    ON CONFLICT (device_id, name)
+    DO UPDATE SET
+        status = EXCLUDED.status,
+        speed = EXCLUDED.speed,
+        in_octets = EXCLUDED.in_octets,
+        out_octets = EXCLUDED.out_octets,
+        last_updated = NOW();
+""")
+
+def _build_interface_upsert():
+    """INSERT .. ON CONFLICT (device_id, name) DO UPDATE for interfaces"""
+    upsert = pg_insert(Interface.__table__)
+    return upsert.on_conflict_do_update(
+        index_elements=["device_id", "name"],
+        set_={
+            "status": upsert.excluded.status,
+            "speed": upsert.excluded.speed,
+            "in_octets": upsert.excluded.in_octets,
+            "out_octets": upsert.excluded.out_octets,
+            "last_updated": func.now(),
+        },
+    )
+
+# Built once so every sync reuses the same construct (and compiled-cache entry);
+# bind parameter types come from the Interface table columns
+_UPSERT_INTERFACES = _build_interface_upsert()
+
+def _copy_field(value):
+    """Format a value for COPY text format"""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+# ifTable columns synced to the interfaces table, walked together
+IF_TABLE_COLUMNS = {
+    "names": "1.3.6.1.2.1.2.2.1.2",         # ifDescr
+    "oper_statuses": "1.3.6.1.2.1.2.2.1.8", # ifOperStatus
+    "speeds": "1.3.6.1.2.1.2.2.1.5",        # ifSpeed
+    "in_octets": "1.3.6.1.2.1.2.2.1.10",    # ifInOctets
+    "out_octets": "1.3.6.1.2.1.2.2.1.16",   # ifOutOctets
+}
+
+# Rows returned per GETBULK response
+BULK_MAX_REPETITIONS = 50
+
+# SnmpEngine setup is expensive; one is shared by all walks in this process,
+# along with the (default) context and one transport target per host
+_snmp_engine = None
+_SNMP_CONTEXT = ContextData()
+_transports = {}
+
+def _get_engine():
+    global _snmp_engine
+    if _snmp_engine is None:
+        _snmp_engine = SnmpEngine()
+    return _snmp_engine
+
+def _get_transport(ip):
+    # Resolves the host address once, on creation
+    if ip not in _transports:
+        _transports[ip] = UdpTransportTarget((ip, 161), timeout=5, retries=2)
+    return _transports[ip]
+
+@lru_cache(maxsize=None)
+def _object_types(oids):
+    """ObjectTypes for the OIDs, resolved against the shared engine's MIB view
+    once; resolved objects are passed through as-is on later walks"""
+    mib_view = CommandGeneratorVarBinds.getMibViewController(_get_engine())
+    return tuple(ObjectType(ObjectIdentity(oid)).resolveWithMib(mib_view) for oid in oids)
+
+# One engine (and connection pool) per process, shared by every sync
+_db_engine = None
+_db_engine_lock = threading.Lock()
+
+def _get_db_engine():
+    global _db_engine
+    with _db_engine_lock:
+        if _db_engine is None:
+            db_url = config.database.connection_string
+            # Inside container, 'localhost' might need to be 'postgres'
+            if "localhost" in db_url and os.getenv("DB_HOST"):
+                db_url = db_url.replace("localhost", os.getenv("DB_HOST"))
+            _db_engine = create_engine(
+                db_url,
+                pool_size=config.database.pool_size,
+                max_overflow=config.database.max_overflow,
+                pool_pre_ping=True,
+                # Reuse the most recently returned connection so idle
+                # overflow connections time out and close
+                pool_use_lifo=True,
+                pool_recycle=1800,
+                insertmanyvalues_page_size=INSERT_PAGE_SIZE,
+            )
+    return _db_engine
+
+# SNMP value types converted straight to int
+_SNMP_INT_TYPES = (Integer32, Counter32, Counter64, Gauge32, TimeTicks, Unsigned32)
+
+def _convert_value(value):
+    """Convert an SNMP value to int/str by its type, without a text round trip"""
+    if isinstance(value, _SNMP_INT_TYPES):
+        return int(value)
+    if isinstance(value, OctetString) and not isinstance(value, IpAddress):
+        return bytes(value).decode("utf-8", "replace")
+    return value.prettyPrint()
+
+def get_snmp_data(ip, community, columns):
+    """Walk several table columns at once with GETBULK
+
+    Each request carries one varbind per column and returns up to
+    BULK_MAX_REPETITIONS rows.
+
+    Args:
+        columns: name -> column OID
+
+    Returns:
+        name -> {ifIndex: value}
+    """
+    results = {name: {} for name in columns}
+    names = list(columns)
+    print(f"[*] Walking {len(columns)} columns ({', '.join(columns.values())}) on {ip}...")
+    for (error_indication, error_status, error_index, var_binds) in bulkCmd(
+        _get_engine(),
+        CommunityData(community, mpModel=1),
+        _get_transport(ip),
+        _SNMP_CONTEXT,
+        0, BULK_MAX_REPETITIONS,
+        *_object_types(tuple(columns.values())),
+        lexicographicMode=False,
+        # Raw (OID, value) pairs; no MIB lookup per returned varbind
+        lookupMib=False
     ):
         if error_indication:
             print(f"[-] SNMP Error: {error_indication}")
@@ -28,21 +202,13 @@ def get_snmp_data(ip, community, oid):
             print(f"[-] SNMP Error Status: {error_status.prettyPrint()}")
             break
         else:
-            for var_bind in var_binds:
-                oid_res = str(var_bind[0])
-                value = var_bind[1]
-                # Extract index from OID (the last part)
-                index = oid_res.split('.')[-1]
-                
-                # Convert value to string/int
-                if hasattr(value, 'prettyPrint'):
-                    val_str = value.prettyPrint()
-                    if val_str.isdigit():
-                        results[index] = int(val_str)
-                    else:
-                        results[index] = val_str
-                else:
-                    results[index] = value
+            # Each yielded row's var_binds line up with the requested columns;
+            # pysnmp fills in endOfMibView once a column is exhausted
+            for name, (oid, value) in zip(names, var_binds):
+                if isinstance(value, EndOfMibView):
+                    continue
+                # ifIndex is the last sub-identifier of the OID
+                results[name][oid[-1]] = _convert_value(value)
     return results
 
 def sync_device_7():
@@ -53,11 +219,12 @@ def sync_device_7():
     print(f"--- Manual Interface Sync for Device {device_id} ({ip}) ---")
 
     # 1. Fetch data from SNMP
-    names = get_snmp_data(ip, community, '1.3.6.1.2.1.2.2.1.2') # ifDescr
-    oper_statuses = get_snmp_data(ip, community, '1.3.6.1.2.1.2.2.1.8') # ifOperStatus
-    speeds = get_snmp_data(ip, community, '1.3.6.1.2.1.2.2.1.5') # ifSpeed
-    in_octets = get_snmp_data(ip, community, '1.3.6.1.2.1.2.2.1.10') # ifInOctets
-    out_octets = get_snmp_data(ip, community, '1.3.6.1.2.1.2.2.1.16') # ifOutOctets
+    table = get_snmp_data(ip, community, IF_TABLE_COLUMNS)
+    names = table["names"]
+    oper_statuses = table["oper_statuses"]
+    speeds = table["speeds"]
+    in_octets = table["in_octets"]
+    out_octets = table["out_octets"]
 
     if not names:
         print("[-] No interfaces found via SNMP. Check connectivity/community.")
@@ -66,50 +233,45 @@ def sync_device_7():
     print(f"[+] Found {len(names)} interfaces. Syncing to database...")
 
     # 2. Connect to Database
-    db_url = config.database.connection_string
-    # Inside container, 'localhost' might need to be 'postgres'
-    if "localhost" in db_url and os.getenv("DB_HOST"):
-        db_url = db_url.replace("localhost", os.getenv("DB_HOST"))
-    
-    engine = create_engine(db_url)
+    engine = _get_db_engine()
     
+    # One row per interface name; a repeated ifDescr keeps the last index,
+    # as the UPSERT would
+    rows = {}
+    for idx, name in names.items():
+        oper_status_raw = oper_statuses.get(idx, 2) # default down
+        status = "up" if oper_status_raw == 1 else "down"
+        rows[name] = (
+            device_id,
+            name,
+            status,
+            speeds.get(idx, 0),
+            in_octets.get(idx, 0),
+            out_octets.get(idx, 0),
+        )
+
     with engine.begin() as conn:
-        # Clear existing interfaces for a clean start if desired, or just UPSERT
-        # Let's UPSERT based on (device_id, name)
-        
-        count = 0
-        for idx, name in names.items():
-            oper_status_raw = oper_statuses.get(idx, 2) # default down
-            status = "up" if oper_status_raw == 1 else "down"
-            speed = speeds.get(idx, 0)
-            in_oct = in_octets.get(idx, 0)
-            out_oct = out_octets.get(idx, 0)
-            
-            # Use SQL text for UPSERT
-            # PostgreSQL 9.5+ syntax
-            query = text("""
-                INSERT INTO interfaces (device_id, name, status, speed, in_octets, out_octets, last_updated)
-                VALUES (:device_id, :name, :status, :speed, :in_oct, :out_oct, NOW())
-                ON CONFLICT (device_id, name) 
-                DO UPDATE SET 
-                    status = EXCLUDED.status,
-                    speed = EXCLUDED.speed,
-                    in_octets = EXCLUDED.in_octets,
-                    out_octets = EXCLUDED.out_octets,
-                    last_updated = NOW();
-            """)
-            
-            conn.execute(query, {
-                "device_id": device_id,
-                "name": name,
-                "status": status,
-                "speed": speed,
-                "in_oct": in_oct,
-                "out_oct": out_oct
-            })
-            count += 1
-            
-        print(f"[+] Successfully synced {count} interfaces to database.")
+        if len(rows) < COPY_MIN_ROWS:
+            # UPSERT based on (device_id, name); executemany is sent as
+            # multi-row VALUES pages
+            conn.execute(_UPSERT_INTERFACES, [
+                dict(zip(INTERFACE_COLUMNS, row)) for row in rows.values()
+            ])
+        else:
+            # COPY into a staging table, then UPSERT based on (device_id, name)
+            # in a single statement
+            buf = io.StringIO()
+            for row in rows.values():
+                buf.write("\t".join(_copy_field(value) for value in row))
+                buf.write("\n")
+            buf.seek(0)
+
+            conn.execute(_CREATE_STAGING_SQL)
+            with conn.connection.dbapi_connection.cursor() as cur:
+                cur.copy_expert(_COPY_STAGING_SQL, buf)
+            conn.execute(_MERGE_STAGING_SQL)
+
+        print(f"[+] Successfully synced {len(rows)} interfaces to database.")
 
 if __name__ == "__main__":
     sync_device_7()
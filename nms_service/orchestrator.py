@@ -4,15 +4,27 @@ Coordinates SNMP polling, alarm evaluation, and data storage.
 Designed for gradual scalability from single poller to distributed system.
 """
 
+import threading
 import time
-from typing import Dict, List
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 
 from nms_service.core.logger import logger
 from nms_service.core.config import config
+from nms_service.core.metrics import metrics, start_metrics_server
 from nms_service.snmp.poller import SNMPPoller, DeviceConfig
+from nms_service.snmp.pool import engine_pool
+from nms_service.snmp.session import SNMPSession
+from nms_service.snmp.sweep import sweep_reachability
 from nms_service.alarm import AlarmEngine
-from nms_service.database.models import db_manager
+from nms_service.core.models import Alarm, TimeSource
+from nms_service.database.models import (
+    count_queries,
+    get_db_manager,
+    InterfaceMetric as InterfaceMetricDB,
+    DeviceHealthMetric as DeviceHealthMetricDB,
+)
 from nms_service.database.repository import (
     AlarmRepository,
     DeviceRepository,
@@ -21,6 +33,21 @@ from nms_service.database.repository import (
 from nms_service.api.client import APIClient
 
 
+# interface_metrics column -> InterfaceMetric attribute, queued per cycle
+INTERFACE_HISTORY_FIELDS = {
+    "device_id": "device_id",
+    "interface_index": "interface_index",
+    "interface_name": "interface_name",
+    "description": "description",
+    "admin_status": "admin_status",
+    "oper_status": "oper_status",
+    "speed": "speed",
+    "in_octets": "in_octets",
+    "out_octets": "out_octets",
+    "collected_at": "timestamp",
+}
+
+
 class NMSOrchestrator:
     """Main NMS service orchestrator
     
@@ -37,13 +64,43 @@ class NMSOrchestrator:
         self.poller = SNMPPoller()
         self.alarm_engine = AlarmEngine()
         self.api_client = APIClient()
-        self.last_inventory_poll: Dict[int, datetime] = {}
+        # device_id -> time.monotonic() of the last inventory poll
+        self.last_inventory_poll: Dict[int, float] = {}
+        # Worker threads read and update last_inventory_poll concurrently
+        self._inventory_lock = threading.Lock()
+        self.db_manager = get_db_manager()
+        self.metric_partitions_day: Optional[date] = None
+        self.metrics_server = None
+        self.executor = ThreadPoolExecutor(
+            max_workers=config.snmp.max_concurrent_pollers,
+            thread_name_prefix="nms-poll",
+        )
         
         # Initialize database
-        db_manager.init_db()
+        self.db_manager.init_db()
+        
+        # Repositories are bound to the thread-local session registry, so one
+        # instance serves every worker thread and cycle; each use runs on the
+        # calling thread's session_scope() session
+        self.alarm_repo = AlarmRepository(self.db_manager.SessionLocal)
+        self.device_repo = DeviceRepository(self.db_manager.SessionLocal)
+        self.metrics_repo = MetricsRepository(self.db_manager.SessionLocal)
+        
+        # Per-device state here is dropped with the device's session
+        self.poller.on_unregister(self._forget_device)
         
         logger.info("NMS Orchestrator initialized")
     
+    def _forget_device(self, device_id: int) -> None:
+        """Drop the orchestrator's state for an unregistered device
+        
+        Args:
+            device_id: Device ID
+        """
+        with self._inventory_lock:
+            self.last_inventory_poll.pop(device_id, None)
+        self.alarm_engine.clear_device_state(device_id)
+    
     def register_devices_from_db(self) -> int:
         """Load and register devices from database
         
@@ -51,27 +108,24 @@ class NMSOrchestrator:
             Number of devices registered
         """
         try:
-            session = db_manager.get_session()
-            device_repo = DeviceRepository(session)
-            
-            devices = device_repo.get_all_enabled()
-            count = 0
-            
-            for device in devices:
-                config = DeviceConfig(
-                    device_id=device.id,
-                    device_name=device.name,
-                    ip_address=device.ip_address,
-                    community_string=device.snmp_community,
-                    vendor=device.vendor,
-                    snmp_port=device.snmp_port,
-                    snmp_version=device.snmp_version,
-                    enabled=device.polling_enabled,
-                )
-                self.poller.register_device(config)
-                count += 1
+            with self.db_manager.session_scope():
+                devices = self.device_repo.get_all_enabled()
+                count = 0
+                
+                for device in devices:
+                    config = DeviceConfig(
+                        device_id=device.id,
+                        device_name=device.name,
+                        ip_address=device.ip_address,
+                        community_string=device.snmp_community,
+                        vendor=device.vendor,
+                        snmp_port=device.snmp_port,
+                        snmp_version=device.snmp_version,
+                        enabled=device.polling_enabled,
+                    )
+                    self.poller.register_device(config)
+                    count += 1
             
-            session.close()
             logger.info(f"Registered {count} devices from database")
             return count
             
@@ -79,46 +133,59 @@ class NMSOrchestrator:
             logger.error(f"Failed to register devices from DB: {e}")
             return 0
     
-    def poll_cycle(self) -> None:
-        """Execute single polling cycle
+    def _poll_device(
+        self,
+        device_id: int,
+        session_obj: SNMPSession,
+        polled_at: datetime,
+        interface_history: List[Dict[str, List]],
+        health_rows: List[Dict],
+        alarms: List[Alarm],
+        statuses: List[Tuple[int, str]],
+    ) -> None:
+        """Poll one device and store its state and alarms
         
-        - Poll all registered devices
-        - Evaluate metrics for alarms
-        - Store results in database
-        - Send to API
-        """
-        logger.debug("Starting polling cycle")
-        cycle_start = time.time()
+        Runs on a polling worker thread. History rows, new alarms and the
+        device's connection status are appended to the cycle's lists, then
+        written and sent to the API by poll_cycle() once all devices are done.
         
+        Args:
+            device_id: Device ID
+            session_obj: SNMP session of the device
+            polled_at: Cycle timestamp
+            interface_history: Interface history columns of the cycle, one
+                dict of column lists per device
+            health_rows: Health history rows of the cycle
+            alarms: Alarms raised in the cycle
+            statuses: (device ID, connection status) pairs of the cycle
+        """
         try:
-            session = db_manager.get_session()
-            alarm_repo = AlarmRepository(session)
-            metrics_repo = MetricsRepository(session)
-            
-            for device_id, session_obj in self.poller.sessions.items():
+            with self.db_manager.session_scope() as session:
+                device_name = session_obj.device_name
+                logger.debug(f"Polling device {device_name}")
+                
+                device_is_online = False
+                
+                # Poll interfaces
                 try:
-                    device_name = session_obj.device_name
-                    logger.debug(f"Polling device {device_name}")
+                    interfaces = self.poller.poll_interfaces(device_id)
                     
-                    device_is_online = False
-                    
-                    # Poll interfaces
-                    try:
-                        interfaces = self.poller.poll_interfaces(device_id)
+                    if interfaces:
+                        device_is_online = True
                         
-                        if interfaces:
-                            device_is_online = True
-                            # Device is online - mark it as such
-                            self.api_client.update_device_status(device_id, "online")
-                            device_repo = DeviceRepository(session)
-                            device_repo.update_status(device_id, "online")
-                            
+                        # Inventory and interface state for this device are
+                        # committed together
+                        interface_alarms = []
+                        states = []
+                        history = {column: [] for column in INTERFACE_HISTORY_FIELDS}
+                        with self.metrics_repo.bulk():
                             # Check if inventory polling is due
-                            now = datetime.utcnow()
-                            last_poll = self.last_inventory_poll.get(device_id)
-                            interval = timedelta(seconds=config.polling.inventory_poll_interval)
+                            now = time.monotonic()
+                            with self._inventory_lock:
+                                last_poll = self.last_inventory_poll.get(device_id)
+                            interval = config.polling.inventory_poll_interval
                             
-                            if not last_poll or (now - last_poll) > interval:
+                            if last_poll is None or (now - last_poll) > interval:
                                 try:
                                     inventory = self.poller.poll_inventory(device_id)
                                     if inventory:
@@ -127,127 +194,275 @@ class NMSOrchestrator:
                                             vendor_model = f"{inventory.vendor} {inventory.model}"
                                         elif inventory.vendor:
                                             vendor_model = inventory.vendor
-                                            
-                                        metrics_repo.save_inventory(
+                                        
+                                        self.metrics_repo.save_inventory(
                                             device_id=device_id,
                                             sys_descr=inventory.sys_descr,
                                             serial_number=inventory.serial_number,
                                             firmware_version=inventory.firmware_version,
-                                            vendor_model=vendor_model
+                                            vendor_model=vendor_model,
+                                            collected_at=polled_at,
                                         )
-                                        self.last_inventory_poll[device_id] = now
+                                        with self._inventory_lock:
+                                            self.last_inventory_poll[device_id] = now
                                         logger.info(f"Updated inventory for {device_name}")
                                 except Exception as e:
                                     logger.error(f"Inventory poll failed for {device_name}: {e}")
                             
                             for iface_metric in interfaces:
                                 # Generate alarms for interface
-                                alarms = self.alarm_engine.evaluate_interface_metric(iface_metric)
+                                metric_alarms = self.alarm_engine.evaluate_interface_metric(iface_metric)
                             
-                                for alarm in alarms:
+                                for alarm in metric_alarms:
                                     alarm.device_name = device_name
-                                    # Store in database
-                                    alarm_repo.create(alarm)
-                                    # Send to API
-                                    self.api_client.create_alarm(alarm)
+                                    interface_alarms.append(alarm)
+                            
+                                # Current interface state, written below for
+                                # the whole device at once
+                                states.append({
+                                    "name": iface_metric.description,
+                                    "status": iface_metric.oper_status,
+                                    "speed": iface_metric.speed,
+                                    "in_octets": iface_metric.in_octets,
+                                    "out_octets": iface_metric.out_octets,
+                                    "mtu": iface_metric.mtu,
+                                })
+                            
+                                # Queue history values for the end-of-cycle batch insert
+                                for column, attr in INTERFACE_HISTORY_FIELDS.items():
+                                    history[column].append(getattr(iface_metric, attr))
                             
-                                # Store metrics in database
-                                metrics_repo.save_interface_metrics(
-                                    device_id=iface_metric.device_id,
-                                    interface_index=iface_metric.interface_index,
-                                    interface_name=iface_metric.interface_name,
-                                    description=iface_metric.description,
-                                    admin_status=iface_metric.admin_status,
-                                    oper_status=iface_metric.oper_status,
-                                    speed=iface_metric.speed,
-                                    in_octets=iface_metric.in_octets,
-                                    out_octets=iface_metric.out_octets,
-                                    mtu=iface_metric.mtu,
-                                )
-                                
                                 # Note: Interface metrics are no longer sent to the generic /metrics API 
                                 # to avoid cluttering the System Metrics dashboard. They are available 
                                 # via the interfaces table.
-                        
-                            logger.debug(
-                                f"Polled {len(interfaces)} interfaces for {device_name}"
+                            
+                            self.metrics_repo.update_interface_states(
+                                device_id, states, updated_at=interfaces[0].timestamp
                             )
                         
-                    except Exception as e:
-                        logger.error(f"Interface polling failed for {device_name}: {e}")
+                        # Stored and sent with the rest of the cycle's alarms
+                        alarms.extend(interface_alarms)
+                        interface_history.append(history)
+                        
+                        # Everything needed was copied into rows and alarms
+                        self.poller.release_metrics(interfaces)
+                    
+                        logger.debug(
+                            f"Polled {len(interfaces)} interfaces for {device_name}"
+                        )
+                    
+                except Exception as e:
+                    session.rollback()
+                    logger.error(f"Interface polling failed for {device_name}: {e}")
+                
+                # Poll device health
+                try:
+                    vendor = self.device_repo.get_vendor(device_id)
                     
-                    # Poll device health
-                    try:
-                        device_repo = DeviceRepository(session)
-                        device_db_obj = device_repo.get_by_id(device_id)
+                    if vendor:
+                        health_metric = self.poller.poll_device_health(
+                            device_id,
+                            vendor,
+                        )
                         
-                        if device_db_obj:
-                            health_metric = self.poller.poll_device_health(
-                                device_id,
-                                device_db_obj.vendor,
+                        if health_metric:
+                            device_is_online = True
+                            
+                            # Generate alarms
+                            health_alarms = self.alarm_engine.evaluate_device_health(
+                                health_metric
                             )
                             
-                            if health_metric:
-                                device_is_online = True
-                                # Device is online - update status
-                                self.api_client.update_device_status(device_id, "online")
-                                device_repo.update_status(device_id, "online")
-                                
-                                # Generate alarms
-                                alarms = self.alarm_engine.evaluate_device_health(
-                                    health_metric
-                                )
-                                
-                                for alarm in alarms:
-                                    alarm.device_name = device_name
-                                    alarm_repo.create(alarm)
-                                    self.api_client.create_alarm(alarm)
-                                
-                                # Store metrics
-                                metrics_repo.save_health_metrics(
-                                    device_id=health_metric.device_id,
-                                    device_name=health_metric.device_name,
-                                    uptime_seconds=health_metric.uptime_seconds,
-                                    cpu_usage=health_metric.cpu_usage,
-                                    memory_usage=health_metric.memory_usage,
-                                    temperature=health_metric.temperature,
-                                )
-                                
-                                # Send to API
-                                self.api_client.send_metrics(
-                                    device_id=device_id,
-                                    metric_type="health",
-                                    data={
-                                        "cpu_usage": health_metric.cpu_usage,
-                                        "memory_usage": health_metric.memory_usage,
-                                        "temperature": health_metric.temperature,
-                                        "uptime_seconds": health_metric.uptime_seconds,
-                                    },
-                                )
-                    
-                    except Exception as e:
-                        logger.error(f"Health polling failed for {device_name}: {e}")
-
-                    # If both failed, mark offline
-                    if not device_is_online:
-                        try:
-                            logger.debug(f"Device {device_name} is offline, updating status")
-                            self.api_client.update_device_status(device_id, "offline")
-                            device_repo = DeviceRepository(session)
-                            device_repo.update_status(device_id, "offline")
-                        except Exception as e:
-                            logger.error(f"Failed to mark device {device_id} as offline: {e}")
+                            for alarm in health_alarms:
+                                alarm.device_name = device_name
+                            alarms.extend(health_alarms)
+                            
+                            # Queue metrics for the end-of-cycle batch insert
+                            # (and bulk API call)
+                            health_rows.append({
+                                "device_id": health_metric.device_id,
+                                "device_name": health_metric.device_name,
+                                "uptime_seconds": health_metric.uptime_seconds,
+                                "cpu_usage": health_metric.cpu_usage,
+                                "memory_usage": health_metric.memory_usage,
+                                "temperature": health_metric.temperature,
+                                "collected_at": health_metric.timestamp,
+                            })
+                            self.poller.release_metrics([health_metric])
                 
                 except Exception as e:
-                    logger.error(f"Error polling device {device_id}: {e}")
-            
-            session.close()
-            
+                    logger.error(f"Health polling failed for {device_name}: {e}")
+
+                # If both failed, the device is marked offline and skipped
+                # until its backoff delay has passed
+                self.poller.record_poll_result(device_id, device_is_online)
+                if not device_is_online:
+                    logger.debug(f"Device {device_name} is offline, updating status")
+                
+                statuses.append((device_id, "online" if device_is_online else "offline"))
+        
         except Exception as e:
-            logger.error(f"Polling cycle failed: {e}")
+            logger.error(f"Error polling device {device_id}: {e}")
+    
+    def _poll_devices(
+        self,
+        sessions: List[SNMPSession],
+        polled_at: datetime,
+        interface_history: List[Dict[str, List]],
+        health_rows: List[Dict],
+        alarms: List[Alarm],
+        statuses: List[Tuple[int, str]],
+    ) -> None:
+        """Poll devices one after another (see _poll_device())
+        
+        Devices in offline backoff are skipped; they were marked offline by
+        the poll that failed and keep that status until polled again.
+        
+        Args:
+            sessions: SNMP sessions of the devices, usually sharing one agent
+            polled_at: Cycle timestamp
+            interface_history: Interface history columns of the cycle, one
+                dict of column lists per device
+            health_rows: Health history rows of the cycle
+            alarms: Alarms raised in the cycle
+            statuses: (device ID, connection status) pairs of the cycle
+        """
+        for session_obj in sessions:
+            if self.poller.is_backed_off(session_obj.device_id):
+                continue
+            self._poll_device(
+                session_obj.device_id,
+                session_obj,
+                polled_at,
+                interface_history,
+                health_rows,
+                alarms,
+                statuses,
+            )
+    
+    def poll_cycle(self) -> None:
+        """Execute single polling cycle
+        
+        - Poll all registered devices
+        - Evaluate metrics for alarms
+        - Store results in database
+        - Send to API
+        """
+        logger.debug("Starting polling cycle")
+        cycle_start = time.time()
+        polled_at = TimeSource.tick()
+        
+        # Roll daily metric partitions forward (and expire old ones) once per
+        # day. Partitions exist days ahead, so one that failed (already logged)
+        # is retried tomorrow rather than on every cycle.
+        if polled_at.date() != self.metric_partitions_day:
+            self.db_manager.create_metric_partitions()
+            self.metric_partitions_day = polled_at.date()
+            retention_days = config.database.metrics_retention_days
+            if retention_days > 0:
+                dropped = self.db_manager.drop_metric_partitions(
+                    polled_at.date() - timedelta(days=retention_days)
+                )
+                if dropped:
+                    logger.info(f"Dropped {dropped} expired metric partitions")
+        
+        # Statements issued by the whole cycle, reported below
+        with count_queries(self.db_manager.engine) as statements:
+            try:
+                # Time-series rows are collected here and written once per cycle
+                interface_history: List[Dict[str, List]] = []
+                health_rows: List[Dict] = []
+                alarms: List[Alarm] = []
+                statuses: List[Tuple[int, str]] = []
+                
+                # Devices coming out of offline backoff are probed together
+                # first; those still silent go straight back into backoff
+                # instead of timing out a full poll each
+                retry_sessions = self.poller.sessions_due_for_retry()
+                if retry_sessions:
+                    for device_id, reachable in sweep_reachability(retry_sessions).items():
+                        if not reachable:
+                            self.poller.record_poll_result(device_id, False)
+                
+                # Hosts are polled in parallel; every worker thread has its
+                # own SNMP engine and database session.
+                # Devices sharing one agent IP are split into at most
+                # max_parallel_per_host lanes, each polled serially.
+                lanes_per_host = max(1, config.polling.max_parallel_per_host)
+                futures = [
+                    self.executor.submit(
+                        self._poll_devices,
+                        host_sessions[lane::lanes_per_host],
+                        polled_at,
+                        interface_history,
+                        health_rows,
+                        alarms,
+                        statuses,
+                    )
+                    for host_sessions in list(self.poller.sessions_by_host.values())
+                    for lane in range(min(lanes_per_host, len(host_sessions)))
+                ]
+                wait(futures)
+                
+                # Separate transactions, so a failed status update can't
+                # take the cycle's alarms down with it
+                stored_alarms = 0
+                try:
+                    with self.db_manager.session_scope():
+                        stored_alarms = self.alarm_repo.create_bulk(alarms)
+                except Exception as e:
+                    metrics.inc("alarm_store_failures", len(alarms))
+                    logger.error(f"Failed to store {len(alarms)} alarms of the cycle: {e}")
+                
+                try:
+                    with self.db_manager.session_scope():
+                        self.device_repo.update_status_bulk(statuses)
+                except Exception as e:
+                    logger.error(f"Failed to store the status of {len(statuses)} devices: {e}")
+                
+                interface_rows = self.db_manager.bulk_insert_columns(InterfaceMetricDB, {
+                    column: [
+                        value for history in interface_history for value in history[column]
+                    ]
+                    for column in INTERFACE_HISTORY_FIELDS
+                })
+                metrics.set("alarm_batch_size", stored_alarms)
+                metrics.set("interface_batch_size", interface_rows)
+                self.db_manager.bulk_insert_metrics(DeviceHealthMetricDB, health_rows)
+                
+                # One request per endpoint for the whole cycle. The requests
+                # are independent, so they run concurrently on the (now idle)
+                # polling pool over the API client's keep-alive connections.
+                health_samples = [
+                    {
+                        "device_id": row["device_id"],
+                        "metric_type": "health",
+                        "data": {
+                            "cpu_usage": row["cpu_usage"],
+                            "memory_usage": row["memory_usage"],
+                            "temperature": row["temperature"],
+                            "uptime_seconds": row["uptime_seconds"],
+                        },
+                        "timestamp": row["collected_at"],
+                    }
+                    for row in health_rows
+                ]
+                wait([
+                    self.executor.submit(self.api_client.update_device_statuses_bulk, dict(statuses)),
+                    self.executor.submit(self.api_client.create_alarms_bulk, alarms),
+                    self.executor.submit(self.api_client.send_metrics_bulk, health_samples),
+                ])
+                
+            except Exception as e:
+                logger.error(f"Polling cycle failed: {e}")
         
         cycle_time = time.time() - cycle_start
-        logger.debug(f"Polling cycle completed in {cycle_time:.2f}s")
+        metrics.observe("poll_cycle_seconds", cycle_time)
+        logger.debug(
+            f"Polling cycle completed in {cycle_time:.2f}s "
+            f"({len(statements)} SQL statements)"
+        )
+        logger.debug(f"Poller metrics: {metrics.summary()}")
     
     def run(self) -> None:
         """Run NMS service continuously
@@ -257,6 +472,9 @@ class NMSOrchestrator:
         """
         logger.info("Starting NMS service")
         
+        if config.metrics_port > 0:
+            self.metrics_server = start_metrics_server(config.metrics_port)
+        
         # Load devices from database
         self.register_devices_from_db()
         
@@ -289,9 +507,13 @@ class NMSOrchestrator:
         logger.info("Shutting down NMS service")
         
         try:
+            self.executor.shutdown(wait=True)
+            if self.metrics_server:
+                self.metrics_server.shutdown()
             self.poller.close_all()
+            engine_pool.shutdown()
             self.api_client.close()
-            db_manager.close()
+            self.db_manager.close()
             logger.info("NMS service shutdown complete")
         except Exception as e:
             logger.error(f"Error during shutdown: {e}")
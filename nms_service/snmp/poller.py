@@ -1,26 +1,33 @@
 """SNMP polling engine for periodic data collection
 
-Synchronous polling with async-ready architecture for scalability.
+Blocking poll methods, run concurrently across devices by the orchestrator.
 Supports multiple vendors and configurable polling intervals.
 """
 
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+from collections import deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Any, Tuple, Union
+from datetime import timedelta
+from dataclasses import dataclass, field, fields
+import math
+import re
+import sys
 import time
 
+from nms_service.core.config import config
 from nms_service.core.logger import logger
+from nms_service.core.metrics import metrics
 from nms_service.core.models import (
     InterfaceMetric,
     DeviceHealthMetric,
     DeviceInventory,
     SNMPMetric,
+    TimeSource,
 )
 from nms_service.snmp.session import SNMPSession, SNMPError, SNMPDeviceUnreachable
-from nms_service.snmp.vendor_oids import oid_manager
+from nms_service.snmp.vendor_oids import HealthOidSet, get_health_oid_set
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DeviceConfig:
     """Device polling configuration"""
     device_id: int
@@ -36,42 +43,194 @@ class DeviceConfig:
     interface_poll_interval: Optional[int] = None
     health_poll_interval: Optional[int] = None
     inventory_poll_interval: Optional[int] = None
+    
+    # GETBULK rows per response limit (overrides SNMP_BULK_MAX_REPETITIONS)
+    bulk_max_repetitions: Optional[int] = None
+    
+    # Lower-case vendor, interned so every device shares one string per vendor
+    vendor_normalized: str = field(init=False)
+    
+    def __post_init__(self):
+        object.__setattr__(
+            self, "vendor_normalized", sys.intern((self.vendor or "").lower())
+        )
+
+
+# ifTable (IF-MIB) columns collected by poll_interfaces()
+IF_TABLE_COLUMNS = {
+    "descr": "1.3.6.1.2.1.2.2.1.2",
+    "type": "1.3.6.1.2.1.2.2.1.3",
+    "mtu": "1.3.6.1.2.1.2.2.1.4",
+    "speed": "1.3.6.1.2.1.2.2.1.5",
+    "admin_status": "1.3.6.1.2.1.2.2.1.7",
+    "oper_status": "1.3.6.1.2.1.2.2.1.8",
+    "in_octets": "1.3.6.1.2.1.2.2.1.10",
+    "in_errors": "1.3.6.1.2.1.2.2.1.14",
+    "out_octets": "1.3.6.1.2.1.2.2.1.16",
+    "out_errors": "1.3.6.1.2.1.2.2.1.20",
+}
+
+# SNMPv2-MIB system group scalars
+SYS_DESCR_OID = "1.3.6.1.2.1.1.1.0"
+SYS_UPTIME_OID = "1.3.6.1.2.1.1.3.0"
+SYS_NAME_OID = "1.3.6.1.2.1.1.5.0"
+
+# HOST-RESOURCES-MIB (RFC 2790) columns for devices without vendor health OIDs
+HR_PROCESSOR_LOAD_OID = "1.3.6.1.2.1.25.3.3.1.2"
+HR_STORAGE_TYPE_OID = "1.3.6.1.2.1.25.2.3.1.2"
+HR_STORAGE_SIZE_OID = "1.3.6.1.2.1.25.2.3.1.5"
+HR_STORAGE_USED_OID = "1.3.6.1.2.1.25.2.3.1.6"
+HR_STORAGE_RAM = "1.3.6.1.2.1.25.2.1.2"  # hrStorageType value of RAM
+HR_HEALTH_COLUMNS = (
+    HR_PROCESSOR_LOAD_OID,
+    HR_STORAGE_TYPE_OID,
+    HR_STORAGE_SIZE_OID,
+    HR_STORAGE_USED_OID,
+)
+
+# CISCO-ENTITY-SENSOR-MIB entSensorType / entSensorValue
+CISCO_SENSOR_TYPE_OID = "1.3.6.1.4.1.9.9.91.1.1.1.1.1"
+CISCO_SENSOR_VALUE_OID = "1.3.6.1.4.1.9.9.91.1.1.1.1.4"
+CISCO_SENSOR_CELSIUS = "8"  # entSensorType value of temperature sensors
+CISCO_SENSOR_COLUMNS = (CISCO_SENSOR_TYPE_OID, CISCO_SENSOR_VALUE_OID)
+
+# CISCO-ENVMON-MIB ciscoEnvMonTemperatureStatusValue (older platforms)
+CISCO_ENV_TEMP_VALUE_OID = "1.3.6.1.4.1.9.9.13.1.3.1.3"
+
+# ENTITY-MIB entPhysicalSerialNum / entPhysicalModelName
+ENT_PHYSICAL_SERIAL_OID = "1.3.6.1.2.1.47.1.1.1.1.11"
+ENT_PHYSICAL_MODEL_OID = "1.3.6.1.2.1.47.1.1.1.1.13"
+ENT_INVENTORY_COLUMNS = (ENT_PHYSICAL_SERIAL_OID, ENT_PHYSICAL_MODEL_OID)
+
+# FORTINET-FORTIGATE-MIB fgSysSerial, MIKROTIK-MIB mtxrFirmwareVersion
+FORTINET_SERIAL_OID = "1.3.6.1.4.1.12356.100.1.1.1.0"
+MIKROTIK_VERSION_OID = "1.3.6.1.4.1.14988.1.1.4.4.0"
+
+# Single GET of poll_inventory(): the system group plus the vendor scalars,
+# which other agents answer with noSuchObject
+INVENTORY_OIDS = (
+    SYS_DESCR_OID,
+    SYS_NAME_OID,
+    SYS_UPTIME_OID,
+    FORTINET_SERIAL_OID,
+    MIKROTIK_VERSION_OID,
+)
+
+# IF-MIB ifNumber: number of ifTable rows, checked against the OID cache
+IF_NUMBER_OID = "1.3.6.1.2.1.2.1.0"
+
+# Longest a device's inventory is reused without asking the device again
+INVENTORY_CACHE_TTL = timedelta(hours=24)
+
+# Released metric objects kept for reuse, per metric type
+METRIC_POOL_SIZE = 4096
 
+# Field names assigned when a pooled metric object is reused
+_INTERFACE_METRIC_FIELDS = tuple(f.name for f in fields(InterfaceMetric))
+_HEALTH_METRIC_FIELDS = tuple(f.name for f in fields(DeviceHealthMetric))
+
+# Longest wait, in seconds, before an unreachable device is polled again
+MAX_OFFLINE_BACKOFF = 300
+
+
+class InterfaceOidCache(NamedTuple):
+    """ifTable instance OIDs of a device, read with GET until deadline"""
+    deadline: float  # time.monotonic() value
+    oids: List[str]
+    keys: List[Tuple[str, str]]  # (column name, ifIndex) for each OID
+    groups: List[List[str]]  # GET requests: ifNumber, then OID chunks
+    interface_count: int
+
+
+# Plain decimal number; anything else (error messages, OIDs, "1e5") is
+# rejected by safe_int()/safe_float()
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)")
+
+# (sysDescr substring, vendor), checked in order against the lower-case sysDescr
+_VENDOR_MARKERS = (
+    ("cisco", "cisco"),
+    ("fortinet", "fortinet"),
+    ("fortigate", "fortinet"),
+    ("mikrotik", "mikrotik"),
+)
+
+# Firmware version in a Cisco sysDescr, e.g. "Version 15.2(4)E7"
+_VERSION_RE = re.compile(r"Version ([^,\s]+)")
 
 def safe_int(val, default=0):
     if val is None: return default
+    # Values parsed by SNMPSession are mostly int or float already
+    if type(val) is int:
+        return val
+    if type(val) is float:
+        return int(val) if math.isfinite(val) else default
     try:
         # Handle cases where val might be a string containing error message or OID value
         val_str = str(val).strip()
-        if not val_str or any(c.isalpha() for c in val_str if c not in '.-'):
+        if not _NUMBER_RE.fullmatch(val_str):
             return default
+        # Integers are parsed exactly (Counter64 values exceed float precision)
+        if "." not in val_str:
+            return int(val_str)
         return int(float(val_str))
     except (ValueError, TypeError):
         return default
 
 def safe_float(val, default=0.0):
     if val is None: return default
+    if type(val) is float:
+        return val if math.isfinite(val) else default
+    if type(val) is int:
+        return float(val)
     try:
         val_str = str(val).strip()
-        if not val_str or any(c.isalpha() for c in val_str if c not in '.-'):
+        if not _NUMBER_RE.fullmatch(val_str):
             return default
         return float(val_str)
     except (ValueError, TypeError):
         return default
 
+
 class SNMPPoller:
-    """Synchronous SNMP poller for collecting metrics
+    """SNMP poller for collecting metrics
     
-    Architecture supports async scaling:
-    - Currently synchronous for < 50 devices
-    - Ready for async/concurrent refactoring for > 50 devices
+    Concurrency model:
+    - Poll methods are blocking and safe to call from worker threads; each
+      thread sends through its own SNMP engine (see snmp.pool)
+    - NMSOrchestrator fans devices out over its thread pool, one serial
+      lane per SNMP agent (see max_parallel_per_host)
+    - Within a device, cached ifTable OIDs are read with concurrent GETs
+      (SNMPSession.get_many())
     - Distributed polling can be added by spawning multiple instances
     """
     
     def __init__(self):
         """Initialize SNMP poller"""
         self.sessions: Dict[int, SNMPSession] = {}
-        self.last_poll_time: Dict[int, Dict[str, datetime]] = {}
+        # Sessions sharing one SNMP agent (e.g. virtual contexts on one IP)
+        self.sessions_by_host: Dict[str, List[SNMPSession]] = {}
+        # device_id -> poll kind -> time.monotonic() of the last poll
+        self.last_poll_time: Dict[int, Dict[str, float]] = {}
+        self._unregister_callbacks: List[Callable[[int], None]] = []
+        # device_id -> ifTable instance OIDs found by the last walk
+        self.oid_cache: Dict[int, InterfaceOidCache] = {}
+        # device_id -> (sysUpTime ticks when polled, inventory)
+        self.inventory_cache: Dict[int, Tuple[int, DeviceInventory]] = {}
+        # device_id -> sysUpTime ticks from the latest health poll
+        self.last_uptime_ticks: Dict[int, int] = {}
+        # device_id -> table name -> leaf OIDs found by walking the table
+        # (sensor and ENTITY-MIB indices), read with GET until refreshed
+        self.leaf_oid_cache: Dict[int, Dict[str, List[str]]] = {}
+        # device_id -> time.monotonic() at which leaf_oid_cache is re-walked
+        self.leaf_oid_cache_ts: Dict[int, float] = {}
+        # device_id -> polls in a row that found the device unreachable
+        self.consecutive_failures: Dict[int, int] = {}
+        # device_id -> time.monotonic() before which the device is skipped
+        self.next_attempt: Dict[int, float] = {}
+        # Metric objects handed back by release_metrics(), reused by the
+        # next polls (deque append/pop are thread-safe)
+        self._interface_metric_pool: Deque[InterfaceMetric] = deque(maxlen=METRIC_POOL_SIZE)
+        self._health_metric_pool: Deque[DeviceHealthMetric] = deque(maxlen=METRIC_POOL_SIZE)
     
     def register_device(self, config: DeviceConfig) -> None:
         """Register a device for polling
@@ -91,9 +250,17 @@ class SNMPPoller:
                 community_string=config.community_string,
                 version=config.snmp_version,
                 port=config.snmp_port,
+                max_repetitions=config.bulk_max_repetitions,
             )
             
+            # Resolved once here instead of on every health poll
+            session.health_oids = get_health_oid_set(config.vendor_normalized)
+            session.health_request_oids = [
+                SYS_NAME_OID, SYS_UPTIME_OID, *session.health_oids.oids
+            ]
+            session.open()
             self.sessions[config.device_id] = session
+            self.sessions_by_host.setdefault(config.ip_address, []).append(session)
             self.last_poll_time[config.device_id] = {}
             
             logger.info(
@@ -105,6 +272,101 @@ class SNMPPoller:
                 f"Failed to register device {config.device_name}: {e}"
             )
     
+    def _acquire_interface_metric(self, **values: Any) -> InterfaceMetric:
+        """InterfaceMetric from the pool (or a new one) with every field set"""
+        try:
+            metric = self._interface_metric_pool.pop()
+        except IndexError:
+            return InterfaceMetric(**values)
+        for name in _INTERFACE_METRIC_FIELDS:
+            setattr(metric, name, values[name])
+        return metric
+    
+    def _acquire_health_metric(self, **values: Any) -> DeviceHealthMetric:
+        """DeviceHealthMetric from the pool (or a new one) with every field set"""
+        try:
+            metric = self._health_metric_pool.pop()
+        except IndexError:
+            return DeviceHealthMetric(**values)
+        for name in _HEALTH_METRIC_FIELDS:
+            setattr(metric, name, values[name])
+        return metric
+    
+    def release_metrics(
+        self,
+        metrics: List[Union[InterfaceMetric, DeviceHealthMetric]],
+    ) -> None:
+        """Return metrics to the pool once the caller is done with them
+        
+        Every field is overwritten when an object is reused, so released
+        metrics must no longer be referenced by the caller.
+        
+        Args:
+            metrics: Metrics returned by poll_interfaces()/poll_device_health()
+        """
+        for metric in metrics:
+            if type(metric) is InterfaceMetric:
+                self._interface_metric_pool.append(metric)
+            elif type(metric) is DeviceHealthMetric:
+                self._health_metric_pool.append(metric)
+    
+    def record_poll_result(self, device_id: int, reachable: bool) -> None:
+        """Update a device's offline backoff after it was polled
+        
+        Each poll in a row that finds the device unreachable doubles the
+        wait before the next one (2, 4, 8, ... up to MAX_OFFLINE_BACKOFF
+        seconds); a successful poll resets it.
+        
+        Args:
+            device_id: Device identifier
+            reachable: Whether the device answered
+        """
+        if reachable:
+            self.consecutive_failures.pop(device_id, None)
+            self.next_attempt.pop(device_id, None)
+            return
+        
+        failures = self.consecutive_failures.get(device_id, 0) + 1
+        self.consecutive_failures[device_id] = failures
+        self.next_attempt[device_id] = time.monotonic() + min(
+            MAX_OFFLINE_BACKOFF, 2 ** failures
+        )
+    
+    def is_backed_off(self, device_id: int) -> bool:
+        """Check whether an unreachable device should be skipped for now
+        
+        Args:
+            device_id: Device identifier
+            
+        Returns:
+            True until the device's backoff delay has passed
+        """
+        next_attempt = self.next_attempt.get(device_id)
+        return next_attempt is not None and time.monotonic() < next_attempt
+    
+    def sessions_due_for_retry(self) -> List[SNMPSession]:
+        """Sessions of unreachable devices whose backoff delay has passed
+        
+        Returns:
+            Sessions to probe before polling them again
+        """
+        now = time.monotonic()
+        return [
+            self.sessions[device_id]
+            for device_id, next_attempt in self.next_attempt.items()
+            if now >= next_attempt and device_id in self.sessions
+        ]
+    
+    def on_unregister(self, callback: Callable[[int], None]) -> None:
+        """Call callback(device_id) whenever a device is unregistered
+        
+        Lets owners of per-device state drop it together with the session.
+        
+        Args:
+            callback: Function taking the device ID
+        """
+        self._unregister_callbacks.append(callback)
+    
     def unregister_device(self, device_id: int) -> None:
         """Unregister a device
         
@@ -112,9 +374,22 @@ class SNMPPoller:
             device_id: Device identifier
         """
         if device_id in self.sessions:
-            self.sessions[device_id].close()
-            del self.sessions[device_id]
+            session = self.sessions.pop(device_id)
+            session.close()
+            host_sessions = self.sessions_by_host[session.ip_address]
+            host_sessions.remove(session)
+            if not host_sessions:
+                del self.sessions_by_host[session.ip_address]
             del self.last_poll_time[device_id]
+            self.oid_cache.pop(device_id, None)
+            self.inventory_cache.pop(device_id, None)
+            self.last_uptime_ticks.pop(device_id, None)
+            self.leaf_oid_cache.pop(device_id, None)
+            self.leaf_oid_cache_ts.pop(device_id, None)
+            self.consecutive_failures.pop(device_id, None)
+            self.next_attempt.pop(device_id, None)
+            for callback in self._unregister_callbacks:
+                callback(device_id)
             logger.info(f"Device {device_id} unregistered")
     
     def poll_interfaces(
@@ -137,58 +412,53 @@ class SNMPPoller:
         metrics = []
         
         try:
-            # Walk the interface table
-            interface_oids = oid_manager.get_interface_oids()
+            columns = self._read_interface_table(device_id, session)
             
-            # Get interface indices first
-            indices = session.walk("1.3.6.1.2.1.2.2.1.1")
+            # Union the row keys first so each ifIndex is checked and
+            # converted once, not once per column
+            indices = sorted(
+                int(index) for index in set().union(*columns.values()) if index.isdigit()
+            )
             logger.info(f"Found {len(indices)} interface indices for {session.device_name}")
             
-            # Group OIDs to fetch by index to avoid massive get_multiple calls
-            for index_oid, index_value in indices.items():
+            # Rows are read straight from the column dicts (ifIndex -> value);
+            # no per-interface dict is built
+            descrs = columns["descr"]
+            mtus = columns["mtu"]
+            speeds = columns["speed"]
+            admin_statuses = columns["admin_status"]
+            oper_statuses = columns["oper_status"]
+            in_octets = columns["in_octets"]
+            in_errors = columns["in_errors"]
+            out_octets = columns["out_octets"]
+            out_errors = columns["out_errors"]
+            
+            # One timestamp (the cycle's) shared by every interface
+            timestamp = TimeSource.now_batch()
+            for iface_idx in indices:
+                index = str(iface_idx)
                 try:
-                    # The value of ifIndex is the integer index
-                    iface_idx = int(index_value)
-                    
-                    # Instead of get_multiple for ALL interfaces, let's do it per-interface
-                    # or in small batches. Per-interface is safer for slow devices.
-                    oids_to_fetch = {
-                        "descr": "1.3.6.1.2.1.2.2.1.2." + str(iface_idx),
-                        "type": "1.3.6.1.2.1.2.2.1.3." + str(iface_idx),
-                        "mtu": "1.3.6.1.2.1.2.2.1.4." + str(iface_idx),
-                        "speed": "1.3.6.1.2.1.2.2.1.5." + str(iface_idx),
-                        "admin_status": "1.3.6.1.2.1.2.2.1.7." + str(iface_idx),
-                        "oper_status": "1.3.6.1.2.1.2.2.1.8." + str(iface_idx),
-                        "in_octets": "1.3.6.1.2.1.2.2.1.10." + str(iface_idx),
-                        "in_errors": "1.3.6.1.2.1.2.2.1.14." + str(iface_idx),
-                        "out_octets": "1.3.6.1.2.1.2.2.1.16." + str(iface_idx),
-                        "out_errors": "1.3.6.1.2.1.2.2.1.20." + str(iface_idx),
-                    }
-                    
-                    values = session.get_multiple(list(oids_to_fetch.values()))
-                    
-                    admin_status_int = safe_int(values.get(oids_to_fetch["admin_status"]), 1)
-                    oper_status_int = safe_int(values.get(oids_to_fetch["oper_status"]), 2)
+                    admin_status_int = safe_int(admin_statuses.get(index), 1)
+                    oper_status_int = safe_int(oper_statuses.get(index), 2)
                     
                     admin_status = "up" if admin_status_int == 1 else "down"
                     oper_status = "up" if oper_status_int == 1 else "down"
                     
-                    metric = InterfaceMetric(
+                    descr = descrs.get(index)
+                    metric = self._acquire_interface_metric(
                         device_id=device_id,
                         interface_index=iface_idx,
                         interface_name=f"if{iface_idx}",
-                        description=str(values.get(
-                            oids_to_fetch["descr"], f"Interface {iface_idx}"
-                        )),
+                        description=str(descr if descr is not None else f"Interface {iface_idx}"),
                         admin_status=admin_status,
                         oper_status=oper_status,
-                        speed=safe_int(values.get(oids_to_fetch["speed"])),
-                        in_octets=safe_int(values.get(oids_to_fetch["in_octets"])),
-                        out_octets=safe_int(values.get(oids_to_fetch["out_octets"])),
-                        in_errors=safe_int(values.get(oids_to_fetch["in_errors"])),
-                        out_errors=safe_int(values.get(oids_to_fetch["out_errors"])),
-                        mtu=safe_int(values.get(oids_to_fetch["mtu"]), 1500),
-                        timestamp=datetime.utcnow(),
+                        speed=safe_int(speeds.get(index)),
+                        in_octets=safe_int(in_octets.get(index)),
+                        out_octets=safe_int(out_octets.get(index)),
+                        in_errors=safe_int(in_errors.get(index)),
+                        out_errors=safe_int(out_errors.get(index)),
+                        mtu=safe_int(mtus.get(index), 1500),
+                        timestamp=timestamp,
                     )
                     
                     metrics.append(metric)
@@ -210,6 +480,115 @@ class SNMPPoller:
         
         return metrics
     
+    def _read_interface_table(
+        self,
+        device_id: int,
+        session: SNMPSession,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Read the ifTable columns for a device
+        
+        The first poll walks the table with GETBULK and caches the instance
+        OIDs it found; until the cache expires, later polls GET exactly those
+        OIDs instead of walking again. The cache is dropped when a GET fails
+        or ifNumber no longer matches the cached interface count.
+        
+        Args:
+            device_id: Device identifier
+            session: Device SNMP session
+            
+        Returns:
+            Dictionary mapping column name to {ifIndex: value}
+        """
+        columns: Dict[str, Dict[str, Any]] = {name: {} for name in IF_TABLE_COLUMNS}
+        refresh_interval = config.polling.oid_cache_refresh_interval
+        
+        cached = self.oid_cache.get(device_id)
+        if cached is not None and time.monotonic() < cached.deadline:
+            responses = session.get_many(cached.groups)
+            
+            values: Dict[str, Any] = {}
+            for response in responses:
+                values.update(response)
+            
+            if all(value is not None for value in values.values()) and (
+                safe_int(values[IF_NUMBER_OID], None) == cached.interface_count
+            ):
+                for oid, (name, index) in zip(cached.oids, cached.keys):
+                    columns[name][index] = values[oid]
+                metrics.inc("oid_cache_hits")
+                return columns
+            
+            logger.debug(f"Interface OID cache invalidated for device {device_id}")
+        self.oid_cache.pop(device_id, None)
+        metrics.inc("oid_cache_misses")
+        
+        # All ifTable columns are walked together; rows are keyed by the
+        # ifIndex suffix of each returned OID
+        table, completed = session.bulk_walk(list(IF_TABLE_COLUMNS.values()))
+        oids = []
+        keys = []
+        for name, column in IF_TABLE_COLUMNS.items():
+            columns[name] = table[column]
+            for index in table[column]:
+                oids.append(f"{column}.{index}")
+                keys.append((name, index))
+        
+        if refresh_interval > 0 and oids and completed:
+            batch_size = config.snmp.oid_batch_size
+            # Request groups and the OID -> (column, index) mapping are
+            # built here once, not on every poll that uses the cache
+            self.oid_cache[device_id] = InterfaceOidCache(
+                deadline=time.monotonic() + refresh_interval,
+                oids=oids,
+                keys=keys,
+                groups=[[IF_NUMBER_OID]] + [
+                    oids[i:i + batch_size]
+                    for i in range(0, len(oids), batch_size)
+                ],
+                interface_count=len({index for _, index in keys}),
+            )
+        
+        return columns
+    
+    def _cached_leaves(
+        self,
+        device_id: int,
+        key: str,
+        discover: Callable[[], Optional[List[str]]],
+    ) -> List[str]:
+        """Leaf OIDs of a table, walked once and then reused
+        
+        Sensor and entity indices don't move while a device runs, so the
+        OIDs found by discover() are kept for oid_cache_refresh_interval
+        seconds (0 walks every time) and read with a single GET instead.
+        A failed discovery is not cached and is retried on the next poll.
+        
+        Args:
+            device_id: Device identifier
+            key: Name of the cached OID list
+            discover: Walks the device and returns the leaf OIDs, or None
+                if the walk did not complete
+            
+        Returns:
+            Leaf OIDs (possibly empty)
+        """
+        refresh_interval = config.polling.oid_cache_refresh_interval
+        if refresh_interval <= 0:
+            return discover() or []
+        
+        now = time.monotonic()
+        if now >= self.leaf_oid_cache_ts.get(device_id, 0):
+            self.leaf_oid_cache[device_id] = {}
+            self.leaf_oid_cache_ts[device_id] = now + refresh_interval
+        
+        leaves = self.leaf_oid_cache[device_id]
+        if key not in leaves:
+            discovered = discover()
+            if discovered is None:
+                return []
+            leaves[key] = discovered
+        return leaves[key]
+    
     def poll_device_health(
         self,
         device_id: int,
@@ -231,153 +610,133 @@ class SNMPPoller:
         session = self.sessions[device_id]
         
         try:
-            # Get basic system info
-            sys_name = session.get("1.3.6.1.2.1.1.5.0")
-            uptime_ticks = session.get("1.3.6.1.2.1.1.3.0")
+            # System info and every vendor candidate OID in one GET
+            health_oids = session.health_oids or get_health_oid_set(vendor)
+            values = session.get_multiple(
+                session.health_request_oids
+                or [SYS_NAME_OID, SYS_UPTIME_OID, *health_oids.oids]
+            )
+            sys_name = values.get(SYS_NAME_OID)
+            uptime_ticks = values.get(SYS_UPTIME_OID)
             
             if uptime_ticks is None:
                 logger.warning(f"Could not get uptime for device {device_id}")
                 return None
             
-            uptime_seconds = int(int(uptime_ticks) * 0.01)  # Convert ticks to seconds
+            uptime_ticks = int(uptime_ticks)
+            self.last_uptime_ticks[device_id] = uptime_ticks
+            uptime_seconds = uptime_ticks // 100  # Convert ticks to seconds
             
-            # Get vendor-specific metrics
+            # Vendor-specific metrics
             cpu_usage = None
             memory_usage = None
             temperature = None
             
-            if vendor.lower() == "cisco":
-                # CPU OIDs to try (Table columns or indexed leaves)
-                cpu_oids = [
-                    "1.3.6.1.4.1.9.9.109.1.1.1.1.5.1", # 1-min average index 1
-                    "1.3.6.1.4.1.9.9.109.1.1.1.1.5",   # 1-min average (column)
-                    "1.3.6.1.4.1.9.2.1.58.0",           # old Cisco CPU OID
-                ]
-                for oid in cpu_oids:
-                    val = session.get(oid)
-                    cpu_usage = safe_float(val, None)
-                    if cpu_usage is not None: break
-                
-                # Memory OIDs
-                # Try Pool 1 (Processor) first
-                m_used = safe_int(session.get("1.3.6.1.4.1.9.9.48.1.1.1.5.1"), None)
-                m_free = safe_int(session.get("1.3.6.1.4.1.9.9.48.1.1.1.6.1"), None)
-                
-                # Fallback to walk if indexed get failed
-                if m_used is None or m_free is None:
-                    m_used = safe_int(session.get("1.3.6.1.4.1.9.9.48.1.1.1.5"), None)
-                    m_free = safe_int(session.get("1.3.6.1.4.1.9.9.48.1.1.1.6"), None)
+            if health_oids.oids:
+                cpu_usage, memory_usage, temperature = self._parse_health_values(
+                    health_oids, values
+                )
+            
+            if health_oids.temp_tenths and temperature is None:
+                # Try CISCO-ENTITY-SENSOR-MIB: values of the Celsius sensors.
+                # Discovery walks the type and value columns together, so its
+                # values are used directly; cached sensors are read with a GET.
+                sensor_values: Dict[str, Any] = {}
                 
-                if m_used is not None and m_free is not None:
-                    total_mem = m_used + m_free
-                    if total_mem > 0:
-                        memory_usage = (m_used / total_mem) * 100
+                def discover_sensors() -> Optional[List[str]]:
+                    table, completed = session.bulk_walk(CISCO_SENSOR_COLUMNS)
+                    if not completed:
+                        return None
+                    sensor_oids = []
+                    for index, s_type in table[CISCO_SENSOR_TYPE_OID].items():
+                        if str(s_type) == CISCO_SENSOR_CELSIUS:
+                            oid = f"{CISCO_SENSOR_VALUE_OID}.{index}"
+                            sensor_oids.append(oid)
+                            sensor_values[oid] = table[CISCO_SENSOR_VALUE_OID].get(index)
+                    return sensor_oids
                 
-                # Temperature
-                # Try common Cisco indices first
-                temp_oids = [
-                    "1.3.6.1.4.1.9.9.13.1.3.1.3.1", 
-                    "1.3.6.1.4.1.9.9.13.1.3.1.3.1004", # common for some 2960X
-                    "1.3.6.1.4.1.9.9.13.1.3.1.3.1001",
-                ]
-                for oid in temp_oids:
-                    val = session.get(oid)
-                    temperature = safe_float(val, None)
-                    if temperature is not None and temperature > 0: 
-                        # Cisco often returns temp in 10ths of degrees
-                        if temperature > 150: # Likely 10ths
+                sensor_oids = self._cached_leaves(device_id, "cisco_temp_sensors", discover_sensors)
+                if sensor_oids and not sensor_values:
+                    sensor_values = session.get_multiple(sensor_oids)
+                for oid in sensor_oids:
+                    temperature = safe_float(sensor_values.get(oid), None)
+                    if temperature is not None and temperature > 0:
+                        # Entity sensor might also be in 10ths or 1000ths
+                        if temperature > 1000:
+                            temperature = temperature / 1000.0
+                        elif temperature > 150:
                             temperature = temperature / 10.0
                         break
                 
-                # Try CISCO-ENTITY-SENSOR-MIB if still None
-                if temperature is None:
-                    sensor_types = session.walk("1.3.6.1.4.1.9.9.91.1.1.1.1.1")
-                    for s_oid, s_type in sensor_types.items():
-                        if str(s_type) == "8": # Celsius
-                            idx = s_oid.split(".")[-1]
-                            temperature = safe_float(session.get(f"1.3.6.1.4.1.9.9.91.1.1.1.1.4.{idx}"), None)
-                            if temperature is not None and temperature > 0:
-                                # Entity sensor might also be in 10ths or 1000ths
-                                if temperature > 1000:
-                                    temperature = temperature / 1000.0
-                                elif temperature > 150:
-                                    temperature = temperature / 10.0
-                                break
-                
-                # If still None, try a quick walk on old temperature table
+                # If still None, try the old temperature table
                 if temperature is None:
-                    temp_table = session.walk("1.3.6.1.4.1.9.9.13.1.3.1.3")
-                    if temp_table:
-                        for t_val in temp_table.values():
-                            if t_val and float(str(t_val)) > 0:
-                                temperature = float(str(t_val))
-                                break
+                    # The session caches the walked OIDs and reads them
+                    # with GET on later polls
+                    temp_values = session.walk(CISCO_ENV_TEMP_VALUE_OID)
+                    for t_val in temp_values.values():
+                        if t_val and float(str(t_val)) > 0:
+                            temperature = float(str(t_val))
+                            break
             
-            elif vendor.lower() == "fortinet":
-                cpu_oid = "1.3.6.1.4.1.12356.101.13.2.1.1.2"
-                mem_oid = "1.3.6.1.4.1.12356.101.13.2.1.2.1"
-                temp_oid = "1.3.6.1.4.1.12356.101.13.2.1.3.1"
-                
-                cpu_value = session.get(cpu_oid)
-                cpu_usage = safe_float(cpu_value, None)
-                
-                mem_value = session.get(mem_oid)
-                memory_usage = safe_float(mem_value, None)
+            if not health_oids.oids:
+                # Generic fallback using HOST-RESOURCES-MIB (RFC 2790). The
+                # first poll walks the processor and storage columns together
+                # and keeps the processor load OIDs plus the RAM row's size
+                # and used OIDs; later polls GET just those.
+                hr_values: Dict[str, Any] = {}
                 
-                temp_value = session.get(temp_oid)
-                temperature = safe_float(temp_value, None)
-            
-            elif vendor.lower() == "mikrotik":
-                cpu_oid = "1.3.6.1.4.1.14988.1.1.3.2"
-                mem_total_oid = "1.3.6.1.4.1.14988.1.1.3.3"
-                mem_free_oid = "1.3.6.1.4.1.14988.1.1.3.4"
+                def discover_host_resources() -> Optional[List[str]]:
+                    table, completed = session.bulk_walk(HR_HEALTH_COLUMNS)
+                    if not completed:
+                        return None
+                    leaves = []
+                    for index, load in table[HR_PROCESSOR_LOAD_OID].items():
+                        oid = f"{HR_PROCESSOR_LOAD_OID}.{index}"
+                        leaves.append(oid)
+                        hr_values[oid] = load
+                    
+                    # Memory: the hrStorageRam row
+                    ram_index = next(
+                        (
+                            index
+                            for index, storage_type in table[HR_STORAGE_TYPE_OID].items()
+                            if str(storage_type) == HR_STORAGE_RAM
+                        ),
+                        None,
+                    )
+                    if ram_index is not None:
+                        for column in (HR_STORAGE_SIZE_OID, HR_STORAGE_USED_OID):
+                            oid = f"{column}.{ram_index}"
+                            leaves.append(oid)
+                            hr_values[oid] = table[column].get(ram_index)
+                    return leaves
                 
-                cpu_value = session.get(cpu_oid)
-                cpu_usage = safe_float(cpu_value, None)
+                hr_oids = self._cached_leaves(device_id, "host_resources", discover_host_resources)
+                if hr_oids and not hr_values:
+                    hr_values = session.get_multiple(hr_oids)
                 
-                mem_total = session.get(mem_total_oid)
-                mem_free = session.get(mem_free_oid)
-                if mem_total is not None and mem_free is not None:
-                    m_total = safe_int(mem_total, None)
-                    m_free = safe_int(mem_free, None)
-                    if m_total is not None and m_free is not None and m_total > 0:
-                        used = m_total - m_free
-                        memory_usage = (used / m_total) * 100
-            
-            else:
-                # Generic fallback using HOST-RESOURCES-MIB (RFC 2790)
-                # CPU Load - Table
-                cpu_table = session.walk("1.3.6.1.2.1.25.3.3.1.2")
-                if cpu_table:
-                    loads = [float(str(v)) for v in cpu_table.values() if v]
-                    if loads:
-                        cpu_usage = sum(loads) / len(loads)
+                # CPU load: average over all processors
+                load_oids = [oid for oid in hr_oids if oid.startswith(HR_PROCESSOR_LOAD_OID)]
+                loads = [float(str(v)) for v in map(hr_values.get, load_oids) if v]
+                if loads:
+                    cpu_usage = sum(loads) / len(loads)
                 
-                # Memory - Table
-                storage_table = session.walk("1.3.6.1.2.1.25.2.3.1")
-                # Indices: .4=Units, .5=Size, .6=Used
-                # Type .2=hrStorageRam
-                ram_index = None
-                for oid, val in storage_table.items():
-                    if oid.endswith(".2") and ".1.3.6.1.2.1.25.2.3.1.2." in oid:
-                        ram_index = oid.split(".")[-1]
-                        break
-                
-                if ram_index:
-                    units = safe_int(storage_table.get(f"1.3.6.1.2.1.25.2.3.1.4.{ram_index}"), 1)
-                    size = safe_int(storage_table.get(f"1.3.6.1.2.1.25.2.3.1.5.{ram_index}"), 0)
-                    used = safe_int(storage_table.get(f"1.3.6.1.2.1.25.2.3.1.6.{ram_index}"), 0)
+                # Memory: size and used of the RAM row, after the processors
+                ram_oids = hr_oids[len(load_oids):]
+                if ram_oids:
+                    size = safe_int(hr_values.get(ram_oids[0]), 0)
+                    used = safe_int(hr_values.get(ram_oids[1]), 0)
                     if size > 0:
                         memory_usage = (used / size) * 100
             
-            metric = DeviceHealthMetric(
+            metric = self._acquire_health_metric(
                 device_id=device_id,
                 device_name=str(sys_name) if sys_name else f"Device{device_id}",
                 uptime_seconds=uptime_seconds,
                 cpu_usage=cpu_usage,
                 memory_usage=memory_usage,
                 temperature=temperature,
-                timestamp=datetime.utcnow(),
+                timestamp=TimeSource.now_batch(),
             )
             
             logger.debug(f"Polled health metrics for device {device_id}")
@@ -390,12 +749,60 @@ class SNMPPoller:
             logger.error(f"Health polling failed for device {device_id}: {e}")
             return None
     
+    def _parse_health_values(
+        self,
+        health_oids: HealthOidSet,
+        values: Dict[str, Any],
+    ) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        """Pick CPU, memory and temperature out of a health GET response
+        
+        Args:
+            health_oids: Vendor OID set the values were fetched for
+            values: OID -> value from get_multiple()
+            
+        Returns:
+            (cpu_usage, memory_usage, temperature), None where unavailable
+        """
+        def first(candidates, parse, accept=lambda v: True):
+            for oid in candidates:
+                value = parse(values.get(oid), None)
+                if value is not None and accept(value):
+                    return value
+            return None
+        
+        cpu_usage = first(health_oids.cpu, safe_float)
+        
+        memory_usage = None
+        if health_oids.mem_percent:
+            memory_usage = first(health_oids.mem_percent, safe_float)
+        else:
+            m_free = first(health_oids.mem_free, safe_int)
+            if health_oids.mem_used:
+                m_used = first(health_oids.mem_used, safe_int)
+                m_total = m_used + m_free if m_used is not None and m_free is not None else None
+            else:
+                m_total = first(health_oids.mem_total, safe_int)
+                m_used = m_total - m_free if m_total is not None and m_free is not None else None
+            if m_total:
+                memory_usage = (m_used / m_total) * 100
+        
+        temperature = first(health_oids.temp, safe_float, lambda v: v > 0)
+        # Cisco often returns temp in 10ths of degrees
+        if temperature is not None and health_oids.temp_tenths and temperature > 150:
+            temperature = temperature / 10.0
+        
+        return cpu_usage, memory_usage, temperature
+    
     def poll_inventory(
         self,
         device_id: int,
     ) -> Optional[DeviceInventory]:
         """Poll device hardware/inventory information
         
+        The last inventory is reused without any SNMP request while it is
+        younger than INVENTORY_CACHE_TTL and the device has not rebooted
+        since (sysUpTime seen by the health poll has not gone backwards).
+        
         Args:
             device_id: Device identifier
             
@@ -407,10 +814,24 @@ class SNMPPoller:
             return None
         
         session = self.sessions[device_id]
+        now = TimeSource.now_batch()
+        
+        cached = self.inventory_cache.get(device_id)
+        if cached is not None:
+            cached_uptime, cached_inventory = cached
+            uptime = self.last_uptime_ticks.get(device_id)
+            if (
+                uptime is not None
+                and uptime >= cached_uptime
+                and now - cached_inventory.timestamp < INVENTORY_CACHE_TTL
+            ):
+                logger.debug(f"Using cached inventory for device {device_id}")
+                return cached_inventory
         
         try:
-            sys_descr = session.get("1.3.6.1.2.1.1.1.0")
-            sys_name = session.get("1.3.6.1.2.1.1.5.0")
+            values = session.get_multiple(INVENTORY_OIDS)
+            sys_descr = values.get(SYS_DESCR_OID)
+            sys_name = values.get(SYS_NAME_OID)
             
             if sys_descr is None:
                 logger.warning(f"Could not get system description for device {device_id}")
@@ -424,49 +845,69 @@ class SNMPPoller:
                 firmware_version=None,
                 vendor=None,
                 model=None,
-                timestamp=datetime.utcnow(),
+                timestamp=now,
             )
             
             # Try to extract vendor from sysDescr
             sys_descr_lower = str(sys_descr).lower()
-            if "cisco" in sys_descr_lower:
-                inventory.vendor = "cisco"
+            for marker, vendor in _VENDOR_MARKERS:
+                if marker in sys_descr_lower:
+                    inventory.vendor = vendor
+                    break
+            
+            if inventory.vendor == "cisco":
+                # Cisco-specific serial number and model (ENTITY-MIB): the
+                # first non-empty entPhysicalSerialNum and entPhysicalModelName.
+                # Discovery walks both columns together, so its values are
+                # used directly; cached leaves are read with a GET.
+                entity_values: Dict[str, Any] = {}
                 
-                # Cisco-specific serial number (ENTITY-MIB)
-                # Walk entPhysicalSerialNum and pick the first non-empty
-                physical_serials = session.walk("1.3.6.1.2.1.47.1.1.1.1.11")
-                for oid, val in physical_serials.items():
-                    if val and str(val).strip():
+                def discover_entity() -> Optional[List[str]]:
+                    table, completed = session.bulk_walk(ENT_INVENTORY_COLUMNS)
+                    if not completed:
+                        return None
+                    leaves = []
+                    for column in ENT_INVENTORY_COLUMNS:
+                        for index, val in table[column].items():
+                            if val and str(val).strip():
+                                oid = f"{column}.{index}"
+                                leaves.append(oid)
+                                entity_values[oid] = val
+                                break
+                    return leaves
+                
+                leaves = self._cached_leaves(device_id, "ent_inventory_leaves", discover_entity)
+                if leaves and not entity_values:
+                    entity_values = session.get_multiple(leaves)
+                for oid in leaves:
+                    val = entity_values.get(oid)
+                    if not (val and str(val).strip()):
+                        continue
+                    if oid.startswith(ENT_PHYSICAL_SERIAL_OID + "."):
                         inventory.serial_number = str(val).strip()
-                        break
+                    else:
+                        inventory.model = str(val).strip()
                 
                 # Try to extract version from sysDescr (e.g., "Version 15.2(4)E7")
-                import re
-                version_match = re.search(r"Version ([^,\s]+)", str(sys_descr))
+                version_match = _VERSION_RE.search(str(sys_descr))
                 if version_match:
                     inventory.firmware_version = version_match.group(1)
-                
-                # Try to get model from entPhysicalModelName
-                physical_models = session.walk("1.3.6.1.2.1.47.1.1.1.1.13")
-                for oid, val in physical_models.items():
-                    if val and str(val).strip():
-                        inventory.model = str(val).strip()
-                        break
                     
-            elif "fortinet" in sys_descr_lower or "fortigate" in sys_descr_lower:
-                inventory.vendor = "fortinet"
+            elif inventory.vendor == "fortinet":
                 # Fortinet Serial
-                serial = session.get("1.3.6.1.4.1.12356.100.1.1.1.0")
+                serial = values.get(FORTINET_SERIAL_OID)
                 if serial:
                     inventory.serial_number = str(serial)
             
-            elif "mikrotik" in sys_descr_lower:
-                inventory.vendor = "mikrotik"
+            elif inventory.vendor == "mikrotik":
                 # MikroTik version
-                version = session.get("1.3.6.1.4.1.14988.1.1.4.4.0")
+                version = values.get(MIKROTIK_VERSION_OID)
                 if version:
                     inventory.firmware_version = str(version)
 
+            self.inventory_cache[device_id] = (
+                safe_int(values.get(SYS_UPTIME_OID)), inventory
+            )
             logger.info(f"Polled inventory for device {device_id}: {inventory.vendor} {inventory.model}")
             return inventory
             
@@ -486,7 +927,15 @@ class SNMPPoller:
                 logger.warning(f"Error closing session: {e}")
         
         self.sessions.clear()
+        self.sessions_by_host.clear()
         self.last_poll_time.clear()
+        self.oid_cache.clear()
+        self.inventory_cache.clear()
+        self.last_uptime_ticks.clear()
+        self.leaf_oid_cache.clear()
+        self.leaf_oid_cache_ts.clear()
+        self.consecutive_failures.clear()
+        self.next_attempt.clear()
         logger.info("All SNMP sessions closed")
     
     def __repr__(self) -> str:
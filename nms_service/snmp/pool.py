@@ -0,0 +1,101 @@
+"""Shared SNMP engines for NMS service
+
+Building an SnmpEngine (dispatcher, UDP socket, MIB view) costs far more
+than a request, so sessions borrow one instead of owning one each. pysnmp
+engines are not thread-safe: every polling thread gets its own engine and
+reuses it for all devices it polls, so the process holds one engine and one
+UDP socket per thread rather than per device.
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+from pysnmp.hlapi import CommunityData, SnmpEngine, UdpTransportTarget
+
+from nms_service.core.logger import logger
+
+
+class SNMPEnginePool:
+    """Per-thread SNMP engines plus shared transport targets and credentials"""
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._engines: List[SnmpEngine] = []
+        # (ip, port, timeout, retries) -> target with the address resolved
+        self._transports: Dict[Tuple[str, int, int, int], UdpTransportTarget] = {}
+        self._communities: Dict[str, CommunityData] = {}
+    
+    def engine(self) -> SnmpEngine:
+        """SNMP engine of the calling thread, created on first use"""
+        engine = getattr(self._local, "engine", None)
+        if engine is None:
+            engine = SnmpEngine()
+            self._local.engine = engine
+            with self._lock:
+                self._engines.append(engine)
+            logger.debug(
+                f"SNMP engine created for thread {threading.current_thread().name}"
+            )
+        return engine
+    
+    def transport(
+        self,
+        ip_address: str,
+        port: int,
+        timeout: int,
+        retries: int,
+    ) -> UdpTransportTarget:
+        """Transport target for an agent, shared by all sessions to it
+        
+        Args:
+            ip_address: Agent address (resolved once, on first use)
+            port: Agent UDP port
+            timeout: Request timeout in seconds
+            retries: Retries per request
+        
+        Returns:
+            UDP transport target
+        """
+        key = (ip_address, port, timeout, retries)
+        with self._lock:
+            target = self._transports.get(key)
+        if target is None:
+            # Name resolution happens here, outside the lock
+            target = UdpTransportTarget((ip_address, port), timeout=timeout, retries=retries)
+            with self._lock:
+                target = self._transports.setdefault(key, target)
+        return target
+    
+    def community(self, community_string: str) -> CommunityData:
+        """SNMPv2c credentials, shared by all sessions using the community"""
+        with self._lock:
+            auth = self._communities.get(community_string)
+            if auth is None:
+                auth = self._communities[community_string] = CommunityData(community_string)
+            return auth
+    
+    def shutdown(self) -> None:
+        """Close every engine and drop the cached targets
+        
+        Call once the polling threads have stopped; a later request creates
+        a fresh engine.
+        """
+        with self._lock:
+            engines, self._engines = self._engines, []
+            self._transports.clear()
+            self._communities.clear()
+            self._local = threading.local()
+        
+        for engine in engines:
+            try:
+                if engine.transportDispatcher is not None:
+                    engine.transportDispatcher.closeDispatcher()
+                    engine.unregisterTransportDispatcher()
+            except Exception as e:
+                logger.warning(f"Error closing SNMP engine: {e}")
+        logger.debug(f"Closed {len(engines)} SNMP engines")
+
+
+# Process-wide pool
+engine_pool = SNMPEnginePool()
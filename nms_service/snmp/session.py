@@ -3,9 +3,9 @@
 Provides sync and async-ready SNMP operations with graceful error handling.
 """
 
-import asyncio
-import socket
-from typing import Dict, Optional, Any, List, Tuple
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Any, List, Sequence, Tuple
 from datetime import datetime
 from pysnmp.hlapi import (
     getCmd, nextCmd, bulkCmd,
@@ -13,10 +13,94 @@ from pysnmp.hlapi import (
     CommunityData, ContextData,
     ObjectIdentity, ObjectType,
 )
+# Concurrent requests use pysnmp's asyncore API: the pinned pysnmp 4.4.12
+# asyncio API relies on asyncio.coroutine and cannot be imported on the
+# service's Python 3.11
+from pysnmp.hlapi.asyncore import getCmd as async_get_cmd
+from pysnmp.proto.errind import RequestTimedOut
+from pysnmp.proto.rfc1902 import (
+    Counter32,
+    Counter64,
+    Gauge32,
+    Integer32,
+    IpAddress,
+    OctetString,
+    TimeTicks,
+    Unsigned32,
+)
+from pysnmp.proto.rfc1905 import EndOfMibView, NoSuchInstance, NoSuchObject
 
 from nms_service.core.logger import logger
 from nms_service.core.config import config
-from nms_service.snmp.vendor_oids import oid_manager
+from nms_service.core.metrics import metrics
+from nms_service.snmp.pool import engine_pool
+from nms_service.snmp.vendor_oids import HealthOidSet, oid_manager
+
+# Upper bound on GET requests outstanding to one device in get_many()
+MAX_IN_FLIGHT_REQUESTS = 64
+
+# Default (empty) SNMP context; immutable, so shared by every request
+_CONTEXT = ContextData()
+
+# PDU error-status of a response that would exceed the message size limit
+TOO_BIG = 1
+
+# Successful bulk walks before a reduced max-repetitions is raised again
+BULK_GROW_AFTER = 3
+
+# Request varbinds kept ready for reuse (roughly 1.5 KB each)
+OBJECT_TYPE_CACHE_SIZE = 16384
+
+# Responses are requested with lookupMib=False: OIDs and values stay in
+# their numeric/raw SNMP form, which _parse_snmp_value() converts directly.
+# Resolving them against the MIB costs about 0.1 ms per varbind.
+
+
+def _pretty_print(value: Any) -> Any:
+    """Text form of an SNMP value (hex for binary strings)"""
+    return value.prettyPrint() if hasattr(value, "prettyPrint") else value
+
+
+# SNMP value type -> converter to a native value. Numbers skip the text
+# round trip; subclasses (MIB textual conventions such as DisplayString)
+# are resolved through their bases by _value_converter() and added here.
+_VALUE_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    Integer32: int,
+    Counter32: int,
+    Counter64: int,
+    Gauge32: int,
+    TimeTicks: int,
+    Unsigned32: int,
+    IpAddress: _pretty_print,
+    OctetString: _pretty_print,
+    NoSuchObject: lambda value: None,
+    NoSuchInstance: lambda value: None,
+    EndOfMibView: lambda value: None,
+}
+
+
+@lru_cache(maxsize=OBJECT_TYPE_CACHE_SIZE)
+def _object_type(oid: str) -> ObjectType:
+    """Request varbind for an OID, shared by every session
+    
+    pysnmp resolves each new ObjectType against the MIB before sending it,
+    which costs far more than the request encoding; a resolved one is
+    reused as is. OID strings don't depend on the device, so ifTable
+    instance OIDs are shared across devices too.
+    """
+    return ObjectType(ObjectIdentity(oid))
+
+
+def _value_converter(value_type: type) -> Callable[[Any], Any]:
+    """Converter of the nearest registered base of an SNMP value type"""
+    for base in value_type.__mro__:
+        converter = _VALUE_CONVERTERS.get(base)
+        if converter is not None:
+            break
+    else:
+        converter = _pretty_print
+    _VALUE_CONVERTERS[value_type] = converter
+    return converter
 
 
 class SNMPError(Exception):
@@ -52,6 +136,7 @@ class SNMPSession:
         port: int = 161,
         timeout: int = None,
         retries: int = None,
+        max_repetitions: int = None,
     ):
         """Initialize SNMP session
         
@@ -64,6 +149,8 @@ class SNMPSession:
             port: SNMP port (default 161)
             timeout: Request timeout in seconds
             retries: Number of retries for failed requests
+            max_repetitions: Upper limit of rows per GETBULK response in
+                bulk_walk()
         """
         self.device_id = device_id
         self.device_name = device_name
@@ -74,62 +161,95 @@ class SNMPSession:
         self.timeout = timeout or config.snmp.snmp_timeout
         self.retries = retries or config.snmp.snmp_retries
         
-        # Lazy initialization
-        self._engine: Optional[SnmpEngine] = None
+        # bulk_walk() rows per response: halved when the agent answers
+        # tooBig, raised again by a quarter after BULK_GROW_AFTER clean walks
+        self.bulk_max_repetitions = max_repetitions or config.snmp.bulk_max_repetitions
+        self.max_repetitions = self.bulk_max_repetitions
+        self._bulk_successes = 0
+        
+        # Shared with other sessions through engine_pool, set on first use
         self._transport: Optional[UdpTransportTarget] = None
         self._auth: Optional[CommunityData] = None
+        
+        # Vendor health OIDs and the full health GET request (system info
+        # plus vendor OIDs), set by SNMPPoller.register_device()
+        self.health_oids: Optional[HealthOidSet] = None
+        self.health_request_oids: List[str] = []
+        
+        # walk() root OID -> (monotonic time of the walk, OIDs it returned)
+        self._oid_cache: Dict[str, Tuple[float, List[str]]] = {}
     
-    def _validate_connectivity(self) -> bool:
-        """Test basic connectivity to device (UDP check is limited, so we skip TCP check)"""
-        # SNMP uses UDP, so TCP connect check is inappropriate and fails on most devices.
-        # We'll let the actual SNMP GET handle the timeout.
-        return True
+    @property
+    def _engine(self) -> SnmpEngine:
+        """SNMP engine of the calling thread, shared with other sessions"""
+        return engine_pool.engine()
     
     def _init_snmp_engine(self) -> None:
-        """Initialize SNMP engine and transport"""
-        if self._engine is not None:
+        """Look up the shared transport and credentials of the device"""
+        if self._auth is not None:
             return
         
         try:
-            self._engine = SnmpEngine()
-            self._transport = UdpTransportTarget(
-                (self.ip_address, self.port),
-                timeout=self.timeout,
-                retries=self.retries
+            self._transport = engine_pool.transport(
+                self.ip_address,
+                self.port,
+                self.timeout,
+                self.retries,
             )
             
-            logger.debug(f"Initializing SNMP engine with version: '{self.version}'")
+            logger.debug("Initializing SNMP engine with version: '%s'", self.version)
             
             if self.version in ["2c", "v2c"]:
-                self._auth = CommunityData(self.community_string)
+                self._auth = engine_pool.community(self.community_string)
             else:
                 # TODO: Implement SNMP v3 authentication
                 raise NotImplementedError(f"SNMP version '{self.version}' not yet implemented")
             
             logger.debug(
-                f"SNMP engine initialized for {self.device_name} "
-                f"({self.ip_address})"
+                "SNMP engine initialized for %s (%s)",
+                self.device_name, self.ip_address,
             )
         except Exception as e:
-            logger.error(f"Failed to initialize SNMP engine: {e}")
+            logger.error("Failed to initialize SNMP engine: %s", e)
             raise SNMPError(f"SNMP initialization failed: {e}")
     
+    def _count_request(self, error_indication: Any) -> None:
+        """Record one request in the service metrics
+        
+        A request that timed out has used up all of its retries.
+        """
+        metrics.inc("snmp_pdus_sent")
+        if isinstance(error_indication, RequestTimedOut):
+            metrics.inc("snmp_retries", self.retries)
+    
+    def open(self) -> bool:
+        """Set up the SNMP transport now instead of on first use
+        
+        Resolves the device address and looks up the shared credentials, so
+        the first poll only pays for its own requests. No packet is sent.
+        
+        Returns:
+            True if the session is ready
+        """
+        try:
+            self._init_snmp_engine()
+            return True
+        except SNMPError as e:
+            logger.warning("SNMP session for %s not ready: %s", self.device_name, e)
+            return False
+    
     def _parse_snmp_value(self, value: Any) -> Any:
-        """Convert pysnmp value to native Python type"""
+        """Convert pysnmp value to native Python type
+        
+        Numeric types become int, strings and addresses their text, and
+        noSuchObject/noSuchInstance/endOfMibView None.
+        """
         try:
-            if hasattr(value, 'prettyPrint'):
-                value_str = value.prettyPrint()
-                
-                # Try to convert to numeric types
-                if value_str.isdigit():
-                    return int(value_str)
-                try:
-                    return float(value_str)
-                except ValueError:
-                    return value_str
-            return value
+            value_type = type(value)
+            converter = _VALUE_CONVERTERS.get(value_type) or _value_converter(value_type)
+            return converter(value)
         except Exception as e:
-            logger.warning(f"Failed to parse SNMP value: {e}")
+            logger.warning("Failed to parse SNMP value: %s", e)
             return str(value)
     
     def get(self, oid: str) -> Optional[Any]:
@@ -141,11 +261,6 @@ class SNMPSession:
         Returns:
             Value or None if failed
         """
-        if not self._validate_connectivity():
-            raise SNMPDeviceUnreachable(
-                f"Device {self.device_name} ({self.ip_address}) is unreachable"
-            )
-        
         try:
             self._init_snmp_engine()
             
@@ -154,22 +269,22 @@ class SNMPSession:
                     self._engine,
                     self._auth,
                     self._transport,
-                    ContextData(),
-                    ObjectType(ObjectIdentity(oid))
+                    _CONTEXT,
+                    _object_type(oid),
+                    lookupMib=False,
                 )
             )
+            self._count_request(error_indication)
             
             if error_indication:
                 logger.error(
-                    f"SNMP get error for {self.device_name}: "
-                    f"{error_indication}"
+                    "SNMP get error for %s: %s", self.device_name, error_indication
                 )
                 raise SNMPError(f"SNMP get failed: {error_indication}")
             
             if error_status:
                 logger.warning(
-                    f"SNMP error status for {self.device_name}: "
-                    f"{error_status}"
+                    "SNMP error status for %s: %s", self.device_name, error_status
                 )
                 return None
             
@@ -179,27 +294,31 @@ class SNMPSession:
             
             return None
             
-        except SNMPDeviceUnreachable:
-            raise
         except Exception as e:
-            logger.error(
-                f"SNMP get operation failed for {self.device_name}: {e}"
-            )
+            logger.error("SNMP get operation failed for %s: %s", self.device_name, e)
             raise SNMPError(f"SNMP operation failed: {e}")
     
-    def get_multiple(self, oids: List[str]) -> Dict[str, Optional[Any]]:
+    def get_multiple(self, oids: Sequence[str]) -> Dict[str, Optional[Any]]:
         """Get multiple OID values in a single request
         
+        More than oid_batch_size OIDs are split into several requests, sent
+        concurrently with get_many(), so each PDU stays within the agent's
+        message size; a failed request only leaves its own OIDs at None.
+        
         Args:
             oids: List of OIDs to retrieve
             
         Returns:
             Dictionary mapping OID to value
         """
-        if not self._validate_connectivity():
-            raise SNMPDeviceUnreachable(
-                f"Device {self.device_name} ({self.ip_address}) is unreachable"
-            )
+        batch_size = config.snmp.oid_batch_size
+        if len(oids) > batch_size:
+            results: Dict[str, Optional[Any]] = {}
+            for values in self.get_many(
+                [oids[i:i + batch_size] for i in range(0, len(oids), batch_size)]
+            ):
+                results.update(values)
+            return results
         
         try:
             self._init_snmp_engine()
@@ -209,24 +328,24 @@ class SNMPSession:
                     self._engine,
                     self._auth,
                     self._transport,
-                    ContextData(),
-                    *[ObjectType(ObjectIdentity(oid)) for oid in oids]
+                    _CONTEXT,
+                    *[_object_type(oid) for oid in oids],
+                    lookupMib=False,
                 )
             )
+            self._count_request(error_indication)
             
             results = {oid: None for oid in oids}
             
             if error_indication:
                 logger.error(
-                    f"SNMP get_multiple error for {self.device_name}: "
-                    f"{error_indication}"
+                    "SNMP get_multiple error for %s: %s", self.device_name, error_indication
                 )
                 return results
             
             if error_status:
                 logger.warning(
-                    f"SNMP error status for {self.device_name}: "
-                    f"{error_status}"
+                    "SNMP error status for %s: %s", self.device_name, error_status
                 )
                 return results
             
@@ -237,29 +356,131 @@ class SNMPSession:
             
             return results
             
-        except SNMPDeviceUnreachable:
-            raise
         except Exception as e:
             logger.error(
-                f"SNMP get_multiple operation failed for {self.device_name}: {e}"
+                "SNMP get_multiple operation failed for %s: %s", self.device_name, e
             )
             return {oid: None for oid in oids}
     
-    def walk(self, oid: str) -> Dict[str, Any]:
+    def get_many(
+        self,
+        oid_groups: List[List[str]],
+        max_in_flight: int = MAX_IN_FLIGHT_REQUESTS,
+    ) -> List[Dict[str, Optional[Any]]]:
+        """Get several OID groups with concurrent GET requests
+        
+        Sends one GET per group. Up to max_in_flight requests are outstanding
+        at once on the session's SNMP engine, so the total time is roughly
+        len(oid_groups) / max_in_flight round trips instead of one per group.
+        
+        Args:
+            oid_groups: OID lists, one GET request each
+            max_in_flight: Maximum concurrent requests
+            
+        Returns:
+            Dictionary mapping OID to value (None if failed) for each group,
+            in order
+        """
+        results = [{oid: None for oid in oids} for oids in oid_groups]
+        pending = iter(enumerate(oid_groups))
+        errors: List[Any] = []
+        
+        def send_next() -> None:
+            item = next(pending, None)
+            if item is None:
+                return
+            index, oids = item
+            async_get_cmd(
+                self._engine,
+                self._auth,
+                self._transport,
+                _CONTEXT,
+                *[_object_type(oid) for oid in oids],
+                lookupMib=False,
+                cbFun=on_response,
+                cbCtx=index,
+            )
+        
+        def on_response(snmp_engine, send_request_handle, error_indication,
+                        error_status, error_index, var_binds, index) -> None:
+            self._count_request(error_indication)
+            if error_indication or error_status:
+                errors.append(error_indication or error_status)
+            else:
+                for name, value in var_binds:
+                    results[index][str(name)] = self._parse_snmp_value(value)
+            # Keep the window full
+            send_next()
+        
+        try:
+            self._init_snmp_engine()
+            
+            for _ in range(max_in_flight):
+                send_next()
+            self._engine.transportDispatcher.runDispatcher()
+            
+            if errors:
+                logger.warning(
+                    "SNMP get_many: %d/%d requests failed for %s: %s",
+                    len(errors), len(oid_groups), self.device_name, errors[0],
+                )
+            return results
+            
+        except Exception as e:
+            logger.error(
+                "SNMP get_many operation failed for %s: %s", self.device_name, e
+            )
+            return results
+    
+    def _get_cached_walk(self, oid: str) -> Optional[Dict[str, Any]]:
+        """Read the OIDs found by an earlier walk of a subtree with GET
+        
+        Args:
+            oid: Root OID of the walk
+            
+        Returns:
+            Dictionary mapping OIDs to values, or None if there is no fresh
+            cache entry or one of the OIDs no longer exists
+        """
+        refresh_interval = config.polling.oid_cache_refresh_interval
+        entry = self._oid_cache.get(oid)
+        if refresh_interval <= 0 or entry is None:
+            return None
+        
+        walked_at, oids = entry
+        if time.monotonic() - walked_at >= refresh_interval:
+            return None
+        
+        results = self.get_multiple(oids) if oids else {}
+        
+        # A missing value (noSuchName, noSuchInstance or a failed request)
+        # means the subtree changed or can't be trusted; walk it again
+        if any(value is None for value in results.values()):
+            del self._oid_cache[oid]
+            return None
+        return results
+    
+    def walk(self, oid: str, use_cache: bool = True) -> Dict[str, Any]:
         """Walk OID subtree (synchronous bulk operation)
         
+        The OIDs found are remembered for oid_cache_refresh_interval
+        seconds; until then the same OIDs are read with batched GETs
+        instead of walking the subtree again.
+        
         Args:
             oid: Root OID to walk
+            use_cache: Read and update the walk cache
             
         Returns:
             Dictionary mapping OIDs to values
         """
-        if not self._validate_connectivity():
-            raise SNMPDeviceUnreachable(
-                f"Device {self.device_name} ({self.ip_address}) is unreachable"
-            )
+        if use_cache:
+            cached = self._get_cached_walk(oid)
+            if cached is not None:
+                return cached
         
         results = {}
+        completed = False
         
         try:
             self._init_snmp_engine()
@@ -272,32 +493,34 @@ class SNMPSession:
                     self._engine,
                     self._auth,
                     self._transport,
-                    ContextData(),
+                    _CONTEXT,
                     0,  # nonRepeaters
                     25,  # maxRepetitions
-                    ObjectType(ObjectIdentity(oid))
+                    _object_type(oid),
+                    lookupMib=False,
                 )
             else:
                 iterator = nextCmd(
                     self._engine,
                     self._auth,
                     self._transport,
-                    ContextData(),
-                    ObjectType(ObjectIdentity(oid))
+                    _CONTEXT,
+                    _object_type(oid),
+                    lookupMib=False,
                 )
             
             for error_indication, error_status, error_index, var_binds in iterator:
+                self._count_request(error_indication)
                 if error_indication:
                     logger.warning(
-                        f"SNMP walk error for {self.device_name}: "
-                        f"{error_indication}"
+                        "SNMP walk error for %s: %s", self.device_name, error_indication
                     )
                     break
                 
                 if error_status:
                     logger.warning(
-                        f"SNMP error status during walk for {self.device_name}: "
-                        f"{error_status}"
+                        "SNMP error status during walk for %s: %s",
+                        self.device_name, error_status,
                     )
                     break
                 
@@ -311,35 +534,143 @@ class SNMPSession:
                     results[oid_str] = self._parse_snmp_value(value)
                 
                 if stop_walk:
+                    completed = True
                     break
+            else:
+                completed = True
             
             logger.debug(
-                f"SNMP walk completed for {self.device_name}, "
-                f"collected {len(results)} OIDs"
+                "SNMP walk completed for %s, collected %d OIDs",
+                self.device_name, len(results),
             )
             
+            # A walk cut short by an error would hide the subtree until the
+            # next refresh, so only a finished one is cached
+            if completed and use_cache and config.polling.oid_cache_refresh_interval > 0:
+                self._oid_cache[oid] = (time.monotonic(), list(results))
+            
             return results
             
-        except SNMPDeviceUnreachable:
-            raise
+        except Exception as e:
+            logger.error("SNMP walk operation failed for %s: %s", self.device_name, e)
+            return results
+    
+    def bulk_walk(
+        self,
+        columns: Sequence[str],
+        max_repetitions: Optional[int] = None,
+    ) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+        """Walk several table columns together with GETBULK
+        
+        Each request carries one varbind per column, so a table of N rows
+        takes about N / max_repetitions round trips for all columns.
+        
+        Without an explicit max_repetitions the session's tuned value is
+        used: a tooBig response halves it and restarts the walk, and it
+        grows back towards bulk_max_repetitions after successful walks.
+        
+        Args:
+            columns: Column OIDs to walk (e.g. ifTable columns)
+            max_repetitions: Rows returned per GETBULK response (default:
+                the session's tuned value)
+        
+        Returns:
+            Tuple of a dictionary mapping each column OID to {row index:
+            value}, where the row index is the OID suffix after the column
+            (e.g. "3"), and whether the walk reached the end of every column.
+            A walk stopped by a timeout or an error returns the rows read so
+            far and False.
+        """
+        results: Dict[str, Dict[str, Any]] = {column: {} for column in columns}
+        prefixes = [tuple(int(x) for x in column.split(".")) for column in columns]
+        tuned = max_repetitions is None
+        repetitions = self.max_repetitions if tuned else max_repetitions
+        completed = False
+        
+        try:
+            self._init_snmp_engine()
+            
+            iterator = bulkCmd(
+                self._engine,
+                self._auth,
+                self._transport,
+                _CONTEXT,
+                0,  # nonRepeaters
+                repetitions,
+                *[_object_type(column) for column in columns],
+                # Stop each column at the end of its own subtree
+                lexicographicMode=False,
+                lookupMib=False,
+            )
+            
+            for error_indication, error_status, error_index, var_binds in iterator:
+                self._count_request(error_indication)
+                if error_indication:
+                    logger.warning(
+                        "SNMP bulk walk error for %s: %s", self.device_name, error_indication
+                    )
+                    break
+                
+                if error_status:
+                    if tuned and int(error_status) == TOO_BIG and repetitions > 1:
+                        self.max_repetitions = repetitions // 2
+                        self._bulk_successes = 0
+                        logger.debug(
+                            "GETBULK response too big for %s, retrying with "
+                            "max-repetitions %d",
+                            self.device_name, self.max_repetitions,
+                        )
+                        return self.bulk_walk(columns)
+                    
+                    logger.warning(
+                        "SNMP error status during bulk walk for %s: %s",
+                        self.device_name, error_status,
+                    )
+                    break
+                
+                # var_binds line up with the requested columns; a column
+                # that has run out is padded with endOfMibView
+                for column, prefix, (name, value) in zip(columns, prefixes, var_binds):
+                    if isinstance(value, EndOfMibView):
+                        continue
+                    suffix = tuple(name)[len(prefix):]
+                    # Table rows are nearly always indexed by one sub-identifier
+                    index = str(suffix[0]) if len(suffix) == 1 else ".".join(map(str, suffix))
+                    results[column][index] = self._parse_snmp_value(value)
+            else:
+                completed = True
+            
+            if tuned and completed and self.max_repetitions < self.bulk_max_repetitions:
+                self._bulk_successes += 1
+                if self._bulk_successes >= BULK_GROW_AFTER:
+                    self.max_repetitions = min(
+                        self.bulk_max_repetitions,
+                        max(self.max_repetitions + 1, self.max_repetitions * 5 // 4),
+                    )
+                    self._bulk_successes = 0
+            
+            logger.debug(
+                "SNMP bulk walk completed for %s, collected %d OIDs",
+                self.device_name, sum(len(rows) for rows in results.values()),
+            )
+            
+            return results, completed
+        
         except Exception as e:
             logger.error(
-                f"SNMP walk operation failed for {self.device_name}: {e}"
+                "SNMP bulk walk operation failed for %s: %s", self.device_name, e
             )
-            return results
+            return results, False
     
     def close(self) -> None:
-        """Close SNMP session"""
-        if self._engine:
-            try:
-                self._engine.closeDispatcher()
-                logger.debug(f"SNMP session closed for {self.device_name}")
-            except Exception as e:
-                logger.warning(f"Error closing SNMP session: {e}")
-            finally:
-                self._engine = None
-                self._transport = None
-                self._auth = None
+        """Close SNMP session
+        
+        The shared engines stay open; engine_pool.shutdown() closes them.
+        """
+        if self._auth is not None:
+            self._transport = None
+            self._auth = None
+            logger.debug("SNMP session closed for %s", self.device_name)
     
     def __repr__(self) -> str:
         return (
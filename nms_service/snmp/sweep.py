@@ -0,0 +1,81 @@
+"""Reachability sweep for NMS service
+
+Probes many devices at once with one sysUpTime.0 GET each, all in flight
+together on the calling thread's SNMP engine. A device that doesn't answer
+costs one short timeout shared by the whole sweep instead of a full poll
+(snmp_timeout x retries per request) on a worker thread.
+"""
+
+from typing import Any, Dict, Sequence
+
+from pysnmp.hlapi import ContextData, ObjectIdentity, ObjectType
+from pysnmp.hlapi.asyncore import getCmd as async_get_cmd
+
+from nms_service.core.logger import logger
+from nms_service.core.metrics import metrics
+from nms_service.snmp.pool import engine_pool
+from nms_service.snmp.session import SNMPSession
+
+# SNMPv2-MIB sysUpTime.0, answered by every agent
+SWEEP_OID = "1.3.6.1.2.1.1.3.0"
+
+# Seconds to wait for the probes; they are not retried
+SWEEP_TIMEOUT = 1.0
+
+_CONTEXT = ContextData()
+_SWEEP_VARBIND = ObjectType(ObjectIdentity(SWEEP_OID))
+
+
+def sweep_reachability(
+    sessions: Sequence[SNMPSession],
+    timeout: float = SWEEP_TIMEOUT,
+) -> Dict[int, bool]:
+    """Check which devices answer SNMP, probing all of them concurrently
+
+    Args:
+        sessions: SNMP sessions of the devices to probe
+        timeout: Seconds to wait for each answer
+
+    Returns:
+        Dictionary mapping device ID to whether the device answered.
+        Devices that can't be probed (SNMPv3) are reported reachable so
+        that their regular poll decides.
+    """
+    results: Dict[int, bool] = {}
+
+    def on_response(snmp_engine, send_request_handle, error_indication,
+                    error_status, error_index, var_binds, device_id: Any) -> None:
+        results[device_id] = not error_indication and not error_status
+
+    try:
+        engine = engine_pool.engine()
+        for session in sessions:
+            if session.version not in ["2c", "v2c"]:
+                results[session.device_id] = True
+                continue
+            results[session.device_id] = False
+            try:
+                async_get_cmd(
+                    engine,
+                    engine_pool.community(session.community_string),
+                    engine_pool.transport(session.ip_address, session.port, timeout, 0),
+                    _CONTEXT,
+                    _SWEEP_VARBIND,
+                    lookupMib=False,
+                    cbFun=on_response,
+                    cbCtx=session.device_id,
+                )
+                metrics.inc("snmp_pdus_sent")
+            except Exception as e:
+                logger.warning(f"Cannot probe {session.device_name}: {e}")
+        engine.transportDispatcher.runDispatcher()
+
+    except Exception as e:
+        logger.error(f"Reachability sweep failed: {e}")
+        # Let the regular polls decide
+        return {session.device_id: True for session in sessions}
+
+    logger.debug(
+        f"Reachability sweep: {sum(results.values())}/{len(results)} devices answered"
+    )
+    return results
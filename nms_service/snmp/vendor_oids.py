@@ -9,13 +9,15 @@ Maps OIDs to human-readable metric names. Supports multiple vendors:
 Adding a new vendor requires editing only this file.
 """
 
-import json
 from pathlib import Path
-from typing import Dict, Optional, List, Any
-from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import Dict, Optional, List, Any, Mapping, Tuple
+from dataclasses import dataclass, asdict, field
 
+from nms_service.core import serde
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class OIDMapping:
     """OID mapping configuration"""
     oid: str
@@ -27,6 +29,67 @@ class OIDMapping:
     conversion_factor: float = 1.0  # For unit conversion (e.g., ticks to seconds)
 
 
+@dataclass(frozen=True)
+class HealthOidSet:
+    """Health OIDs of one vendor, fetched together in one GET
+    
+    Each metric lists candidate instance OIDs in order of preference; the
+    first one that returns a usable value wins.
+    """
+    cpu: Tuple[str, ...] = ()
+    mem_used: Tuple[str, ...] = ()
+    mem_free: Tuple[str, ...] = ()
+    mem_total: Tuple[str, ...] = ()
+    mem_percent: Tuple[str, ...] = ()  # memory usage reported directly in %
+    temp: Tuple[str, ...] = ()
+    temp_tenths: bool = False  # readings above 150 are in tenths of a degree
+    oids: Tuple[str, ...] = field(init=False)
+    
+    def __post_init__(self):
+        # Every candidate, in one list for get_multiple()
+        object.__setattr__(self, "oids", tuple(dict.fromkeys(
+            self.cpu + self.mem_used + self.mem_free
+            + self.mem_total + self.mem_percent + self.temp
+        )))
+
+
+# No vendor OIDs: health comes from HOST-RESOURCES-MIB walks
+GENERIC_HEALTH_OIDS = HealthOidSet()
+
+VENDOR_HEALTH_OIDS: Dict[str, HealthOidSet] = {
+    "cisco": HealthOidSet(
+        cpu=(
+            "1.3.6.1.4.1.9.9.109.1.1.1.1.5.1",  # cpmCPUTotal1min, index 1
+            "1.3.6.1.4.1.9.2.1.58.0",           # old Cisco CPU OID
+        ),
+        # ciscoMemoryPool, pool 1 (processor)
+        mem_used=("1.3.6.1.4.1.9.9.48.1.1.1.5.1",),
+        mem_free=("1.3.6.1.4.1.9.9.48.1.1.1.6.1",),
+        temp=(
+            "1.3.6.1.4.1.9.9.13.1.3.1.3.1",
+            "1.3.6.1.4.1.9.9.13.1.3.1.3.1004",  # common for some 2960X
+            "1.3.6.1.4.1.9.9.13.1.3.1.3.1001",
+        ),
+        temp_tenths=True,
+    ),
+    "fortinet": HealthOidSet(
+        cpu=("1.3.6.1.4.1.12356.101.13.2.1.1.2",),
+        mem_percent=("1.3.6.1.4.1.12356.101.13.2.1.2.1",),
+        temp=("1.3.6.1.4.1.12356.101.13.2.1.3.1",),
+    ),
+    "mikrotik": HealthOidSet(
+        cpu=("1.3.6.1.4.1.14988.1.1.3.2",),
+        mem_total=("1.3.6.1.4.1.14988.1.1.3.3",),
+        mem_free=("1.3.6.1.4.1.14988.1.1.3.4",),
+    ),
+}
+
+
+def get_health_oid_set(vendor: str) -> HealthOidSet:
+    """Health OID set for a vendor (generic for unknown vendors)"""
+    return VENDOR_HEALTH_OIDS.get(vendor.lower(), GENERIC_HEALTH_OIDS)
+
+
 class VendorOIDManager:
     """Manage vendor-specific and generic OID mappings"""
     
@@ -232,22 +295,74 @@ class VendorOIDManager:
         ),
     }
     
+    # The built-in tables are read-only; every manager shares the merged
+    # maps, built once when the class is loaded
+    GENERIC_OIDS = MappingProxyType(GENERIC_OIDS)
+    CISCO_OIDS = MappingProxyType(CISCO_OIDS)
+    FORTINET_OIDS = MappingProxyType(FORTINET_OIDS)
+    MIKROTIK_OIDS = MappingProxyType(MIKROTIK_OIDS)
+    _BUILTIN_OIDS = MappingProxyType({
+        **GENERIC_OIDS, **CISCO_OIDS, **FORTINET_OIDS, **MIKROTIK_OIDS,
+    })
+    _BUILTIN_NAME_TO_OID = MappingProxyType({
+        mapping.name: oid for oid, mapping in _BUILTIN_OIDS.items()
+    })
+    
     def __init__(self):
         """Initialize OID manager with all vendor mappings"""
-        self._oid_map: Dict[str, OIDMapping] = {}
-        self._name_to_oid: Dict[str, str] = {}
+        self._set_mappings(self._BUILTIN_OIDS, self._BUILTIN_NAME_TO_OID)
+    
+    def _set_mappings(
+        self,
+        oid_map: Mapping[str, OIDMapping],
+        name_to_oid: Mapping[str, str],
+    ) -> None:
+        """Install a mapping set and rebuild everything derived from it"""
+        self._oid_map = oid_map
+        self._name_to_oid = name_to_oid
         
-        # Load all vendors
-        self._register_oids(self.GENERIC_OIDS)
-        self._register_oids(self.CISCO_OIDS)
-        self._register_oids(self.FORTINET_OIDS)
-        self._register_oids(self.MIKROTIK_OIDS)
+        # Read-only views of the maps above, for hot paths that look up
+        # mappings directly instead of through the getters
+        self.mapping_by_oid: Mapping[str, OIDMapping] = MappingProxyType(oid_map)
+        self.name_to_oid: Mapping[str, str] = MappingProxyType(name_to_oid)
+        self._build_indexes()
     
-    def _register_oids(self, oid_dict: Dict[str, OIDMapping]) -> None:
-        """Register OID mappings"""
-        for oid, mapping in oid_dict.items():
-            self._oid_map[oid] = mapping
-            self._name_to_oid[mapping.name] = oid
+    def _build_indexes(self) -> None:
+        """Group the mappings by vendor and kind once, after loading"""
+        # Serialized forms of the mappings, built by to_json() and
+        # to_json_bytes() on demand
+        self._json_cache: Optional[str] = None
+        self._json_bytes_cache: Optional[bytes] = None
+        
+        by_vendor: Dict[Optional[str], Dict[str, OIDMapping]] = {}
+        for oid, mapping in self._oid_map.items():
+            by_vendor.setdefault(mapping.vendor, {})[oid] = mapping
+        
+        generic = by_vendor.get("generic", {})
+        self._interface_oids = {
+            k: v for k, v in generic.items() if "if" in v.name.lower()
+        }
+        self._health_by_vendor: Dict[Optional[str], Dict[str, OIDMapping]] = {
+            vendor: {
+                k: v for k, v in mappings.items()
+                if any(x in v.name.lower() for x in ["cpu", "mem", "temp"])
+            }
+            for vendor, mappings in by_vendor.items()
+        }
+        # Vendor OIDs plus the generic ones
+        self._all_by_vendor: Dict[Optional[str], Dict[str, OIDMapping]] = {
+            vendor: {**generic, **mappings} for vendor, mappings in by_vendor.items()
+        }
+        self._generic_oids = generic
+        
+        # OID prefix trie: one level per sub-identifier, the mapping of a
+        # registered OID stored under the None key of its node
+        self._oid_trie: Dict[Optional[str], Any] = {}
+        for oid, mapping in self._oid_map.items():
+            node = self._oid_trie
+            for part in oid.split("."):
+                node = node.setdefault(part, {})
+            node[None] = mapping
     
     def get_oid_by_name(self, name: str) -> Optional[str]:
         """Get OID by metric name"""
@@ -259,56 +374,76 @@ class VendorOIDManager:
     
     def get_mapping_by_name(self, name: str) -> Optional[OIDMapping]:
         """Get OID mapping by metric name"""
-        oid = self.get_oid_by_name(name)
+        oid = self._name_to_oid.get(name)
         return self._oid_map.get(oid) if oid else None
     
+    def resolve(self, oid: str) -> Tuple[Optional[OIDMapping], Optional[str]]:
+        """Find the mapping of an OID returned by a walk
+        
+        Table cells (e.g. ifInOctets.5) match their column's mapping by
+        longest prefix, in one pass over the OID's sub-identifiers.
+        
+        Args:
+            oid: Numeric OID
+            
+        Returns:
+            (mapping, row index suffix), e.g. (ifInOctets, "5"); the suffix
+            is "" for an exact match and both are None without a match
+        """
+        exact = self._oid_map.get(oid)
+        if exact is not None:
+            return exact, ""
+        
+        parts = oid.split(".")
+        node = self._oid_trie
+        match: Tuple[Optional[OIDMapping], Optional[str]] = (None, None)
+        for depth, part in enumerate(parts):
+            node = node.get(part)
+            if node is None:
+                break
+            mapping = node.get(None)
+            if mapping is not None:
+                match = (mapping, ".".join(parts[depth + 1:]))
+        return match
+    
     def get_interface_oids(self) -> Dict[str, OIDMapping]:
         """Get all interface-related OIDs (generic)"""
-        return {
-            k: v for k, v in self._oid_map.items()
-            if "if" in v.name.lower() and v.vendor == "generic"
-        }
+        return self._interface_oids
     
     def get_health_oids_for_vendor(self, vendor: str) -> Dict[str, OIDMapping]:
         """Get health/resource OIDs for specific vendor"""
-        vendor_lower = vendor.lower()
-        return {
-            k: v for k, v in self._oid_map.items()
-            if v.vendor == vendor_lower and any(
-                x in v.name.lower() for x in ["cpu", "mem", "temp"]
-            )
-        }
+        return self._health_by_vendor.get(vendor.lower(), {})
     
     def get_all_oids_for_vendor(self, vendor: str) -> Dict[str, OIDMapping]:
         """Get all OIDs available for a vendor"""
-        vendor_lower = vendor.lower()
-        return {
-            k: v for k, v in self._oid_map.items()
-            if v.vendor == vendor_lower or v.vendor == "generic"
-        }
+        return self._all_by_vendor.get(vendor.lower(), self._generic_oids)
     
     def to_json(self, output_path: Optional[Path] = None) -> str:
-        """Serialize OID mappings to JSON"""
-        oid_dicts = {
-            oid: {
-                "oid": mapping.oid,
-                "name": mapping.name,
-                "description": mapping.description,
-                "metric_type": mapping.metric_type,
-                "unit": mapping.unit,
-                "vendor": mapping.vendor,
-                "conversion_factor": mapping.conversion_factor,
-            }
-            for oid, mapping in self._oid_map.items()
-        }
+        """Serialize OID mappings to JSON
         
-        json_str = json.dumps(oid_dicts, indent=2)
+        The mappings don't change after loading, so the encoded document is
+        built once and reused.
+        """
+        if self._json_cache is None:
+            # OIDMapping dataclasses serialize field-by-field
+            self._json_cache = serde.dumps(dict(self._oid_map), indent=True).decode()
+        json_str = self._json_cache
         
         if output_path:
             Path(output_path).write_text(json_str)
         
         return json_str
     
+    def to_json_bytes(self) -> bytes:
+        """Serialize OID mappings to compact JSON for sending over the wire
+        
+        Unlike to_json() the document is not indented and stays UTF-8
+        bytes, ready for an HTTP body; it is also built once and reused.
+        """
+        if self._json_bytes_cache is None:
+            self._json_bytes_cache = serde.dumps(dict(self._oid_map))
+        return self._json_bytes_cache
+    
     @classmethod
     def from_json(cls, json_path: Path) -> "VendorOIDManager":
         """Load OID mappings from JSON file"""
@@ -317,9 +452,9 @@ class VendorOIDManager:
         if not json_path.exists():
             return manager
         
-        data = json.loads(json_path.read_text())
-        manager._oid_map.clear()
-        manager._name_to_oid.clear()
+        data = serde.load_file(json_path)
+        oid_map: Dict[str, OIDMapping] = {}
+        name_to_oid: Dict[str, str] = {}
         
         for oid, config in data.items():
             mapping = OIDMapping(
@@ -331,9 +466,10 @@ class VendorOIDManager:
                 vendor=config.get("vendor"),
                 conversion_factor=config.get("conversion_factor", 1.0),
             )
-            manager._oid_map[oid] = mapping
-            manager._name_to_oid[mapping.name] = oid
+            oid_map[oid] = mapping
+            name_to_oid[mapping.name] = oid
         
+        manager._set_mappings(oid_map, name_to_oid)
         return manager
 
 
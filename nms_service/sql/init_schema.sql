@@ -22,7 +22,7 @@ CREATE TABLE IF NOT EXISTS alarms (
     device_id INTEGER NOT NULL REFERENCES devices(id) ON DELETE CASCADE,
     device_name VARCHAR(255),
     type VARCHAR(50) NOT NULL,
-    severity VARCHAR(20) NOT NULL,
+    severity VARCHAR(16) NOT NULL CONSTRAINT ck_alarm_severity CHECK (severity IN ('info', 'warning', 'critical')),
     message TEXT NOT NULL,
     acknowledged BOOLEAN DEFAULT FALSE,
     acknowledged_at TIMESTAMP,
@@ -33,43 +33,53 @@ CREATE TABLE IF NOT EXISTS alarms (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_alarm_device ON alarms(device_id);
+CREATE INDEX idx_alarm_device_created ON alarms(device_id, created_at DESC);
 CREATE INDEX idx_alarm_severity ON alarms(severity);
-CREATE INDEX idx_alarm_created ON alarms(created_at);
+CREATE INDEX idx_alarm_created ON alarms USING BRIN (created_at) WITH (pages_per_range = 32);
 CREATE INDEX idx_alarm_resolved ON alarms(resolved);
+CREATE INDEX idx_alarm_active ON alarms(created_at DESC) WHERE resolved = FALSE;
+CREATE INDEX idx_alarm_active_type ON alarms(type) WHERE resolved = FALSE;
 
--- Interface metrics time series
+-- Interface metrics time series (range-partitioned by day)
 CREATE TABLE IF NOT EXISTS interface_metrics (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     device_id INTEGER NOT NULL REFERENCES devices(id) ON DELETE CASCADE,
     interface_index INTEGER NOT NULL,
     interface_name VARCHAR(100),
     description VARCHAR(255),
     admin_status VARCHAR(10),
     oper_status VARCHAR(10),
-    speed INTEGER,
+    speed BIGINT,  -- bps; 10G+ links overflow INTEGER
     in_octets BIGINT,
     out_octets BIGINT,
-    collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    collected_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, collected_at)
+) PARTITION BY RANGE (collected_at);
+
+-- Daily partitions are created by the NMS service; DEFAULT catches the rest
+CREATE TABLE IF NOT EXISTS interface_metrics_default PARTITION OF interface_metrics DEFAULT;
 
-CREATE INDEX idx_interface_device_idx ON interface_metrics(device_id, interface_index);
-CREATE INDEX idx_interface_collected ON interface_metrics(collected_at);
+CREATE INDEX idx_interface_device_time ON interface_metrics(device_id, interface_index, collected_at DESC);
+CREATE INDEX idx_interface_collected ON interface_metrics USING BRIN (collected_at) WITH (pages_per_range = 32);
 
--- Device health metrics time series
+-- Device health metrics time series (range-partitioned by day)
 CREATE TABLE IF NOT EXISTS device_health_metrics (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     device_id INTEGER NOT NULL REFERENCES devices(id) ON DELETE CASCADE,
     device_name VARCHAR(255),
     uptime_seconds INTEGER,
     cpu_usage FLOAT,
     memory_usage FLOAT,
     temperature FLOAT,
-    collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    collected_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, collected_at)
+) PARTITION BY RANGE (collected_at);
+
+-- Daily partitions are created by the NMS service; DEFAULT catches the rest
+CREATE TABLE IF NOT EXISTS device_health_metrics_default PARTITION OF device_health_metrics DEFAULT;
 
-CREATE INDEX idx_health_device ON device_health_metrics(device_id);
-CREATE INDEX idx_health_collected ON device_health_metrics(collected_at);
+CREATE INDEX idx_health_device_time ON device_health_metrics(device_id, collected_at DESC);
+CREATE INDEX idx_health_collected ON device_health_metrics USING BRIN (collected_at) WITH (pages_per_range = 32);
 
 -- Device inventory
 CREATE TABLE IF NOT EXISTS device_inventory (